@@ -0,0 +1,85 @@
+# Порівняння пропускної здатності AsyncModel і синхронної model.Model (режим пулу + потоки)
+# на навантаженні з пошуку за ID при 1, 10 та 100 одночасних клієнтах.
+#
+#   python -m benchmarks.async_concurrency --requests 5000 --pool-max 20
+import argparse
+import asyncio
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import DB_SETTINGS, print_rows
+from model import Model
+from modelAsync import AsyncModel
+
+
+def _user_ids(count):
+    db = Model(**DB_SETTINGS)
+    if not db.connect():
+        sys.exit(1)
+    db.cursor.execute('SELECT COALESCE(MAX(id), 0) FROM public."user"')
+    max_id = db.cursor.fetchone()[0]
+    db.disconnect()
+    if max_id == 0:
+        sys.exit("Таблиця user порожня - спочатку згенеруйте дані.")
+    rng = random.Random(42)
+    return [rng.randint(1, max_id) for _ in range(count)]
+
+
+def bench_sync(ids, concurrency, pool_max):
+    db = Model(**DB_SETTINGS, pool_min_size=min(concurrency, pool_max), pool_max_size=min(concurrency, pool_max))
+    if not db.connect():
+        sys.exit(1)
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as ex:
+            list(ex.map(db.find_user_by_id, ids))
+        return time.perf_counter() - start
+    finally:
+        db.disconnect()
+
+
+async def bench_async(ids, concurrency, pool_max):
+    size = min(concurrency, pool_max)
+    db = AsyncModel(**DB_SETTINGS, pool_min_size=size, pool_max_size=size)
+    if not await db.connect():
+        sys.exit(1)
+    try:
+        queue = iter(ids)
+
+        async def worker():
+            for uid in queue:
+                await db.find_user_by_id(uid)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - start
+    finally:
+        await db.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AsyncModel vs model.Model: пропускна здатність")
+    parser.add_argument("--requests", type=int, default=5000, help="кількість пошуків на один прогін")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--pool-max", type=int, default=20, help="верхня межа розміру пулу для обох моделей")
+    args = parser.parse_args()
+
+    # psycopg async не працює з ProactorEventLoop (за замовчуванням на Windows)
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    ids = _user_ids(args.requests)
+    rows = []
+    for c in args.concurrency:
+        sync_s = bench_sync(ids, c, args.pool_max)
+        async_s = asyncio.run(bench_async(ids, c, args.pool_max))
+        rows.append((c, f"{len(ids) / sync_s:,.0f}", f"{len(ids) / async_s:,.0f}", f"{sync_s / async_s:.2f}x"))
+
+    print(f"\nfind_user_by_id, {len(ids)} запитів, пул <= {args.pool_max} з'єднань")
+    print_rows(["Клієнтів", "Sync, оп/с", "Async, оп/с", "Async/Sync"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+# Порівняння бекендів model.py (psycopg) і modelORM.py (SQLAlchemy) на однакових даних і однакових операціях.
+#
+# run: створює тимчасову БД (або, з --initdb, окремий кластер PostgreSQL у тимчасовому каталозі),
+# заповнює її детермінованим набором даних заданого масштабу, виконує кожну операцію на обох
+# бекендах (по черзі, з однаковими параметрами) і зберігає результат у JSON.
+# compare: порівнює два JSON і позначає операції, що сповільнились більше ніж на --threshold.
+#
+#   python -m benchmarks.backends run --scale 10k
+#   python -m benchmarks.backends run --scale 1m --initdb --output base.json
+#   python -m benchmarks.backends compare base.json new.json --threshold 0.10
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import psycopg
+
+from benchmarks.common import DB_SETTINGS, print_rows
+from benchmarks.search_fanout import FILTER_SETS
+import generator
+import ids
+import metrics
+import model
+import modelORM
+
+# Масштаб - загальна кількість рядків: 10% користувачів, 40% записів, 50% нагадувань
+SCALES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+SHARES = {"user": 0.1, "entry": 0.4, "reminder": 0.5}
+BACKENDS = {"psycopg": model.Model, "sqlalchemy": modelORM.Model}
+BENCH_DB = "diary_bench"
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+RESULT_HEADERS = ["Backend", "Operation", "Calls", "Errors", "Ops/s", "Rows/s", "p50, ms", "p95, ms", "p99, ms"]
+COMPARE_HEADERS = ["Backend", "Operation", "Було p50, ms", "Стало p50, ms", "Було ops/s", "Стало ops/s", "Зміна", ""]
+
+# name - ім'я в звіті, method - метод моделі, calls - базова кількість викликів (множиться на --calls),
+# params(backend_index, i) -> аргументи i-го виклику, rows - рядків за виклик (generate_*: рахується rows/s)
+Operation = namedtuple("Operation", "name method calls params rows", defaults=(None,))
+
+# Операції читання спершу прогріваються (кеш планів, сторінки в shared_buffers) - без замірів
+READ_PREFIXES = ("get_", "find_", "search_")
+WARMUP_CALLS = 20
+
+
+# --- ТИМЧАСОВИЙ POSTGRESQL ---
+@contextlib.contextmanager
+def throwaway_cluster():
+    """Окремий кластер (initdb + pg_ctl) з unix-сокетом у тимчасовому каталозі."""
+    bin_dir = os.environ.get("PG_BIN", "")
+    initdb, pg_ctl = (os.path.join(bin_dir, name) if bin_dir else shutil.which(name) for name in ("initdb", "pg_ctl"))
+    if not initdb or not pg_ctl:
+        sys.exit("Не знайдено initdb / pg_ctl: додайте їх у PATH або вкажіть каталог у PG_BIN.")
+    root = tempfile.mkdtemp(prefix="diary_bench_")
+    data = os.path.join(root, "data")
+    try:
+        subprocess.run([initdb, "-D", data, "-U", "postgres", "-A", "trust", "-E", "UTF8", "--no-sync"],
+                       check=True, stdout=subprocess.DEVNULL)
+        subprocess.run([pg_ctl, "-D", data, "-l", os.path.join(root, "postgres.log"), "-w",
+                        "-o", f"-k {root} -c listen_addresses=''", "start"], check=True, stdout=subprocess.DEVNULL)
+        try:
+            yield {"db_name": "postgres", "user": "postgres", "password": "", "host": root, "port": "5432"}
+        finally:
+            subprocess.run([pg_ctl, "-D", data, "-m", "fast", "-w", "stop"], stdout=subprocess.DEVNULL)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def _conn_info(settings, db_name=None):
+    return (f"dbname={db_name or settings['db_name']} user={settings['user']} password={settings['password']} "
+            f"host={settings['host']} port={settings['port']}")
+
+
+@contextlib.contextmanager
+def throwaway_database(settings, keep=False):
+    """Порожня БД BENCH_DB на сервері settings; видаляється після замірів (якщо не keep)."""
+    with psycopg.connect(_conn_info(settings), autocommit=True) as admin:
+        admin.execute(f"DROP DATABASE IF EXISTS {BENCH_DB}")
+        admin.execute(f"CREATE DATABASE {BENCH_DB}")
+    try:
+        yield dict(settings, db_name=BENCH_DB)
+    finally:
+        if not keep:
+            with psycopg.connect(_conn_info(settings), autocommit=True) as admin:
+                admin.execute(f"DROP DATABASE IF EXISTS {BENCH_DB} WITH (FORCE)")
+
+
+def make_backend(name, settings):
+    db = BACKENDS[name](**settings)
+    if name == "sqlalchemy" and settings["host"].startswith("/"):
+        # Unix-сокет не вміщується в host URL - передаємо його параметром
+        db.db_url = (f"postgresql+psycopg://{settings['user']}:{settings['password']}@/{settings['db_name']}"
+                     f"?host={settings['host']}&port={settings['port']}")
+    return db
+
+
+# --- ДАНІ ---
+def seed(settings, total, seed_value):
+    """Заповнює БД детермінованими даними. Повертає кількість рядків кожної таблиці."""
+    counts = {table: max(1, int(total * share)) for table, share in SHARES.items()}
+    # Схему (таблиці, послідовності, tsvector, тригери, індекси) створює modelORM.connect
+    db = make_backend("sqlalchemy", settings)
+    if not db.connect():
+        sys.exit("Не вдалося створити схему тимчасової БД.")
+    db.disconnect()
+
+    started = time.perf_counter()
+    with psycopg.connect(_conn_info(settings)) as conn, conn.cursor() as cur:
+        parents = {"user": None, "entry": "user", "reminder": "entry"}
+        for offset, (table, count) in enumerate(counts.items()):
+            parent = parents[table]
+            parent_ids = generator.ParentIds(low=1, high=counts[parent]) if parent else None
+            generator.copy_table(cur, table, 1, count, parent_ids, seed=seed_value + offset)
+            ids.sync_sequence(cur, table)
+        conn.commit()
+        cur.execute("ANALYZE")
+    print(f"Дані: {counts} за {time.perf_counter() - started:.1f} с")
+    return counts
+
+
+def operations(counts, calls, seed_value):
+    """Список операцій з детермінованими параметрами (однаковими для обох бекендів)."""
+    rng = random.Random(seed_value)
+    users, entries, reminders = counts["user"], counts["entry"], counts["reminder"]
+
+    def ids(limit, n):
+        return [rng.randint(1, limit) for _ in range(n)]
+
+    def scaled(n):
+        return max(1, int(n * calls))
+
+    lookups = {table: ids(limit, scaled(2000)) for table, limit in counts.items()}
+    # Кожен бекенд змінює й видаляє власні рядки: половина діапазону на бекенд
+    half_users, half_entries, half_reminders = users // 2, entries // 2, reminders // 2
+    updates = scaled(300)
+    deletes = min(scaled(50), max(1, half_users // 4))
+    generate = max(1000, min(100_000, users // 10))
+    when = datetime(2026, 1, 1, 9, 0)
+
+    ops = [
+        Operation("get_top_users", "get_top_users", scaled(200), lambda b, i: (10,)),
+        Operation("get_top_entries", "get_top_entries", scaled(200), lambda b, i: (10,)),
+        Operation("get_top_reminders", "get_top_reminders", scaled(200), lambda b, i: (10,)),
+        Operation("find_user_by_id", "find_user_by_id", scaled(2000), lambda b, i: (lookups["user"][i],)),
+        Operation("find_entry_by_id", "find_entry_by_id", scaled(2000), lambda b, i: (lookups["entry"][i],)),
+        Operation("find_reminder_by_id", "find_reminder_by_id", scaled(2000),
+                  lambda b, i: (lookups["reminder"][i],)),
+    ]
+    for label, filters in FILTER_SETS.items():
+        ops.append(Operation(f"search_flexible [{label}]", "search_flexible", scaled(20),
+                             lambda b, i, f=filters: (f,)))
+    ops += [
+        Operation("add_user", "add_user", scaled(300), lambda b, i: (None, f"bench{b}_{i}", f"b{b}_{i}@x.io", "pw")),
+        Operation("add_entry", "add_entry", scaled(300), lambda b, i: (None, "bench", f"entry {i}", 1 + i % users)),
+        Operation("add_reminder", "add_reminder", scaled(300),
+                  lambda b, i: (None, 1 + i % entries, when + timedelta(minutes=i), i % 2 == 0)),
+        Operation("update_user", "update_user", updates,
+                  lambda b, i: (1 + b * half_users + i % half_users,) * 2 + (f"upd{b}_{i}", f"u{b}_{i}@x.io", "pw2")),
+        Operation("update_entry", "update_entry", updates,
+                  lambda b, i: (1 + b * half_entries + i % half_entries,) * 2 + ("updated", f"text {i}", 1 + i % users)),
+        Operation("update_reminder", "update_reminder", updates,
+                  lambda b, i: (1 + b * half_reminders + i % half_reminders,) * 2
+                  + (1 + i % entries, when - timedelta(days=i), i % 3 == 0)),
+        # Видаляються користувачі з кінця половини бекенду, щоб не зачепити рядки update_*
+        Operation("delete_user_cascade", "delete_user_cascade", deletes,
+                  lambda b, i: ((b + 1) * half_users - i,)),
+        Operation("generate_users", "generate_users", 1, lambda b, i: (generate,), generate),
+        Operation("generate_entries", "generate_entries", 1, lambda b, i: (generate,), generate),
+        Operation("generate_reminders", "generate_reminders", 1, lambda b, i: (generate,), generate),
+    ]
+    return ops
+
+
+# --- ЗАМІРИ ---
+def _percentile(sorted_values, q):
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    return statistics.quantiles(sorted_values, n=100, method="inclusive")[q - 1]
+
+
+def measure(db, backend_index, op):
+    """Виконує операцію op.calls разів. Повертає (тривалості в секундах, кількість помилок)."""
+    timings, failed = [], 0
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):  # "(Автоматично обрано ID...)"
+        method = getattr(db, op.method)
+        if op.method.startswith(READ_PREFIXES):
+            for i in range(min(op.calls, WARMUP_CALLS)):
+                method(*op.params(backend_index, i))
+        for i in range(op.calls):
+            args = op.params(backend_index, i)
+            start = time.perf_counter()
+            result = method(*args)
+            timings.append(time.perf_counter() - start)
+            failed += metrics.is_error(op.method, result)
+    return timings, failed
+
+
+def summarize(backend, op, timings, failed):
+    timings = sorted(timings)
+    total = sum(timings)
+    return {
+        "backend": backend,
+        "operation": op.name,
+        "calls": len(timings),
+        "errors": failed,
+        "ops_per_s": round(len(timings) / total, 2) if total else None,
+        "rows_per_s": round(len(timings) * op.rows / total, 1) if op.rows and total else None,
+        "p50_ms": round(_percentile(timings, 50) * 1000, 4),
+        "p95_ms": round(_percentile(timings, 95) * 1000, 4),
+        "p99_ms": round(_percentile(timings, 99) * 1000, 4),
+        "total_s": round(total, 4),
+    }
+
+
+def run(args):
+    total = SCALES[args.scale]
+    with contextlib.ExitStack() as stack:
+        server = stack.enter_context(throwaway_cluster()) if args.initdb else dict(DB_SETTINGS)
+        settings = stack.enter_context(throwaway_database(server, keep=args.keep))
+        counts = seed(settings, total, args.seed)
+
+        backends = {}
+        for name in BACKENDS:
+            db = make_backend(name, settings)
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                connected = db.connect()
+            if not connected:
+                sys.exit(f"Не вдалося підключити бекенд {name}.")
+            stack.callback(db.disconnect)
+            backends[name] = db
+
+        with psycopg.connect(_conn_info(settings)) as conn:
+            server_version = conn.execute("SHOW server_version").fetchone()[0]
+
+        results = []
+        for op in operations(counts, args.calls, args.seed):
+            # Бекенди по черзі, порядок змінюється від операції до операції - щоб кеш БД не давав переваги одному
+            order = list(enumerate(backends.items()))
+            if len(results) // len(order) % 2:
+                order.reverse()
+            for index, (name, db) in order:
+                timings, failed = measure(db, index, op)
+                results.append(summarize(name, op, timings, failed))
+                print(f"  {name:<10} {op.name:<36} {results[-1]['p50_ms']:>10.3f} мс (p50)")
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "scale": args.scale,
+            "rows": counts,
+            "seed": args.seed,
+            "calls_factor": args.calls,
+            "server": "initdb" if args.initdb else f"{DB_SETTINGS['host']}:{DB_SETTINGS['port']}",
+            "server_version": server_version,
+            "python": platform.python_version(),
+            "psycopg": psycopg.__version__,
+            "sqlalchemy": __import__("sqlalchemy").__version__,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"backends-{args.scale}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print_rows(RESULT_HEADERS, [(r["backend"], r["operation"], r["calls"], r["errors"], r["ops_per_s"],
+                                 r["rows_per_s"] or "", r["p50_ms"], r["p95_ms"], r["p99_ms"]) for r in results])
+    print(f"\nРезультати: {output}")
+
+
+# --- ПОРІВНЯННЯ ---
+def compare(args):
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    if base["meta"].get("scale") != new["meta"].get("scale"):
+        print(f"УВАГА: різні масштаби ({base['meta'].get('scale')} і {new['meta'].get('scale')}).")
+
+    old = {(r["backend"], r["operation"]): r for r in base["results"]}
+    rows, regressions = [], 0
+    for r in new["results"]:
+        before = old.get((r["backend"], r["operation"]))
+        if before is None:
+            continue
+        change = r["p50_ms"] / before["p50_ms"] - 1 if before["p50_ms"] else 0.0
+        slower = change > args.threshold
+        regressions += slower
+        rows.append((r["backend"], r["operation"], before["p50_ms"], r["p50_ms"], before["ops_per_s"],
+                     r["ops_per_s"], f"{change * 100:+.1f}%", "ПОВІЛЬНІШЕ" if slower else ""))
+    print_rows(COMPARE_HEADERS, rows)
+    if regressions:
+        sys.exit(f"\nСповільнення понад {args.threshold * 100:.0f}%: {regressions} операцій.")
+    print(f"\nСповільнень понад {args.threshold * 100:.0f}% немає.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Порівняння бекендів psycopg і SQLAlchemy")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="заміри на тимчасовій БД")
+    run_parser.add_argument("--scale", choices=SCALES, default="10k", help="загальна кількість рядків")
+    run_parser.add_argument("--calls", type=float, default=1.0, help="множник кількості викликів операцій")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--initdb", action="store_true", help="окремий кластер через initdb/pg_ctl (PG_BIN)")
+    run_parser.add_argument("--keep", action="store_true", help="не видаляти тимчасову БД")
+    run_parser.add_argument("--output", help=f"файл JSON (за замовчуванням - у {RESULTS_DIR})")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser("compare", help="порівняти два JSON з результатами")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.20, help="допустиме сповільнення p50 (0.20 = 20%%)")
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
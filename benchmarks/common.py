@@ -0,0 +1,25 @@
+import os
+import sys
+
+# Бенчмарки запускаються з кореня репозиторію: python -m benchmarks.<назва>
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Параметри підключення беруться зі змінних оточення libpq,
+# за замовчуванням - ті самі, що й у controller.py
+DB_SETTINGS = {
+    "db_name": os.environ.get("PGDATABASE", "postgres"),
+    "user": os.environ.get("PGUSER", "postgres"),
+    "password": os.environ.get("PGPASSWORD", "1223334444"),
+    "host": os.environ.get("PGHOST", "localhost"),
+    "port": os.environ.get("PGPORT", "5432"),
+}
+
+
+def print_rows(headers, rows):
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print(" | ".join(f"{h:<{w}}" for h, w in zip(headers, widths)))
+    print("-+-".join("-" * w for w in widths))
+    for r in rows:
+        print(" | ".join(f"{str(v):<{w}}" for v, w in zip(r, widths)))
@@ -0,0 +1,55 @@
+# Накладні витрати metrics.InstrumentedModel: час виклику методу без обгортки і з нею.
+# "порожній метод" показує чисту вартість запису метрики, find_user_by_id - її частку
+# в реальному запиті до БД (без --db вимірюється лише порожній метод).
+#
+#   python -m benchmarks.metrics_overhead --calls 200000 --db
+import argparse
+import time
+
+from benchmarks.common import DB_SETTINGS, print_rows
+from metrics import InstrumentedModel
+from model import Model
+
+
+class _Stub:
+    def find_user_by_id(self, user_id):
+        return [(user_id, "user", "user@example.com", "secret")]
+
+
+def _per_call_us(func, calls, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for i in range(calls):
+            func(i)
+        best = min(best, time.perf_counter() - started)
+    return best / calls * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Накладні витрати метрик операцій")
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--db", action="store_true", help="також виміряти find_user_by_id на реальній БД")
+    args = parser.parse_args()
+
+    cases = [("порожній метод", _Stub(), args.calls)]
+    db = None
+    if args.db:
+        db = Model(**DB_SETTINGS)
+        if db.connect():
+            cases.append(("find_user_by_id", db, max(1, args.calls // 20)))
+
+    results = []
+    for name, target, calls in cases:
+        plain = _per_call_us(target.find_user_by_id, calls)
+        measured = _per_call_us(InstrumentedModel(target, backend="bench").find_user_by_id, calls)
+        results.append((name, calls, f"{plain:.2f}", f"{measured:.2f}", f"{measured - plain:+.2f}",
+                        f"{(measured - plain) / plain * 100:+.1f}%"))
+    if db is not None:
+        db.disconnect()
+
+    print_rows(["Метод", "Викликів", "Без метрик, мкс", "З метриками, мкс", "Різниця, мкс", "Різниця"], results)
+
+
+if __name__ == "__main__":
+    main()
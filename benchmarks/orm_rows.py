@@ -0,0 +1,112 @@
+# Швидкість читання modelORM у режимах rows (Core select потрібних стовпців, кортежі) і objects
+# (ORM-об'єкти, перетворені на кортежі) - див. modelORM.READ_MODES. Тимчасова БД заповнюється як
+# у benchmarks.backends (за замовчуванням 2 млн рядків: 1 млн нагадувань, 800 тис. записів), обидва
+# режими виконують однакову послідовність викликів і мають повернути однакові рядки.
+#
+#   python -m benchmarks.orm_rows
+#   python -m benchmarks.orm_rows --rows 200000 --limit 1000 --lookups 2000
+import argparse
+import contextlib
+import gc
+import os
+import random
+import sys
+import time
+
+from benchmarks.backends import make_backend, seed, throwaway_cluster, throwaway_database
+from benchmarks.common import DB_SETTINGS, print_rows
+import modelORM
+
+HEADERS = ["Operation", "Calls", "Rows", "objects, rows/s", "rows, rows/s", "Прискорення", "Однакові"]
+
+
+def workload(counts, limit, lookups, seed_value):
+    """[(назва, метод, [аргументи викликів])] - однакові для обох режимів."""
+    rng = random.Random(seed_value)
+
+    def ids(table, n):
+        return [(rng.randint(1, counts[table]),) for _ in range(n)]
+
+    return [
+        ("get_top_users", "get_top_users", [(limit,)] * 20),
+        ("get_top_entries", "get_top_entries", [(limit,)] * 20),
+        ("get_top_reminders", "get_top_reminders", [(limit,)] * 20),
+        ("find_user_by_id", "find_user_by_id", ids("user", lookups)),
+        ("find_entry_by_id", "find_entry_by_id", ids("entry", lookups)),
+        ("find_reminder_by_id", "find_reminder_by_id", ids("reminder", lookups)),
+        ("get_user_entries_details", "get_user_entries_details", ids("user", lookups // 2)),
+        ("get_user_reminders_details", "get_user_reminders_details", ids("user", lookups // 2)),
+    ]
+
+
+def _rows(result):
+    if isinstance(result, tuple):  # get_user_*_details -> (username, рядки)
+        return [tuple(r) for r in result[1]]
+    return [tuple(r) for r in result]
+
+
+def run(db, method, calls):
+    """(час у секундах, повернуті рядки) для послідовності викликів."""
+    method = getattr(db, method)
+    gc.collect()  # результати попередніх замірів не повинні збиратись під час цього
+    started = time.perf_counter()
+    results = [method(*args) for args in calls]
+    elapsed = time.perf_counter() - started
+    return elapsed, [row for result in results for row in _rows(result)]
+
+
+def compare(db, method, calls, repeat):
+    """{режим: (найкращий час, рядки)}. Повтори чергуються між режимами, порядок режимів змінюється -
+    щоб кеш сторінок БД не давав переваги тому, хто йде другим."""
+    modes = ["objects", "rows"]
+    for mode in modes:  # прогрів: кеш скомпільованих запитів, сторінки в shared_buffers
+        db.read_mode = mode
+        run(db, method, calls[:50])
+    measured = {}
+    for i in range(repeat):
+        for mode in (modes if i % 2 == 0 else modes[::-1]):
+            db.read_mode = mode
+            elapsed, rows = run(db, method, calls)
+            # Рядки для порівняння режимів - лише з першого повтору
+            best, first_rows = measured.get(mode, (elapsed, rows))
+            measured[mode] = (min(best, elapsed), first_rows)
+            del rows
+    return measured
+
+
+def main():
+    parser = argparse.ArgumentParser(description="modelORM: читання рядками (Core) проти ORM-об'єктів")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="загальна кількість рядків тестової БД")
+    parser.add_argument("--limit", type=int, default=10_000, help="рядків за виклик get_top_*")
+    parser.add_argument("--lookups", type=int, default=5_000, help="викликів find_*_by_id")
+    parser.add_argument("--repeat", type=int, default=4, help="повторів (береться найкращий)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--initdb", action="store_true", help="окремий кластер PostgreSQL (initdb)")
+    args = parser.parse_args()
+
+    report = []
+    with contextlib.ExitStack() as stack:
+        server = stack.enter_context(throwaway_cluster()) if args.initdb else dict(DB_SETTINGS)
+        settings = stack.enter_context(throwaway_database(server))
+        counts = seed(settings, args.rows, args.seed)
+        db = make_backend("sqlalchemy", settings)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            if not db.connect():
+                sys.exit("Не вдалося підключити modelORM.")
+        stack.callback(db.disconnect)
+
+        for name, method, calls in workload(counts, args.limit, args.lookups, args.seed):
+            measured = compare(db, method, calls, args.repeat)
+            (objects_s, objects_rows), (rows_s, rows_rows) = measured["objects"], measured["rows"]
+            count = len(rows_rows)
+            report.append((name, len(calls), count, round(count / objects_s), round(count / rows_s),
+                           f"x{objects_s / rows_s:.2f}", "так" if objects_rows == rows_rows else "НІ"))
+            print(f"  {name:<28} objects {count / objects_s:>12,.0f}  rows {count / rows_s:>12,.0f} рядків/с")
+
+    print_rows(HEADERS, report)
+    if any(r[-1] != "так" for r in report):
+        sys.exit("Режими повернули різні рядки.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# Тривале навантаження на modelORM у кожному режимі сесій (modelORM.SESSION_MODES): чи росте пам'ять
+# процесу з кількістю операцій. Тимчасова БД заповнюється як у benchmarks.backends, далі - суміш
+# перегляду сторінок, пошуку за ID, деталей користувача й оновлень. Кожні --ops/--samples операцій
+# фіксуються пам'ять Python (tracemalloc); в кінці - живі ORM-об'єкти, розмір identity map сесії потоку
+# і чи лишилась вона з відкритою транзакцією (idle in transaction на сервері).
+#
+#   python -m benchmarks.orm_soak
+#   python -m benchmarks.orm_soak --scale 200000 --ops 50000 --modes operation shared
+import argparse
+import contextlib
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from benchmarks.backends import make_backend, seed, throwaway_cluster, throwaway_database
+from benchmarks.common import DB_SETTINGS, print_rows
+import modelORM
+
+HEADERS = ["Mode", "expire_on_commit", "Ops", "Ops/s", "Пам'ять на старті, МБ", "Пам'ять в кінці, МБ",
+           "Приріст, КБ/1000 оп.", "ORM-об'єкти", "Identity map", "Відкрита транзакція"]
+
+
+def orm_objects():
+    return sum(isinstance(o, (modelORM.User, modelORM.Entry, modelORM.Reminder)) for o in gc.get_objects())
+
+
+def workload(db, counts, rng):
+    """Генератор операцій: кожен next() виконує одну операцію моделі."""
+    cursors = {"user": None, "entry": None, "reminder": None}
+    while True:
+        kind = rng.random()
+        if kind < 0.3:
+            table = rng.choice(list(cursors))
+            page = db.get_page(table, cursor=cursors[table])
+            cursors[table] = page.next_cursor if not isinstance(page, str) else None
+        elif kind < 0.6:
+            table = rng.choice(list(cursors))
+            getattr(db, f"find_{table}_by_id")(rng.randint(1, counts[table]))
+        elif kind < 0.9:
+            db.get_user_entries_details(rng.randint(1, counts["user"]))
+        else:
+            entry_id = rng.randint(1, counts["entry"])
+            db.update_entry(entry_id, entry_id, "soak", f"text {rng.random()}", rng.randint(1, counts["user"]))
+        yield
+
+
+def soak(settings, counts, mode, expire_on_commit, ops, samples, seed_value):
+    db = make_backend("sqlalchemy", settings)
+    db.session_mode, db.expire_on_commit = mode, expire_on_commit  # обидва читає connect()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if not db.connect():
+            sys.exit("Не вдалося підключити modelORM.")
+    try:
+        steps = workload(db, counts, random.Random(seed_value))
+        for _ in range(min(1000, ops)):  # прогрів: кеші SQLAlchemy, пул з'єднань
+            next(steps)
+        gc.collect()
+        tracemalloc.start()
+        memory = [tracemalloc.get_traced_memory()[0]]
+        started = time.perf_counter()
+        for i in range(1, ops + 1):
+            next(steps)
+            if i % max(1, ops // samples) == 0:
+                memory.append(tracemalloc.get_traced_memory()[0])
+        elapsed = time.perf_counter() - started
+        tracemalloc.stop()
+        session = db.session
+        return (mode, expire_on_commit, ops, round(ops / elapsed), round(memory[0] / 2 ** 20, 2),
+                round(memory[-1] / 2 ** 20, 2), round((memory[-1] - memory[0]) / 1024 / ops * 1000, 1),
+                orm_objects(), len(session.identity_map), session.in_transaction())
+    finally:
+        db.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пам'ять modelORM під тривалим навантаженням за режимами сесій")
+    parser.add_argument("--scale", type=int, default=100_000, help="загальна кількість рядків тестової БД")
+    parser.add_argument("--ops", type=int, default=20_000)
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--modes", nargs="+", choices=modelORM.SESSION_MODES, default=list(modelORM.SESSION_MODES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--initdb", action="store_true", help="окремий кластер PostgreSQL (initdb)")
+    args = parser.parse_args()
+
+    rows = []
+    with contextlib.ExitStack() as stack:
+        server = stack.enter_context(throwaway_cluster()) if args.initdb else dict(DB_SETTINGS)
+        settings = stack.enter_context(throwaway_database(server))
+        counts = seed(settings, args.scale, args.seed)
+        for mode in args.modes:
+            for expire_on_commit in (True, False):
+                rows.append(soak(settings, counts, mode, expire_on_commit, args.ops, args.samples, args.seed))
+                print(f"  {mode:<10} expire_on_commit={expire_on_commit!s:<5} {rows[-1][3]:>7} оп/с")
+    print_rows(HEADERS, rows)
+
+
+if __name__ == "__main__":
+    main()
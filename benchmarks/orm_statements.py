@@ -0,0 +1,136 @@
+# CPU клієнта на запит modelORM: оператори, що будуються при кожному виклику, проти шаблонів
+# (ormtemplates.StatementTemplates, DIARY_ORM_TEMPLATES). Час - time.process_time() процесу Python, тобто
+# побудова оператора, ключ кешу, компіляція / пошук у кеші, обробка результату; очікування сервера
+# не входить. Тимчасова БД невелика (як у benchmarks.backends): запити дешеві для сервера, тож
+# різниця - саме робота SQLAlchemy. В кінці - влучання в кеш скомпільованого SQL для кожного варіанту.
+#
+#   python -m benchmarks.orm_statements
+#   python -m benchmarks.orm_statements --calls 5000 --read-mode objects
+import argparse
+import contextlib
+import gc
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.backends import make_backend, seed, throwaway_cluster, throwaway_database
+from benchmarks.common import DB_SETTINGS, print_rows
+import modelORM
+import ormtemplates
+
+HEADERS = ["Operation", "Calls", "build, CPU мкс/запит", "templates, CPU мкс/запит", "Менше CPU", "Однакові"]
+CACHE_HEADERS = ["Variant", "Compile cache hits", "Misses", "Hit ratio", "Templates", "Builds"]
+
+SEARCHES = [
+    {"username": "A"},
+    {"email": "b"},
+    {"title": "C", "is_active": True},
+    {"text": "d", "username": "E"},
+    {"is_active": False},
+    {"date_from": datetime(2024, 1, 1), "date_to": datetime(2026, 1, 1)},
+]
+
+
+def workload(counts, calls, seed_value):
+    """[(назва, метод, [аргументи викликів])] - однакові для обох варіантів."""
+    rng = random.Random(seed_value)
+
+    def ids(table):
+        return [(rng.randint(1, counts[table]),) for _ in range(calls)]
+
+    return [
+        ("get_top_users", "get_top_users", [(10,)] * calls),
+        ("find_user_by_id", "find_user_by_id", ids("user")),
+        ("find_entry_by_id", "find_entry_by_id", ids("entry")),
+        ("find_reminder_by_id", "find_reminder_by_id", ids("reminder")),
+        ("get_page", "get_page", [(rng.choice(["user", "entry", "reminder"]),) for _ in range(calls)]),
+        ("search_flexible", "search_flexible", [(rng.choice(SEARCHES),) for _ in range(calls // 10)]),
+        ("get_user_entries_details", "get_user_entries_details", ids("user")),
+        ("get_user_reminders_details", "get_user_reminders_details", ids("user")),
+    ]
+
+
+def _result(method, result):
+    if method == "search_flexible":
+        result = result[0]
+    if method == "get_page":
+        return result.rows
+    if isinstance(result, tuple):  # get_user_*_details -> (username, рядки)
+        return result[0], [tuple(r) for r in result[1]]
+    return [tuple(r) for r in result]
+
+
+def run(db, method, calls):
+    """(CPU у секундах, результати) для послідовності викликів."""
+    bound = getattr(db, method)
+    gc.collect()
+    started = time.process_time()
+    results = [bound(*args) for args in calls]
+    elapsed = time.process_time() - started
+    return elapsed, [_result(method, r) for r in results]
+
+
+def compare(models, method, calls, repeat):
+    """{варіант: (найменший CPU, результати першого повтору)}; повтори чергуються між варіантами."""
+    for db in models.values():  # прогрів: шаблони, кеш скомпільованого SQL, пул з'єднань
+        run(db, method, calls[:50])
+    measured = {}
+    names = list(models)
+    for i in range(repeat):
+        for name in (names if i % 2 == 0 else names[::-1]):
+            elapsed, results = run(models[name], method, calls)
+            best, first = measured.get(name, (elapsed, results))
+            measured[name] = (min(best, elapsed), first)
+    return measured
+
+
+def main():
+    parser = argparse.ArgumentParser(description="modelORM: CPU на запит без шаблонів операторів і з ними")
+    parser.add_argument("--rows", type=int, default=20_000, help="загальна кількість рядків тестової БД")
+    parser.add_argument("--calls", type=int, default=2_000, help="викликів кожної операції (search_flexible - /10)")
+    parser.add_argument("--repeat", type=int, default=5, help="повторів (береться найменший)")
+    parser.add_argument("--read-mode", choices=modelORM.READ_MODES, default=modelORM.DEFAULT_READ_MODE)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--initdb", action="store_true", help="окремий кластер PostgreSQL (initdb)")
+    args = parser.parse_args()
+
+    report = []
+    with contextlib.ExitStack() as stack:
+        server = stack.enter_context(throwaway_cluster()) if args.initdb else dict(DB_SETTINGS)
+        settings = stack.enter_context(throwaway_database(server))
+        counts = seed(settings, args.rows, args.seed)
+        models = {}
+        for name, enabled in (("build", False), ("templates", True)):
+            db = make_backend("sqlalchemy", settings)
+            db.read_mode, db.templates = args.read_mode, ormtemplates.StatementTemplates(enabled)
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                if not db.connect():
+                    sys.exit("Не вдалося підключити modelORM.")
+            stack.callback(db.disconnect)
+            models[name] = db
+
+        for name, method, calls in workload(counts, args.calls, args.seed):
+            measured = compare(models, method, calls, args.repeat)
+            (build_s, build_rows), (tpl_s, tpl_rows) = measured["build"], measured["templates"]
+            build_us, tpl_us = build_s / len(calls) * 1e6, tpl_s / len(calls) * 1e6
+            report.append((name, len(calls), round(build_us, 1), round(tpl_us, 1),
+                           f"{1 - tpl_us / build_us:.0%}", "так" if build_rows == tpl_rows else "НІ"))
+            print(f"  {name:<28} build {build_us:>8.1f}  templates {tpl_us:>8.1f} мкс CPU/запит")
+
+        cache = []
+        for name, db in models.items():
+            stats = db.get_compile_cache_stats()
+            cache.append((name, stats["hits"], stats["misses"], stats["hit_ratio"], stats["templates"],
+                          stats["template_builds"]))
+
+    print_rows(HEADERS, report)
+    print()
+    print_rows(CACHE_HEADERS, cache)
+    if any(r[-1] != "так" for r in report):
+        sys.exit("Варіанти повернули різні результати.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# Навантаження з переважанням пошуку за ID (find_user/find_entry/find_reminder + username):
+# звичайне виконання (запит розбирається і плануються щоразу) проти підготовлених запитів statements.py.
+# Обидва варіанти отримують однакову послідовність ID і мають повернути однакові рядки.
+# Якщо в БД замало даних, --seed генерує їх через Model.generate_*.
+#
+#   python -m benchmarks.prepared_lookup --lookups 50000 --seed 10000
+import argparse
+import random
+import statistics
+import time
+
+import psycopg
+
+from benchmarks.common import DB_SETTINGS, print_rows
+from model import Model
+import statements
+
+# (зареєстрований запит, таблиця, PK) - find_user вдвічі частіший за інші
+WORKLOAD = [("find_user", 'public."user"', "id"), ("find_user", 'public."user"', "id"),
+            ("find_entry", "public.entry", "entry_id"), ("find_reminder", "public.reminder", "reminder_id"),
+            ("username", 'public."user"', "id")]
+
+
+def make_plan(conn, lookups, seed):
+    """Послідовність (запит, id); третина ID відсутні в таблиці (промахи теж типовий випадок)."""
+    rng = random.Random(seed)
+    ids = {}
+    with conn.cursor() as cur:
+        for _, table, column in WORKLOAD:
+            cur.execute(f"SELECT {column} FROM {table} ORDER BY random() LIMIT 5000")
+            ids[table] = [row[0] for row in cur.fetchall()] or [0]
+    conn.commit()
+    plan = []
+    for _ in range(lookups):
+        name, table, _ = rng.choice(WORKLOAD)
+        key = rng.choice(ids[table]) if rng.random() < 0.67 else -rng.randint(1, 10**6)
+        plan.append((name, key))
+    return plan
+
+
+def run(conn, plan, prepared):
+    """Повертає (тривалості в мкс, контрольна сума результатів)."""
+    stats = statements.StatementStats()
+    timings = []
+    checksum = 0
+    with conn.cursor() as cur:
+        for name, key in plan:
+            started = time.perf_counter()
+            if prepared:
+                statements.execute(cur, stats, name, (key,))
+            else:
+                cur.execute(statements.STATEMENTS[name], (key,), prepare=False)
+            rows = cur.fetchall()
+            timings.append((time.perf_counter() - started) * 1_000_000)
+            checksum += len(rows) + sum(hash(str(row)) % 997 for row in rows)
+    conn.rollback()
+    return timings, checksum
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пошук за ID: звичайні запити vs підготовлені (statements.py)")
+    parser.add_argument("--lookups", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=0, help="згенерувати стільки користувачів/записів/нагадувань")
+    parser.add_argument("--repeat", type=int, default=3, help="повторів (береться найкращий)")
+    args = parser.parse_args()
+
+    db = Model(**DB_SETTINGS)
+    if not db.connect():
+        return
+    if args.seed:
+        for method in (db.generate_users, db.generate_entries, db.generate_reminders):
+            print(method(args.seed))
+
+    with psycopg.connect(db.conn_info) as conn:
+        statements.configure(conn)
+        plan = make_plan(conn, args.lookups, seed=42)
+
+        results = []
+        checksums = set()
+        baseline = None
+        for label, prepared in (("звичайні запити", False), ("підготовлені (prepare=True)", True)):
+            best = None
+            for _ in range(args.repeat):
+                timings, checksum = run(conn, plan, prepared)
+                checksums.add(checksum)
+                if best is None or sum(timings) < sum(best):
+                    best = timings
+            total_s = sum(best) / 1_000_000
+            baseline = baseline or total_s
+            p95 = statistics.quantiles(best, n=20)[-1]
+            results.append((label, f"{len(plan) / total_s:,.0f}", f"{statistics.median(best):.1f}",
+                            f"{p95:.1f}", f"{baseline / total_s:.2f}x"))
+
+    db.disconnect()
+    print(f"\n{len(plan)} пошуків за ID")
+    print_rows(["Спосіб", "Запитів/с", "Медіана, мкс", "p95, мкс", "Прискорення"], results)
+    if len(checksums) != 1:
+        print("УВАГА: результати варіантів відрізняються!")
+
+
+if __name__ == "__main__":
+    main()
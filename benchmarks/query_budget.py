@@ -0,0 +1,184 @@
+# Перевірка бюджетів SQL-запитів modelORM (querybudget.py): режим читання rows і режим objects
+# з кожною стратегією завантаження зв'язків.
+# Для кожного масштабу створюється тимчасова БД з детермінованими даними (як у benchmarks.backends),
+# кожна операція виконується під count_queries(). Кількість запитів не повинна зростати з масштабом:
+# якщо вона зростає з даними - це N+1. Код виходу 1, якщо хоч одна операція перевищила бюджет, повернула помилку
+# або не знайшла свій рядок (кожен прогін працює з власними рядками, див. pick_targets).
+#
+#   python -m benchmarks.query_budget
+#   python -m benchmarks.query_budget --scales 1000 50000 --loaders joined
+import argparse
+import contextlib
+import os
+import sys
+from datetime import datetime
+
+import psycopg
+
+from benchmarks.backends import make_backend, seed, throwaway_cluster, throwaway_database
+from benchmarks.common import DB_SETTINGS, print_rows
+import metrics
+import modelORM
+import querybudget
+
+HEADERS = ["Rows", "Mode", "Operation", "Queries", "Budget", ""]
+
+# Операція над відсутнім рядком - порожній шлях без запитів, які мав би виміряти бюджет
+NOT_FOUND = "не знайдено"
+
+
+def pick_targets(conn, counts, runs):
+    """Цілі змін і видалень для кожного прогону: {таблиця: [(змінити, видалити, видалити каскадом), ...],
+    "author": [username, ...]}.
+
+    Каскадне видалення користувача чи записів автора прибирає і записи з нагадуваннями, тому записи
+    й нагадування обираються поза каскадами всіх прогонів - інакше пізніший прогін міряв би операцію
+    над уже видаленим рядком ("не знайдено") і отримав би менше запитів."""
+    users = [tuple(counts["user"] - 4 * run - k for k in range(3)) for run in range(runs)]
+    with conn.cursor() as cur:
+        # Автор для delete_entries_cascade_by_author: має записи, не читається (owner) і не змінюється
+        cur.execute("""
+            SELECT u.id, u.username FROM public."user" u
+            WHERE u.id > %s AND u.id <> ALL(%s) AND EXISTS (SELECT 1 FROM public.entry e WHERE e.user_id = u.id)
+            ORDER BY u.id DESC LIMIT %s
+        """, (runs, [user_id for run_users in users for user_id in run_users], runs))
+        authors = cur.fetchall()
+        removed_users = [cascade for _, _, cascade in users] + [user_id for user_id, _ in authors]
+        cur.execute("SELECT entry_id FROM public.entry WHERE user_id <> ALL(%s) ORDER BY entry_id DESC LIMIT %s",
+                    (removed_users, 3 * runs))
+        entry_ids = [row[0] for row in cur.fetchall()]
+        entries = [tuple(entry_ids[3 * run:3 * run + 3]) for run in range(runs)]
+        removed_entries = [entry_id for _, delete, cascade in entries for entry_id in (delete, cascade)]
+        cur.execute("""
+            SELECT r.reminder_id FROM public.reminder r JOIN public.entry e ON e.entry_id = r.entry_id
+            WHERE e.user_id <> ALL(%s) AND r.entry_id <> ALL(%s)
+            ORDER BY r.reminder_id DESC LIMIT %s
+        """, (removed_users, removed_entries, 2 * runs))
+        reminder_ids = [row[0] for row in cur.fetchall()]
+        # Запис, до якого update_reminder переносить нагадування, не видаляє жоден прогін
+        cur.execute("SELECT min(entry_id) FROM public.entry WHERE user_id <> ALL(%s) AND entry_id <> ALL(%s)",
+                    (removed_users, removed_entries))
+        kept_entry = cur.fetchone()[0]
+    conn.rollback()
+    if len(authors) < runs or len(entry_ids) < 3 * runs or len(reminder_ids) < 2 * runs or kept_entry is None:
+        sys.exit("Замало даних для неперетинних цілей прогонів: збільшіть --scales.")
+    reminders = [(reminder_ids[2 * run], reminder_ids[2 * run + 1], kept_entry) for run in range(runs)]
+    return {"user": users, "entry": entries, "reminder": reminders,
+            "author": [username for _, username in authors]}
+
+
+def operations(targets, run):
+    """[(метод, аргументи)] для run-го прогону: кожен прогін змінює й видаляє власні рядки (pick_targets)."""
+    user, user_delete, user_cascade = targets["user"][run]
+    entry, entry_delete, entry_cascade = targets["entry"][run]
+    reminder, reminder_delete, kept_entry = targets["reminder"][run]
+    owner = 1 + run  # користувач, чиї записи читаються (з початку таблиці - не видаляється)
+    return [
+        ("get_top_users", (10,)),
+        ("get_top_entries", (10,)),
+        ("get_top_reminders", (10,)),
+        ("get_page", ("entry",)),
+        ("find_user_by_id", (owner,)),
+        ("find_entry_by_id", (kept_entry,)),
+        ("find_reminder_by_id", (reminder,)),
+        ("search_flexible", ({"username": "A", "is_active": True},)),
+        ("search_entries_fulltext", ("ABC",)),
+        ("verify_user_stats", ()),
+        ("get_user_entries_details", (owner,)),
+        ("get_user_reminders_details", (owner,)),
+        ("stream_user_entries_details", (owner,)),
+        ("stream_user_reminders_details", (owner,)),
+        ("update_user", (user,) * 2 + (f"budget{run}", f"budget{run}@x.io", "pw")),
+        ("update_entry", (entry,) * 2 + ("budget", "text", owner)),
+        ("update_reminder", (reminder,) * 2 + (kept_entry, datetime(2026, 1, 1, 9, 0), True)),
+        ("delete_reminder", (reminder_delete,)),
+        ("delete_user", (user_delete,)),
+        ("delete_entry", (entry_delete,)),
+        ("delete_entry_cascade", (entry_cascade,)),
+        ("delete_user_cascade", (user_cascade,)),
+        ("delete_entries_cascade_by_author", (targets["author"][run],)),
+    ]
+
+
+def call(db, method, args, loader):
+    result = getattr(db, method)(*args, **({"loader": loader} if method == "get_user_entries_details" else {}))
+    if method.startswith("stream_") and isinstance(result, tuple):
+        list(result[1])  # запити генератора теж входять у бюджет
+    return result
+
+
+def variants(loaders):
+    """[(назва, read_mode, loader)]: у режимі rows зв'язки не завантажуються, loader не впливає."""
+    return [("rows", "rows", None)] + [(f"objects/{loader}", "objects", loader) for loader in loaders]
+
+
+def check(settings, total, loaders):
+    """Рядки під HEADERS; кожен варіант - окремий прогін operations()."""
+    counts = seed(settings, total, seed_value=42)
+    db = make_backend("sqlalchemy", settings)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if not db.connect():
+            sys.exit("Не вдалося підключити modelORM.")
+    rows = []
+    try:
+        with psycopg.connect(db.conn_info) as conn:
+            targets = pick_targets(conn, counts, len(variants(loaders)))
+        for run, (label, read_mode, loader) in enumerate(variants(loaders)):
+            db.read_mode = read_mode
+            db.loader = loader or modelORM.DEFAULT_LOADER
+            for method, args in operations(targets, run):
+                # Сесія очищується: бюджет рахується для "холодного" виклику, без об'єктів у identity map
+                db.session.expunge_all()
+                with querybudget.count_queries(*querybudget.model_engines(db)) as counter:
+                    result = call(db, method, args, loader)
+                budget = querybudget.budget_for(method, loader)
+                # Відмова delete_* через залежні рядки - очікуваний результат, а не помилка
+                message = str(result[0] if isinstance(result, tuple) else result)
+                if ((metrics.is_error(method, result) and not message.startswith("Неможливо"))
+                        or NOT_FOUND in message):
+                    status = f"ПОМИЛКА: {message.splitlines()[0][:80]}"
+                elif budget is not None and counter.count > budget:
+                    status = "ПЕРЕВИЩЕНО"
+                else:
+                    status = ""
+                rows.append((total, label, method, counter.count, budget, status))
+    finally:
+        db.disconnect()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бюджети SQL-запитів modelORM за режимами читання і стратегіями")
+    parser.add_argument("--scales", type=int, nargs="+", default=[2_000, 50_000],
+                        help="загальна кількість рядків тестових БД")
+    parser.add_argument("--loaders", nargs="+", choices=list(modelORM.LOADERS), default=list(modelORM.LOADERS))
+    parser.add_argument("--initdb", action="store_true", help="окремий кластер PostgreSQL (initdb)")
+    args = parser.parse_args()
+
+    rows = []
+    with contextlib.ExitStack() as stack:
+        server = stack.enter_context(throwaway_cluster()) if args.initdb else dict(DB_SETTINGS)
+        for total in args.scales:
+            with throwaway_database(server) as settings:
+                rows += check(settings, total, args.loaders)
+
+    print_rows(HEADERS, rows)
+    # Кількість запитів не повинна зростати з масштабом (зменшитись може: напр. delete_entry без
+    # нагадувань робить DELETE, а з нагадуваннями - відмовляє)
+    by_operation = {}
+    for total, label, method, queries, _, _ in rows:
+        by_operation.setdefault((label, method), []).append((total, queries))
+    growing = sorted(key for key, values in by_operation.items()
+                     if any(q2 > q1 for (t1, q1) in values for (t2, q2) in values if t2 > t1))
+    for label, method in growing:
+        print(f"{method} [{label}]: кількість запитів залежить від обсягу даних")
+    exceeded = [r for r in rows if r[-1] == "ПЕРЕВИЩЕНО"]
+    failed = [r for r in rows if r[-1].startswith("ПОМИЛКА")]
+    if exceeded or failed or growing:
+        print(f"\nПеревищено бюджет: {len(exceeded)}, помилок: {len(failed)}, залежить від масштабу: {len(growing)}.")
+        sys.exit(1)
+    print("\nУсі операції вклались у бюджет.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Пропускна здатність виводу таблиць (рядків/с): старий View.print_table (print() на рядок,
+# фіксована ширина 22, strftime) проти render.Renderer у режимах table / tsv / csv.
+# Вивід іде в os.devnull, тож вимірюється лише форматування та запис, без терміналу.
+#
+#   python -m benchmarks.render_throughput --rows 100000
+import argparse
+import contextlib
+import os
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import print_rows
+import render
+
+HEADERS = ["Rem ID", "Entry Title", "Remind At", "Active"]
+
+
+def legacy_print_table(headers, rows):
+    """View.print_table до render.py (для порівняння)."""
+    col_width = 22
+    header_row = " | ".join([f"{h:<{col_width}}" for h in headers])
+    div_line = "-" * len(header_row)
+
+    print(div_line)
+    print(header_row)
+    print(div_line)
+
+    for row in rows:
+        formatted_row = []
+        for item in row:
+            if isinstance(item, datetime):
+                formatted_row.append(item.strftime("%Y-%m-%d %H:%M:%S"))
+            else:
+                formatted_row.append(str(item))
+
+        row_str = " | ".join([f"{val:<{col_width}}" for val in formatted_row])
+        print(row_str)
+    print(div_line)
+
+
+def make_rows(count):
+    start = datetime(2025, 9, 1, 8, 0, 0, 123456)
+    return [(i, f"Title {i % 977}", start + timedelta(minutes=i), i % 2 == 0) for i in range(count)]
+
+
+def _measure(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Швидкість виводу таблиць: print_table vs render.Renderer")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3, help="повторів (береться найкращий)")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    results = []
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        def legacy():
+            with contextlib.redirect_stdout(devnull):
+                legacy_print_table(HEADERS, rows)
+
+        cases = [("print_table (старий)", legacy)]
+        for mode in render.MODES:
+            renderer = render.Renderer(out=devnull, mode=mode, pager=False)
+            cases.append((f"Renderer, {mode}", lambda r=renderer: r.render(HEADERS, rows)))
+
+        baseline = None
+        for name, func in cases:
+            seconds = _measure(func, args.repeat)
+            baseline = baseline or seconds
+            results.append((name, f"{args.rows / seconds:,.0f}", f"{seconds * 1000:.1f}", f"{baseline / seconds:.2f}x"))
+
+    print(f"\n{args.rows} рядків, вивід у {os.devnull}")
+    print_rows(["Спосіб", "Рядків/с", "Час, мс", "Прискорення"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# Порівняння старого search_flexible (LEFT JOIN + COUNT(DISTINCT)) з новим (search.py, спершу агрегація)
+# на наборі комбінацій фільтрів. Для кожної комбінації перевіряється, що результати однакові.
+# --heavy додає в поточну БД «важких» користувачів з великою кількістю записів і нагадувань.
+#
+#   python -m benchmarks.search_fanout --heavy 20 --entries 5000 --reminders 4
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+import generator
+from benchmarks.common import DB_SETTINGS, print_rows
+from model import Model
+from search import build_search_query
+
+FILTER_SETS = {
+    "без фільтрів": {},
+    "username": {"username": "A"},
+    "title": {"title": "AB"},
+    "is_active": {"is_active": True},
+    "дати": {"date_from": datetime(2025, 10, 1), "date_to": datetime(2025, 12, 31)},
+    "title + is_active": {"title": "A", "is_active": False},
+    "username + дати": {"username": "B", "date_from": datetime(2025, 10, 1), "date_to": datetime(2026, 3, 1)},
+}
+
+
+def legacy_search_query(filters):
+    """Запит search_flexible до переписування (для порівняння)."""
+    query = """
+        SELECT u.id, u.username, u.email,
+               COUNT(DISTINCT e.entry_id) as entries_count,
+               COUNT(DISTINCT r.reminder_id) as reminders_count
+        FROM public."user" u
+        LEFT JOIN public.entry e ON u.id = e.user_id
+        LEFT JOIN public.reminder r ON e.entry_id = r.entry_id
+        WHERE 1=1
+    """
+    params = []
+    for key, column in (("username", "u.username"), ("email", "u.email"), ("title", "e.title"), ("text", "e.text")):
+        if filters.get(key):
+            query += f" AND {column} ILIKE %s"
+            params.append(f"%{filters[key]}%")
+    if filters.get('is_active') is not None:
+        query += " AND r.active = %s"
+        params.append(filters['is_active'])
+    if filters.get('date_from') and filters.get('date_to'):
+        query += " AND r.remind_at BETWEEN %s AND %s"
+        params.extend([filters['date_from'], filters['date_to']])
+    return query + " GROUP BY u.id, u.username, u.email ORDER BY u.id", params
+
+
+def _split_ranges(ids):
+    return np.split(ids, np.flatnonzero(np.diff(ids) != 1) + 1)
+
+
+def _reserved_ids(db, table, count):
+    return np.concatenate([np.arange(start, start + n) for start, n in db.ids.reserve(db.cursor, table, count)])
+
+
+def seed_heavy(db, users, entries, reminders):
+    """Додає users користувачів по entries записів, у кожного запису ~reminders нагадувань."""
+    user_ids = _reserved_ids(db, "user", users)
+    written = 0
+    for ids in _split_ranges(user_ids):
+        written += generator.copy_users(db.cursor, int(ids[0]), len(ids), seed=1)
+    entry_ids = _reserved_ids(db, "entry", users * entries)
+    for ids in _split_ranges(entry_ids):
+        generator.copy_entries(db.cursor, int(ids[0]), len(ids), generator.ParentIds(ids=user_ids), seed=2)
+    for start, n in db.ids.reserve(db.cursor, "reminder", users * entries * reminders):
+        generator.copy_reminders(db.cursor, start, n, generator.ParentIds(ids=entry_ids), seed=3)
+    db.connection.commit()
+    db.cursor.execute("ANALYZE")
+    print(f"Додано {written} користувачів, {len(entry_ids)} записів, {users * entries * reminders} нагадувань.")
+
+
+def _timed(cursor, query, params, repeat):
+    times, rows = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        times.append(time.perf_counter() - start)
+    return rows, statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="search_flexible: старий запит vs агрегація до join")
+    parser.add_argument("--heavy", type=int, default=0, help="скільки важких користувачів додати перед замірами")
+    parser.add_argument("--entries", type=int, default=5000, help="записів на важкого користувача")
+    parser.add_argument("--reminders", type=int, default=4, help="нагадувань на запис (в середньому)")
+    parser.add_argument("--repeat", type=int, default=3, help="повторів на запит (береться медіана)")
+    args = parser.parse_args()
+
+    db = Model(**DB_SETTINGS)
+    if not db.connect():
+        sys.exit(1)
+    try:
+        if args.heavy:
+            seed_heavy(db, args.heavy, args.entries, args.reminders)
+
+        rows, mismatches = [], 0
+        for name, filters in FILTER_SETS.items():
+            old_rows, old_s = _timed(db.cursor, *legacy_search_query(filters), args.repeat)
+            new_rows, new_s = _timed(db.cursor, *build_search_query(filters), args.repeat)
+            same = old_rows == new_rows
+            mismatches += not same
+            rows.append((name, len(new_rows), f"{old_s * 1000:.1f}", f"{new_s * 1000:.1f}",
+                         f"{old_s / new_s:.2f}x", "так" if same else "НІ"))
+        db.connection.rollback()
+    finally:
+        db.disconnect()
+
+    print_rows(["Фільтри", "Рядків", "Старий, мс", "Новий, мс", "Прискорення", "Збіг"], rows)
+    if mismatches:
+        sys.exit(f"Результати відрізняються для {mismatches} комбінацій фільтрів.")
+
+
+if __name__ == "__main__":
+    main()
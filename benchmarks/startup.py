@@ -0,0 +1,118 @@
+# Час старту застосунку: від запуску процесу Python до результату першого запиту. Кожен запуск -
+# окремий процес (холодні імпорти), як короткий виклик з консолі чи cron: import controller,
+# controller.create_model(DIARY_BACKEND), connect(), get_top_users(1).
+# Режими схеми:
+#   version - міграції лише при зміні версії схеми (schema.py, PRAGMA user_version у SQLite);
+#   force   - DIARY_SCHEMA_FORCE=1: міграції при кожному connect(), як до появи версії схеми.
+# "Модулі" - які з важких залежностей (psycopg, sqlalchemy, numpy) імпортував процес.
+#
+#   python -m benchmarks.startup
+#   python -m benchmarks.startup --backends sqlite postgres --runs 20
+#   python -m benchmarks.startup --root /tmp/old   # те саме для іншої копії коду (git worktree)
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.backends import make_backend, throwaway_cluster, throwaway_database
+from benchmarks.common import DB_SETTINGS, ROOT, print_rows
+
+HEADERS = ["Backend", "Schema", "Інтерпретатор, мс", "Імпорт, мс", "connect(), мс", "Перший запит, мс",
+           "Усього, мс", "Модулі"]
+HEAVY = ("psycopg", "sqlalchemy", "numpy")
+
+# Виконується в дочірньому процесі; час - від першого рядка, старт інтерпретатора рахує батьківський
+CHILD = """
+import time
+started = time.time()
+t0 = time.perf_counter()
+import contextlib, io, json, os, sys
+import controller
+controller.DB_SETTINGS.update(json.loads(os.environ["STARTUP_DB_SETTINGS"]))
+backend = os.environ["DIARY_BACKEND"]
+db = controller.create_model(backend)
+host = controller.DB_SETTINGS["host"]
+if backend == "orm" and host.startswith("/"):
+    # Unix-сокет - параметром URL, як у benchmarks.backends.make_backend
+    s = controller.DB_SETTINGS
+    db.db_url = f"postgresql+psycopg://{s['user']}:{s['password']}@/{s['db_name']}?host={host}&port={s['port']}"
+t1 = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    connected = db.connect()
+t2 = time.perf_counter()
+rows = db.get_top_users(1)
+t3 = time.perf_counter()
+db.disconnect()
+print(json.dumps({"started": started, "import": t1 - t0, "connect": t2 - t1, "query": t3 - t2,
+                  "ok": connected and not isinstance(rows, str),
+                  "modules": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY,)
+
+
+def launch(root, env):
+    """Один запуск: {фаза: секунди} + "interpreter" - від spawn до першого рядка дочірнього процесу."""
+    spawned = time.time()
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", CHILD], cwd=root, env=env, capture_output=True, text=True)
+    total = time.perf_counter() - started
+    if out.returncode != 0:
+        sys.exit(f"Дочірній процес завершився з помилкою:\n{out.stderr}")
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    if not result["ok"]:
+        sys.exit(f"{env['DIARY_BACKEND']}: не вдалося підключитися або виконати перший запит.")
+    result["interpreter"] = result.pop("started") - spawned
+    result["total"] = total
+    return result
+
+
+def measure(root, backend, schema, settings, sqlite_path, runs):
+    env = dict(os.environ, DIARY_BACKEND=backend, STARTUP_DB_SETTINGS=json.dumps(settings),
+               DIARY_SQLITE_PATH=sqlite_path)
+    env.pop("DIARY_SCHEMA_FORCE", None)
+    launch(root, env)  # прогрів: встановлення схеми / версії, кеш файлів ОС
+    if schema == "force":
+        env["DIARY_SCHEMA_FORCE"] = "1"
+    results = [launch(root, env) for _ in range(runs)]
+
+    def median_ms(phase):
+        return round(statistics.median(r[phase] for r in results) * 1000, 1)
+
+    return (backend, schema, median_ms("interpreter"), median_ms("import"), median_ms("connect"),
+            median_ms("query"), median_ms("total"), ", ".join(results[-1]["modules"]) or "-")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Час від запуску процесу до першого запиту за бекендами")
+    parser.add_argument("--backends", nargs="+", choices=["postgres", "orm", "sqlite"],
+                        default=["postgres", "orm", "sqlite"])
+    parser.add_argument("--schema", nargs="+", choices=["version", "force"], default=["version", "force"])
+    parser.add_argument("--runs", type=int, default=10, help="запусків на варіант (береться медіана)")
+    parser.add_argument("--root", default=ROOT, help="каталог коду, що запускається")
+    parser.add_argument("--initdb", action="store_true", help="окремий кластер PostgreSQL (initdb)")
+    args = parser.parse_args()
+
+    rows = []
+    with contextlib.ExitStack() as stack:
+        server = stack.enter_context(throwaway_cluster()) if args.initdb else dict(DB_SETTINGS)
+        settings = stack.enter_context(throwaway_database(server))
+        # Таблиці створює modelORM (model.py очікує готову схему), як і seed() у benchmarks.backends
+        db = make_backend("sqlalchemy", settings)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            if not db.connect():
+                sys.exit("Не вдалося створити схему тестової БД.")
+        db.disconnect()
+        sqlite_path = os.path.join(stack.enter_context(tempfile.TemporaryDirectory()), "startup.sqlite3")
+        for backend in args.backends:
+            for schema in args.schema:
+                rows.append(measure(args.root, backend, schema, settings, sqlite_path, args.runs))
+                print(f"  {backend:<9} {schema:<8} {rows[-1][6]:>8} мс")
+    print_rows(HEADERS, rows)
+
+
+if __name__ == "__main__":
+    main()
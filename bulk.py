@@ -0,0 +1,146 @@
+import sqlite3
+from collections import namedtuple
+
+# --- МАСОВА ВСТАВКА (add_*_bulk) ---
+# Рядки передаються кортежами в порядку аргументів add_*: (id, ...). id=None - ID з послідовності
+# (такі рядки вставляються після рядків з явними ID, див. batches()).
+# Пакет з batch_size рядків вставляється одним executemany (psycopg відправляє його в pipeline-режимі,
+# без очікування відповіді на кожен рядок) і фіксується одним commit.
+#   * INSERT ... ON CONFLICT DO NOTHING RETURNING pk: рядок, що порушує унікальність, просто не
+#     повертається і потрапляє у звіт помилок, а не обриває пакет;
+#   * рядки з відсутнім батьківським ID відсіюються до вставки одним запитом (= ANY);
+#   * якщо пакет усе ж упав (довгі рядки, батька видалили паралельно...), він повторюється
+#     порядково в savepoint-ах, тож помилка лишається прив'язаною до свого рядка.
+
+BulkSpec = namedtuple("BulkSpec", "table columns parent_column parent_table parent_pk what")
+
+TABLES = {
+    "user": BulkSpec('public."user"', ["id", "username", "email", "password"], None, None, None, "користувачів"),
+    "entry": BulkSpec("public.entry", ["entry_id", "title", "text", "user_id"],
+                      "user_id", 'public."user"', "id", "записів"),
+    "reminder": BulkSpec("public.reminder", ["reminder_id", "entry_id", "remind_at", "active"],
+                         "entry_id", "public.entry", "entry_id", "нагадувань"),
+}
+
+DEFAULT_BATCH_SIZE = 1000
+ERROR_HEADERS = ["Row", "ID", "Error"]
+
+# Батьківська таблиця для повідомлення про порушення FK
+PARENT_NAMES = {"entry": "User ID", "reminder": "Entry ID"}
+CONFLICT_MESSAGES = {
+    "user": "Такий ID, email або username вже існує.",
+    "entry": "Такий ID вже існує.",
+    "reminder": "Такий ID вже існує.",
+}
+
+
+def insert_query(table):
+    spec = TABLES[table]
+    return (f"INSERT INTO {spec.table} ({', '.join(spec.columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(spec.columns))}) "
+            f"ON CONFLICT DO NOTHING RETURNING {spec.columns[0]}")
+
+
+def parent_query(table):
+    spec = TABLES[table]
+    return f"SELECT {spec.parent_pk} FROM {spec.parent_table} WHERE {spec.parent_pk} = ANY(%s)"
+
+
+def parent_ids(table, batch):
+    """Батьківські ID пакета [(номер, рядок)] для parent_query або None, якщо у таблиці немає FK."""
+    spec = TABLES[table]
+    if spec.parent_column is None:
+        return None
+    position = spec.columns.index(spec.parent_column)
+    return list({row[position] for _, row in batch if row[position] is not None})
+
+
+def split_missing_parents(table, batch, existing):
+    """Відокремлює рядки, чиїх батьківських ID немає серед existing. Повертає (придатні, помилки)."""
+    spec = TABLES[table]
+    position = spec.columns.index(spec.parent_column)
+    valid, bad = [], []
+    for number, row in batch:
+        if row[position] is not None and row[position] not in existing:
+            bad.append((number, row[0], f"{PARENT_NAMES[table]} {row[position]} не існує."))
+        else:
+            valid.append((number, row))
+    return valid, bad
+
+
+def conflict_message(table):
+    return CONFLICT_MESSAGES[table]
+
+
+def sqlite_violation(exc):
+    """Порушене обмеження з тексту sqlite3.IntegrityError: "UNIQUE", "FOREIGN KEY", "CHECK", "NOT NULL" або None.
+
+    На відміну від psycopg, sqlite3 не має окремого класу винятку для кожного виду порушення.
+    """
+    if not isinstance(exc, sqlite3.IntegrityError):
+        return None
+    kind, found, _ = str(exc).partition(" constraint failed")
+    return kind if found else None
+
+
+# SQLSTATE винятків psycopg (errors.UniqueViolation, ForeignKeyViolation, StringDataRightTruncation) -> вид
+# порушення, як у sqlite_violation. За кодом, а не класом: бекенду SQLite не потрібно імпортувати psycopg
+PG_VIOLATIONS = {"23505": "UNIQUE", "23503": "FOREIGN KEY", "22001": "CHECK"}
+
+
+def row_error(table, row, exc):
+    """Текст помилки рядка за винятком БД (на кшталт повідомлень add_*)."""
+    spec = TABLES[table]
+    exc = getattr(exc, "orig", None) or exc  # IntegrityError SQLAlchemy обгортає виняток psycopg
+    violation = sqlite_violation(exc) or PG_VIOLATIONS.get(getattr(exc, "sqlstate", None))
+    if violation == "UNIQUE":
+        return conflict_message(table)
+    if violation == "FOREIGN KEY" and spec.parent_column:
+        return f"{PARENT_NAMES[table]} {row[spec.columns.index(spec.parent_column)]} не існує."
+    # У SQLite довжину varchar перевіряють CHECK (length(...) <= n)
+    if violation == "CHECK":
+        return "Дані занадто довгі."
+    return str(exc).strip().splitlines()[0]
+
+
+def normalize(table, rows):
+    """Розділяє вхідні рядки на придатні [(номер, рядок)] і помилки [(номер, id, текст)]."""
+    width = len(TABLES[table].columns)
+    valid, bad = [], []
+    for number, row in enumerate(rows, 1):
+        row = tuple(row)
+        if len(row) != width:
+            bad.append((number, row[0] if row else None, f"Очікується {width} полів, отримано {len(row)}."))
+        else:
+            valid.append((number, row))
+    return valid, bad
+
+
+def batches(rows, batch_size):
+    """Пакети [(номер, рядок)] і ознака "ID з послідовності": спершу рядки з явним ID, потім без нього.
+
+    ID для рядків без нього резервуються лише після вставки (і синхронізації послідовності)
+    рядків з явними ID - інакше виданий ID міг би збігтися з явним ID, що ще не вставлений.
+    """
+    batch_size = max(1, batch_size)
+    for auto in (False, True):
+        part = [(number, row) for number, row in rows if (row[0] is None) == auto]
+        for i in range(0, len(part), batch_size):
+            yield part[i:i + batch_size], auto
+
+
+def assign_ids(rows, new_ids):
+    """Підставляє ID з new_ids у рядки з id=None (у тому ж порядку)."""
+    new_ids = iter(new_ids)
+    return [(number, row if row[0] is not None else (next(new_ids), *row[1:])) for number, row in rows]
+
+
+def id_ranges_to_list(ranges):
+    return [start + i for start, count in ranges for i in range(count)]
+
+
+def result_message(table, inserted, total, failed, seconds):
+    message = f"Додано {inserted} з {total} {TABLES[table].what} за {seconds:.2f} с."
+    if failed:
+        message += f" Рядків з помилками: {failed}."
+    return message
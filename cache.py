@@ -0,0 +1,171 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+# --- КЕШ ДЛЯ find_*_by_id (READ-THROUGH, LRU + TTL) ---
+# CachedModel обгортає model.Model або modelORM.Model: find_*_by_id спершу шукають рядок у кеші,
+# а після кожного методу, що змінює дані, відповідні ключі (або вся таблиця) інвалідовуються.
+# Порожні результати й тексти помилок не кешуються, тож add_* інвалідації не потребують.
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_TTL = 30.0  # секунд
+
+TABLES = ("user", "entry", "reminder")
+
+
+class LRUCache:
+    """Потокобезпечний LRU-кеш з обмеженим розміром і часом життя записів."""
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()  # (таблиця, id) -> (час закінчення, значення)
+        self._versions = dict.fromkeys(TABLES, 0)
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(("hits", "misses", "evictions", "expired", "invalidations"), 0)
+
+    def version(self, table):
+        with self._lock:
+            return self._versions[table]
+
+    def get(self, key):
+        """Повертає (знайдено, значення)."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                expires, value = item
+                if expires > self._clock():
+                    self._data.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return True, value
+                del self._data[key]
+                self._counters["expired"] += 1
+            self._counters["misses"] += 1
+            return False, None
+
+    def put(self, key, value, version):
+        """Зберігає значення, якщо таблицю не інвалідовано після початку читання (version)."""
+        with self._lock:
+            if self._versions[key[0]] != version:
+                return
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, table, key_id=None):
+        """Видаляє один ключ таблиці або (key_id=None) усі її ключі."""
+        with self._lock:
+            # Нова версія не дає зберегти значення, прочитане з БД до цієї зміни
+            self._versions[table] += 1
+            if key_id is not None:
+                removed = self._data.pop((table, key_id), None) is not None
+            else:
+                keys = [k for k in self._data if k[0] == table]
+                for k in keys:
+                    del self._data[k]
+                removed = bool(keys)
+            if removed:
+                self._counters["invalidations"] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["size"] = len(self._data)
+        lookups = stats["hits"] + stats["misses"]
+        stats["max_size"] = self.max_size
+        stats["ttl_s"] = self.ttl
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+# --- ЩО ІНВАЛІДУЄ КОЖЕН МЕТОД ---
+# метод -> функція від аргументів виклику, що повертає список (таблиця, id); id None - вся таблиця
+ALL = [(table, None) for table in TABLES]
+
+
+def _keys(table, *key_ids):
+    return [(table, key_id) for key_id in key_ids]
+
+
+def _id_change(current_id, new_id, dependent):
+    # Зміна PK може змінити FK-стовпець у залежній таблиці
+    return [(dependent, None)] if current_id != new_id else []
+
+
+INVALIDATION = {
+    "update_user": lambda cur, new, *_: _keys("user", cur, new) + _id_change(cur, new, "entry"),
+    "update_entry": lambda cur, new, *_: _keys("entry", cur, new) + _id_change(cur, new, "reminder"),
+    "update_reminder": lambda cur, new, *_: _keys("reminder", cur, new),
+    "delete_user": lambda user_id: _keys("user", user_id),
+    "delete_user_by_attr": lambda *_: [("user", None)],
+    "delete_user_cascade": lambda user_id: _keys("user", user_id) + [("entry", None), ("reminder", None)],
+    "delete_user_cascade_by_attr": lambda *_: ALL,
+    "delete_entry": lambda entry_id: _keys("entry", entry_id),
+    "delete_entries_by_author": lambda *_: [("entry", None)],
+    "delete_entry_cascade": lambda entry_id: _keys("entry", entry_id) + [("reminder", None)],
+    "delete_entries_cascade_by_author": lambda *_: [("entry", None), ("reminder", None)],
+    "delete_reminder": lambda reminder_id: _keys("reminder", reminder_id),
+    "delete_reminders_by_date": lambda *_: [("reminder", None)],
+    "delete_reminders_by_status": lambda *_: [("reminder", None)],
+    "clear_table_users": lambda: ALL,
+    "clear_table_entries": lambda: [("entry", None), ("reminder", None)],
+    "clear_table_reminders": lambda: [("reminder", None)],
+    "delete_all_data": lambda: ALL,
+}
+
+
+class CachedModel:
+    """Обгортка над model.Model / modelORM.Model з кешем find_*_by_id. Решта методів - без змін."""
+
+    def __init__(self, model, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL):
+        self.model = model
+        self.cache = LRUCache(max_size, ttl)
+
+    def __getattr__(self, name):
+        # Викликається лише для атрибутів, яких ще немає в обгортці
+        attr = getattr(self.model, name)
+        if name not in INVALIDATION:
+            return attr
+
+        @wraps(attr)
+        def mutator(*args, **kwargs):
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                # Інвалідуємо навіть після помилки: частина змін могла відбутися
+                try:
+                    keys = INVALIDATION[name](*args, **kwargs)
+                except TypeError:  # незвичні аргументи - скидаємо весь кеш
+                    keys = ALL
+                for table, key_id in keys:
+                    self.cache.invalidate(table, key_id)
+        # Обгортка будується один раз: наступні звернення знаходять її в екземплярі без __getattr__
+        setattr(self, name, mutator)
+        return mutator
+
+    def _find(self, table, method, key_id):
+        key = (table, key_id)
+        found, value = self.cache.get(key)
+        if found:
+            return list(value)
+        version = self.cache.version(table)
+        value = method(key_id)
+        if value and not isinstance(value, str):
+            self.cache.put(key, list(value), version)
+        return value
+
+    def find_user_by_id(self, user_id):
+        return self._find("user", self.model.find_user_by_id, user_id)
+
+    def find_entry_by_id(self, entry_id):
+        return self._find("entry", self.model.find_entry_by_id, entry_id)
+
+    def find_reminder_by_id(self, reminder_id):
+        return self._find("reminder", self.model.find_reminder_by_id, reminder_id)
+
+    def get_cache_stats(self):
+        return self.cache.stats()
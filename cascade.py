@@ -0,0 +1,101 @@
+# --- КАСКАДНЕ ВИДАЛЕННЯ НА СЕРВЕРІ (ON DELETE CASCADE) ---
+# FK entry.user_id і reminder.entry_id оголошені з ON DELETE CASCADE, тож delete_*_cascade - один DELETE
+# батьківських рядків: записи й нагадування видаляє сам PostgreSQL, клієнт нічого не завантажує
+# (у modelORM відношення з passive_deletes). Скільки рядків видалено, рахує той самий оператор:
+# підзапити поруч із DELETE у WITH бачать дані ще до видалення.
+#
+# Звичайні delete_* каскаду не роблять. Рядки спершу блокуються FOR UPDATE (несумісно з FK-перевіркою
+# нового дочірнього рядка), і лише наступний оператор перевіряє залежні - він бачить усе закомічене,
+# тож каскад не зачепить запис, доданий паралельно.
+#
+# Міграція: у БД з lab1.sql reminder_entry_id_fkey - NOT VALID і без дії при видаленні, а FK на entry.user_id
+# може не бути взагалі. install() замінює їх на ON DELETE CASCADE ... NOT VALID (коротке блокування, без
+# перевірки наявних рядків), validate() після commit робить VALIDATE CONSTRAINT: блокування SHARE UPDATE
+# EXCLUSIVE не заважає ні читанню, ні запису. Якщо наявні дані порушують FK, обмеження лишається NOT VALID -
+# нові рядки все одно перевіряються, і каскад працює.
+
+# Версія міграції install()/validate() для schema.py
+SCHEMA_VERSION = 1
+
+# (таблиця, обмеження, стовпець, батьківська таблиця, її PK)
+FOREIGN_KEYS = [
+    ("public.entry", "entry_user_id_fkey", "user_id", 'public."user"', "id"),
+    ("public.reminder", "reminder_entry_id_fkey", "entry_id", "public.entry", "entry_id"),
+]
+
+# Каскад одним оператором; {where} - умова на батьківську таблицю.
+# Користувачі: (видалено користувачів, записів, нагадувань)
+DELETE_USERS = """
+    WITH deleted AS (DELETE FROM public."user" WHERE {where} RETURNING id)
+    SELECT (SELECT count(*) FROM deleted),
+           (SELECT count(*) FROM public.entry WHERE user_id IN (SELECT id FROM deleted)),
+           (SELECT count(*) FROM public.reminder r JOIN public.entry e ON e.entry_id = r.entry_id
+            WHERE e.user_id IN (SELECT id FROM deleted))
+"""
+
+# Записи: (видалено записів, нагадувань)
+DELETE_ENTRIES = """
+    WITH deleted AS (DELETE FROM public.entry WHERE {where} RETURNING entry_id)
+    SELECT (SELECT count(*) FROM deleted),
+           (SELECT count(*) FROM public.reminder WHERE entry_id IN (SELECT entry_id FROM deleted))
+"""
+
+# таблиця -> (ім'я, PK, дочірня таблиця, FK) для delete_* без каскаду
+RESTRICT = {
+    "user": ('public."user"', "id", "public.entry", "user_id"),
+    "entry": ("public.entry", "entry_id", "public.reminder", "entry_id"),
+}
+
+
+def restrict_queries(table, where):
+    """(блокування рядків, перевірка залежних, видалення) для delete_* без каскаду."""
+    name, pk, child, fk = RESTRICT[table]
+    return (f"SELECT {pk} FROM {name} WHERE {where} ORDER BY {pk} FOR UPDATE",
+            f"SELECT EXISTS (SELECT 1 FROM {child} WHERE {fk} = ANY(%s))",
+            f"DELETE FROM {name} WHERE {pk} = ANY(%s)")
+
+
+def _constraints(cursor, table, parent):
+    cursor.execute("""
+        SELECT conname, confdeltype = 'c', convalidated FROM pg_constraint
+        WHERE contype = 'f' AND conrelid = %s::regclass AND confrelid = %s::regclass
+    """, (table, parent))
+    return cursor.fetchall()
+
+
+def install(cursor):
+    """Міграція FK на ON DELETE CASCADE (без перевірки наявних рядків). Ідемпотентна; commit робить викликач."""
+    changed = False
+    for table, name, column, parent, parent_pk in FOREIGN_KEYS:
+        existing = _constraints(cursor, table, parent)
+        if any(cascade for _, cascade, _ in existing):
+            continue
+        for conname, _, _ in existing:
+            cursor.execute(f"ALTER TABLE {table} DROP CONSTRAINT {conname}")
+        cursor.execute(f"""
+            ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column})
+            REFERENCES {parent} ({parent_pk}) ON DELETE CASCADE NOT VALID
+        """)
+        changed = True
+    return changed
+
+
+def validate(cursor):
+    """VALIDATE CONSTRAINT для FK, що ще NOT VALID. Повертає повідомлення про ті, що не пройшли перевірку."""
+    from psycopg import errors  # лише тут: SQL модуля використовує й бекенд SQLite (через statements.py)
+
+    problems = []
+    for table, _, _, parent, _ in FOREIGN_KEYS:
+        for conname, _, validated in _constraints(cursor, table, parent):
+            if validated:
+                continue
+            try:
+                with cursor.connection.transaction():
+                    cursor.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {conname}")
+            except errors.ForeignKeyViolation as e:
+                problems.append(f"{conname} лишається NOT VALID: {str(e).splitlines()[0]}")
+    return problems
+
+
+def removed_message(entries, reminders):
+    return f"записів: {entries}, нагадувань: {reminders}"
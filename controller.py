@@ -1,8 +1,46 @@
+import os
 import sys
-from model import Model
+import time
+import indexes
+import metrics
+import paging
+import statements
+import transfer
+import userstats
+from cache import CachedModel
+from metrics import InstrumentedModel
 from view import View
 
 
+DB_SETTINGS = dict(
+    db_name="postgres",
+    user="postgres",
+    password="1223334444",
+    host="localhost",
+    port="5432"
+)
+
+BACKENDS = ("postgres", "orm", "sqlite")
+
+
+def create_model(backend):
+    """Модель для DIARY_BACKEND: postgres - model.py (psycopg), orm - modelORM.py (SQLAlchemy),
+    sqlite - modelSQLite.py (файл DIARY_SQLITE_PATH, без сервера)."""
+    # Модулі бекендів імпортуються лише за потреби: для SQLite не потрібні ні SQLAlchemy, ні psycopg,
+    # для postgres - SQLAlchemy (див. benchmarks.startup)
+    match backend:
+        case "postgres":
+            import model
+            return model.Model(**DB_SETTINGS)
+        case "orm":
+            import modelORM
+            return modelORM.Model(**DB_SETTINGS)
+        case "sqlite":
+            import modelSQLite
+            return modelSQLite.Model()
+    raise ValueError(f"невідомий бекенд '{backend}', доступні: {', '.join(BACKENDS)}")
+
+
 def run():
     # --- ПЕРЕВІРКА ВЕРСІЇ PYTHON ---
     # match-case працює тільки в Python 3.10+
@@ -11,18 +49,23 @@ def run():
         return
 
     # --- НАЛАШТУВАННЯ ПІДКЛЮЧЕННЯ ---
-    db = Model(
-        db_name="postgres",
-        user="postgres",
-        password="1223334444",
-        host="localhost",
-        port="5432"
-    )
+    # find_*_by_id читаються через LRU/TTL-кеш (cache.py), зміни даних його інвалідовують;
+    # кожен виклик методу потрапляє в метрики (metrics.py)
     view = View()
+    try:
+        db = InstrumentedModel(CachedModel(create_model(os.environ.get("DIARY_BACKEND", "postgres"))))
+    except (ValueError, ImportError) as e:
+        view.show_message(f"Помилка вибору бекенду: {e}")
+        return
 
     # Спроба підключення
     if db.connect():
         view.show_message("Підключено до БД успішно!")
+        try:
+            if server := metrics.serve_from_env(db.metrics):
+                view.show_message(f"Метрики: http://{server.server_address[0]}:{server.server_port}/metrics")
+        except (OSError, ValueError) as e:
+            view.show_message(f"Не вдалося запустити HTTP-ендпоінт метрик: {e}")
     else:
         view.show_message("Не вдалося підключитися до бази даних.")
         return
@@ -31,11 +74,44 @@ def run():
         main_choice = view.show_main_menu()
 
         match main_choice:
-            # --- 8. ВИХІД ---
-            case '8':
+            # --- 9. ВИХІД ---
+            case '9':
                 db.disconnect()
                 view.show_message("Роботу завершено.")
                 break
+            # --- 8. ОБСЛУГОВУВАННЯ БД ---
+            case '8':
+                match view.show_service_menu():
+                    case '1':
+                        view.print_table(indexes.REPORT_HEADERS, db.get_index_report())
+                    case '2':
+                        view.print_table(userstats.VERIFY_HEADERS, db.verify_user_stats(),
+                                         empty_message="Лічильники user_stats відповідають даним.")
+                    case '3':
+                        view.show_message(db.rebuild_user_stats())
+                    case '4':
+                        view.print_table(["Metric", "Value"], list(db.get_cache_stats().items()))
+                    case '5':
+                        view.print_table(statements.STATS_HEADERS, db.get_statement_stats(),
+                                         empty_message="Підготовлені запити ще не виконувались.")
+                        if hasattr(db, "get_compile_cache_stats"):  # modelORM: кеш скомпільованого SQL
+                            view.print_table(["Metric", "Value"], list(db.get_compile_cache_stats().items()))
+                    case '6':
+                        view.show_message(db.export_data(*view.get_export_options()))
+                    case '7':
+                        message, errors = db.import_data(view.get_import_directory())
+                        if errors:
+                            view.print_table(transfer.ERROR_HEADERS, errors)
+                        view.show_message(message)
+                    case '8':
+                        view.print_table(metrics.HEADERS, db.get_metrics(),
+                                         empty_message="Операцій ще не було.")
+                    case '9':
+                        view.show_message(db.export_metrics(view.get_metrics_path()))
+                    case '0':
+                        continue
+                    case _:
+                        view.show_message("Невірний вибір.")
             # --- 7. ОЧИЩЕННЯ БАЗИ ---
             case '7':
                 if view.get_global_purge_confirmation():
@@ -52,16 +128,17 @@ def run():
 
                 count = view.get_generation_count()
                 if not count: continue
+                workers = view.get_worker_count()
 
                 view.show_message(f"Генеруємо {count} записів... Зачекайте...")
 
                 match entity_choice:
                     case '1':
-                        view.show_message(db.generate_users(count))
+                        view.show_message(db.generate_users(count, workers))
                     case '2':
-                        view.show_message(db.generate_entries(count))
+                        view.show_message(db.generate_entries(count, workers))
                     case '3':
-                        view.show_message(db.generate_reminders(count))
+                        view.show_message(db.generate_reminders(count, workers))
                     case _:
                         view.show_message("Невірний вибір таблиці.")
 
@@ -101,30 +178,43 @@ def run():
                     # 5.3 Показати всі ЗАПИСИ користувача
                     case '3':
                         if uid := view.get_id_input("User", context="Пошук записів"):
-                            result = db.get_user_entries_details(uid)
+                            # Рядки читаються серверним курсором і друкуються в міру надходження
+                            result = db.stream_user_entries_details(uid)
                             if isinstance(result, str):
                                 view.show_message(result)
                             else:
                                 username, entries = result
                                 view.show_message(f"Всі записи користувача: {username}")
-                                if not entries:
-                                    view.show_message("Записів не знайдено.")
-                                else:
-                                    view.print_table(["Entry ID", "Title", "Text"], entries)
+                                try:
+                                    view.print_table(["Entry ID", "Title", "Text"], entries,
+                                                     empty_message="Записів не знайдено.")
+                                except Exception as e:
+                                    # Обрив з'єднання посеред читання - рядки до нього вже надруковано
+                                    view.show_message(f"Помилка читання записів: {e}")
 
                     # 5.4 Показати всі НАГАДУВАННЯ користувача
                     case '4':
                         if uid := view.get_id_input("User", context="Пошук нагадувань"):
-                            result = db.get_user_reminders_details(uid)
+                            result = db.stream_user_reminders_details(uid)
                             if isinstance(result, str):
                                 view.show_message(result)
                             else:
                                 username, reminders = result
                                 view.show_message(f"Нагадування користувача: {username}")
-                                if not reminders:
-                                    view.show_message("Нагадувань не знайдено.")
-                                else:
-                                    view.print_table(["Rem ID", "Entry Title", "Remind At", "Active"], reminders)
+                                try:
+                                    view.print_table(["Rem ID", "Entry Title", "Remind At", "Active"], reminders,
+                                                     empty_message="Нагадувань не знайдено.")
+                                except Exception as e:
+                                    view.show_message(f"Помилка читання нагадувань: {e}")
+
+                    # 5.5 Повнотекстовий пошук по записах (ранжування ts_rank)
+                    case '5':
+                        if params := view.get_fulltext_input():
+                            res, t = db.search_entries_fulltext(*params)
+                            if isinstance(res, str):
+                                view.show_message(res)
+                            else:
+                                view.show_fulltext_results(res, t)
 
                     case '0':
                         continue
@@ -269,19 +359,32 @@ def run():
                     case _:
                         view.show_message("Невірний вибір.")
 
-            # --- 1. ПЕРЕГЛЯД ---
+            # --- 1. ПЕРЕГЛЯД (посторінково, keyset-курсори) ---
             case '1':
                 entity_choice = view.show_entity_selection("Перегляд таблиці")
                 if entity_choice == '0': continue
-                match entity_choice:
-                    case '1':
-                        view.print_table(["ID", "Username", "Email"], db.get_top_users())
-                    case '2':
-                        view.print_table(["ID", "Title", "Text", "User ID"], db.get_top_entries())
-                    case '3':
-                        view.print_table(["ID", "Entry ID", "Date", "Active"], db.get_top_reminders())
-                    case _:
-                        view.show_message("Невірний вибір.")
+                table = {'1': "user", '2': "entry", '3': "reminder"}.get(entity_choice)
+                if table is None:
+                    view.show_message("Невірний вибір.")
+                    continue
+
+                spec = paging.TABLES[table]
+                order, page_size = view.get_browse_options(list(spec.orders))
+                cursor, number = None, 1
+                while True:
+                    start = time.perf_counter()
+                    page = db.get_page(table, order, cursor, page_size)
+                    if isinstance(page, str):
+                        view.show_message(page)
+                        break
+                    view.show_page(spec.headers, page, number, (time.perf_counter() - start) * 1000)
+                    match view.get_browse_command(page):
+                        case 'n':
+                            cursor, number = page.next_cursor, number + 1
+                        case 'p':
+                            cursor, number = page.prev_cursor, number - 1
+                        case _:
+                            break
 
             # --- Помилка вводу головного меню ---
             case _:
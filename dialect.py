@@ -0,0 +1,25 @@
+# --- SQL POSTGRESQL -> SQLITE ---
+# Запити statements.py, search.py, paging.py, bulk.py і userstats.py написані для PostgreSQL.
+# Для modelSQLite.py вони не дублюються, а перекладаються: відрізняється лише кілька конструкцій.
+#   * схема public. - у SQLite лише main (public."user" -> "user");
+#   * параметри %s -> ?;
+#   * ILIKE -> LIKE: у SQLite LIKE і так нечутливий до регістру (але лише для ASCII);
+#   * приведення ::bigint - цілі в SQLite і так 64-бітні.
+# Решта (CTE, FULL JOIN, FILTER, row values, IS DISTINCT FROM, ON CONFLICT, RETURNING) є в SQLite 3.39+.
+
+REPLACEMENTS = [
+    ('public."user"', '"user"'),
+    ("public.", ""),
+    ("%s", "?"),
+    (" ILIKE ", " LIKE "),
+    ("::bigint", ""),
+]
+
+MIN_SQLITE_VERSION = (3, 39, 0)
+
+
+def to_sqlite(query):
+    for postgres, sqlite in REPLACEMENTS:
+        query = query.replace(postgres, sqlite)
+    return query
+
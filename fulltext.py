@@ -0,0 +1,63 @@
+# --- ПОВНОТЕКСТОВИЙ ПОШУК ПО ЗАПИСАХ ---
+# ILIKE '%...%' по title/text не може використати btree і переглядає всі записи.
+# Для кожної мовної конфігурації в public.entry є збережений згенерований стовпець tsvector
+# (title з вагою A, text з вагою B) з GIN-індексом (див. indexes.INDEXES).
+# Конфігурація 'simple' не робить стемінгу і не має стоп-слів, тому підходить для українського тексту.
+
+# мова (конфігурація text search) -> стовпець tsvector
+LANGUAGES = {
+    "simple": "search_simple",
+    "english": "search_english",
+}
+DEFAULT_LANGUAGE = "simple"
+
+# Версія міграції install_columns (schema.py); збільшується при зміні LANGUAGES чи виразу стовпця
+SCHEMA_VERSION = 1
+
+# Маркери збігів у фрагментах ts_headline; View замінює їх на виділення
+HIGHLIGHT_START, HIGHLIGHT_STOP = "<<", ">>"
+
+HEADERS = ["ID", "Author", "Rank", "Title", "Snippet"]
+
+
+def _column_expression(language):
+    return (f"setweight(to_tsvector('{language}'::regconfig, coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{language}'::regconfig, coalesce(text, '')), 'B')")
+
+
+def install_columns(cursor):
+    """Міграція: додає відсутні стовпці tsvector до public.entry. Ідемпотентна."""
+    cursor.execute("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = 'entry'
+    """)
+    existing = {row[0] for row in cursor.fetchall()}
+    for language, column in LANGUAGES.items():
+        if column not in existing:
+            # Перезаписує таблицю один раз; далі PostgreSQL підтримує стовпець сам при INSERT/UPDATE
+            cursor.execute(f"ALTER TABLE public.entry ADD COLUMN {column} tsvector "
+                           f"GENERATED ALWAYS AS ({_column_expression(language)}) STORED")
+
+
+def build_search_query(language=DEFAULT_LANGUAGE):
+    """SQL топ-k записів за ts_rank; параметри: query, limit. Фрагменти рахуються лише для топ-k."""
+    if language not in LANGUAGES:
+        raise ValueError(f"Невідома мова пошуку '{language}'. Доступні: {', '.join(LANGUAGES)}")
+    options = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}"
+    return f"""
+        SELECT
+            t.entry_id,
+            u.username,
+            round(t.rank::numeric, 4),
+            ts_headline('{language}', t.title, t.q, '{options}, HighlightAll=true'),
+            ts_headline('{language}', t.text, t.q, '{options}, MaxWords=25, MinWords=8, MaxFragments=2')
+        FROM (
+            SELECT e.entry_id, e.user_id, e.title, e.text, q, ts_rank(e.{LANGUAGES[language]}, q) AS rank
+            FROM public.entry e, websearch_to_tsquery('{language}', %(query)s) q
+            WHERE e.{LANGUAGES[language]} @@ q
+            ORDER BY rank DESC, e.entry_id
+            LIMIT %(limit)s
+        ) t
+        JOIN public."user" u ON u.id = t.user_id
+        ORDER BY t.rank DESC, t.entry_id
+    """
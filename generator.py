@@ -0,0 +1,312 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+# --- ГЕНЕРАЦІЯ ВИПАДКОВИХ ДАНИХ НА КЛІЄНТІ ---
+# Рядки будуються пакетами (векторизовано через NumPy) і одразу передаються
+# в PostgreSQL через COPY ... FROM STDIN у бінарному форматі. У пам'яті
+# одночасно живе лише один пакет, тому споживання пам'яті не залежить від count.
+# psycopg імпортується лише там, де відкривається з'єднання: row_batches, ParentIds і RANGES_QUERY
+# використовує й modelSQLite.py, якому psycopg не потрібен.
+
+UNIQUE_VIOLATION = "23505"  # SQLSTATE, як у bulk.PG_VIOLATIONS
+
+BATCH_SIZE = 50_000
+
+# chr(trunc(65 + random() * 25)) у старій SQL-версії давав літери 'A'..'Y'
+LETTER_LOW, LETTER_HIGH = 65, 90
+
+REMIND_FROM = np.datetime64("2025-09-01T08:00:00", "us")
+REMIND_TO = np.datetime64("2026-06-30T20:00:00", "us")
+
+
+class ParentIds:
+    """Набір батьківських ID, з якого випадково обираються значення FK.
+
+    Зберігаються лише суцільні діапазони [start, start + count): пам'ять залежить від кількості
+    "дірок" у ID (видалених рядків), а не від розміру таблиці."""
+
+    def __init__(self, low=None, high=None, ids=None, ranges=None):
+        if ids is not None:
+            ranges = _ranges(np.sort(np.asarray(ids, dtype=np.int64)))
+        elif ranges is None:
+            ranges = [(low, high - low + 1)]
+        starts, counts = np.asarray(ranges, dtype=np.int64).reshape(-1, 2).T
+        self.starts = starts
+        # Порядковий номер першого ID кожного діапазону серед усіх ID
+        self.offsets = np.cumsum(counts) - counts
+        self.total = int(counts.sum())
+
+    def sample(self, rng, n):
+        if len(self.starts) == 1:
+            return rng.integers(self.starts[0], self.starts[0] + self.total, n)
+        k = rng.integers(0, self.total, n)
+        i = np.searchsorted(self.offsets, k, side="right") - 1
+        return self.starts[i] + (k - self.offsets[i])
+
+
+def _ranges(ids):
+    """Впорядковані ID -> масив (start, count) суцільних діапазонів."""
+    breaks = np.flatnonzero(np.diff(ids) != 1) + 1
+    bounds = np.concatenate(([0], breaks, [len(ids)]))
+    return np.column_stack((ids[bounds[:-1]], np.diff(bounds)))
+
+
+# Суцільні діапазони ID рахує сервер: у межах діапазону id - row_number() стале.
+# Клієнт отримує лише (start, count) - по рядку на діапазон, а не на кожен ID
+RANGES_QUERY = """
+    SELECT min({column}), count(*) FROM (
+        SELECT {column}, {column} - row_number() OVER (ORDER BY {column}) AS island FROM {table}
+    ) AS ids
+    GROUP BY island ORDER BY 1
+"""
+
+
+def load_parent_ids(cursor, table, column):
+    """Повертає ParentIds для table.column або None, якщо таблиця порожня."""
+    cursor.execute(f"SELECT count(*), MIN({column}), MAX({column}) FROM {table}")
+    count, low, high = cursor.fetchone()
+    if count == 0:
+        return None
+    if high - low + 1 == count:
+        return ParentIds(low=low, high=high)
+
+    query = RANGES_QUERY.format(table=table, column=column)
+    with cursor.copy(f"COPY ({query}) TO STDOUT (FORMAT BINARY)") as copy:
+        copy.set_types(["int4", "int8"])
+        ranges = np.fromiter((value for row in copy.rows() for value in row), dtype=np.int64)
+    return ParentIds(ranges=ranges)
+
+
+def _letters(rng, n, length):
+    codes = rng.integers(LETTER_LOW, LETTER_HIGH, size=(n, length), dtype=np.uint8)
+    return codes.view(f"S{length}").ravel()
+
+
+def _id_batches(start_id, count, batch_size):
+    for offset in range(0, count, batch_size):
+        yield np.arange(start_id + offset, start_id + min(offset + batch_size, count), dtype=np.int64)
+
+
+# --- ПАКЕТИ СТОВПЦІВ ---
+# Кожна функція повертає стовпці пакета масивами NumPy; рядкові - байтові (ASCII) фіксованої ширини.
+def user_columns(rng, ids):
+    n = len(ids)
+    id_str = ids.astype("S")
+    usernames = np.char.add(np.char.add(_letters(rng, n, 6), b"_"), id_str)
+    emails = np.char.add(np.char.add(_letters(rng, n, 3), id_str), b"@gen.com")
+    return ids, usernames, emails, _letters(rng, n, 10)
+
+
+def entry_columns(rng, ids, user_ids):
+    n = len(ids)
+    return ids, _letters(rng, n, 10), _letters(rng, n, 10), user_ids.sample(rng, n)
+
+
+def reminder_columns(rng, ids, entry_ids):
+    n = len(ids)
+    span = (REMIND_TO - REMIND_FROM).astype(np.int64)
+    remind_at = REMIND_FROM + rng.integers(0, span, n).astype("timedelta64[us]")
+    active = rng.random(n) > 0.5
+    return ids, entry_ids.sample(rng, n), remind_at, active
+
+
+# таблиця -> (ім'я, стовпці, їхні типи, генератор стовпців пакета)
+TABLES = {
+    "user": ('public."user"', ["id", "username", "email", "password"],
+             ["int4", "varchar", "varchar", "varchar"], user_columns),
+    "entry": ("public.entry", ["entry_id", "title", "text", "user_id"],
+              ["int4", "varchar", "varchar", "int4"], entry_columns),
+    "reminder": ("public.reminder", ["reminder_id", "entry_id", "remind_at", "active"],
+                 ["int4", "int4", "timestamp", "bool"], reminder_columns),
+}
+
+
+def _column_batches(table, start_id, count, parents, batch_size, seed):
+    rng = np.random.default_rng(seed)
+    make_columns = TABLES[table][3]
+    for ids in _id_batches(start_id, count, batch_size):
+        yield make_columns(rng, ids) if parents is None else make_columns(rng, ids, parents)
+
+
+def _values(column):
+    # Байтові рядки - як str для бекендів, що вставляють значення самі
+    return (column.astype("U") if column.dtype.kind == "S" else column).tolist()
+
+
+def row_batches(table, start_id, count, parents=None, batch_size=BATCH_SIZE, seed=None):
+    """Пакети рядків таблиці без COPY - для бекендів, що вставляють їх самі (modelSQLite.py)."""
+    for columns in _column_batches(table, start_id, count, parents, batch_size, seed):
+        yield list(zip(*map(_values, columns)))
+
+
+# --- COPY У ТАБЛИЦІ ---
+# Пакет кодується в бінарний формат COPY цілим буфером (векторизовано) і передається одним
+# copy.write() - без Python-об'єкта й виклику на кожен рядок. Рядок формату: int16 кількість полів,
+# далі для кожного поля int32 довжина і значення (big-endian).
+
+BINARY_HEADER = b"PGCOPY\n\xff\r\n\0" + bytes(8)  # сигнатура, прапорці, довжина розширення
+BINARY_TRAILER = b"\xff\xff"
+PG_EPOCH = np.datetime64("2000-01-01T00:00:00", "us")
+
+
+def _field(column, pg_type):
+    """Стовпець -> (матриця байтів значень n x ширина, довжини значень)."""
+    n = len(column)
+    if pg_type == "varchar":
+        return column.view(np.uint8).reshape(n, column.itemsize), np.char.str_len(column)
+    if pg_type == "timestamp":
+        column = (column - PG_EPOCH).astype(np.int64)  # мікросекунди від 2000-01-01
+    dtype = {"int4": ">i4", "timestamp": ">i8", "bool": "u1"}[pg_type]
+    data = column.astype(dtype).view(np.uint8).reshape(n, -1)
+    return data, np.full(n, data.shape[1])
+
+
+def encode_block(columns, types):
+    """Стовпці пакета -> рядки бінарного COPY одним буфером (без заголовка й кінцівки)."""
+    n = len(columns[0])
+    parts = [np.full(n, len(columns), dtype=">i2").view(np.uint8).reshape(n, 2)]
+    masks = [np.ones((n, 2), dtype=bool)]
+    for column, pg_type in zip(columns, types):
+        data, lengths = _field(column, pg_type)
+        parts += [lengths.astype(">i4").view(np.uint8).reshape(n, 4), data]
+        # Рядкові значення коротші за ширину масиву: зайві байти відкидає маска
+        masks += [np.ones((n, 4), dtype=bool), np.arange(data.shape[1]) < lengths[:, None]]
+    return np.hstack(parts)[np.hstack(masks)].tobytes()
+
+
+def _copy(cursor, table, columns, types, batches):
+    written = 0
+    with cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN (FORMAT BINARY)") as copy:
+        # Буфери пишуться блоками, тож заголовок і кінцівку формату додаємо самі
+        copy.write(BINARY_HEADER)
+        for batch in batches:
+            copy.write(encode_block(batch, types))
+            written += len(batch[0])
+        copy.write(BINARY_TRAILER)
+    return written
+
+
+def copy_table(cursor, table, start_id, count, parents=None, batch_size=BATCH_SIZE, seed=None):
+    """COPY count згенерованих рядків з ID від start_id; parents - ParentIds для FK.
+    Повертає кількість записаних рядків; commit робить викликач.
+
+    Як і INSERT ... ON CONFLICT DO NOTHING старої SQL-генерації, рядки, що порушують UNIQUE
+    (напр. username, уже доданий вручну), пропускаються. COPY так не вміє, тому при конфлікті частина
+    відкочується до точки збереження і повторюється через тимчасову таблицю: ті самі рядки (той самий
+    seed) і INSERT ... SELECT ... ON CONFLICT DO NOTHING."""
+    name, columns, types, _ = TABLES[table]
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    try:
+        with cursor.connection.transaction():
+            return _copy(cursor, name, columns, types,
+                         _column_batches(table, start_id, count, parents, batch_size, seed))
+    except Exception as e:
+        if getattr(e, "sqlstate", None) != UNIQUE_VIOLATION:
+            raise
+
+    column_list = ", ".join(columns)
+    cursor.execute(f"CREATE TEMP TABLE generator_staging AS SELECT {column_list} FROM {name} WITH NO DATA")
+    _copy(cursor, "generator_staging", columns, types,
+          _column_batches(table, start_id, count, parents, batch_size, seed))
+    cursor.execute(f"INSERT INTO {name} ({column_list}) "
+                   f"SELECT {column_list} FROM generator_staging ON CONFLICT DO NOTHING")
+    written = cursor.rowcount
+    cursor.execute("DROP TABLE generator_staging")
+    return written
+
+
+def copy_users(cursor, start_id, count, batch_size=BATCH_SIZE, seed=None):
+    return copy_table(cursor, "user", start_id, count, batch_size=batch_size, seed=seed)
+
+
+def copy_entries(cursor, start_id, count, user_ids, batch_size=BATCH_SIZE, seed=None):
+    return copy_table(cursor, "entry", start_id, count, user_ids, batch_size=batch_size, seed=seed)
+
+
+def copy_reminders(cursor, start_id, count, entry_ids, batch_size=BATCH_SIZE, seed=None):
+    return copy_table(cursor, "reminder", start_id, count, entry_ids, batch_size=batch_size, seed=seed)
+
+
+# --- ПАРАЛЕЛЬНА ГЕНЕРАЦІЯ ---
+# Зарезервовані діапазони ID діляться на неперетинні частини. Кожна частина
+# пишеться окремим процесом через власне з'єднання і комітиться незалежно від інших.
+# Батьківські ID (для entry/reminder) завантажуються заздалегідь з уже закомічених даних
+# і передаються воркерам один раз при старті процесу.
+
+_worker = {}
+
+
+def _init_worker(conn_info, table, parents):
+    import psycopg
+
+    _worker["conn"] = psycopg.connect(conn_info)
+    _worker["table"] = table
+    _worker["parents"] = parents
+
+
+def _copy_chunk(start_id, count, seed):
+    conn = _worker["conn"]
+    try:
+        with conn.cursor() as cur:
+            written = copy_table(cur, _worker["table"], start_id, count, _worker["parents"], seed=seed)
+        conn.commit()
+        return written
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def split_ranges(ranges, chunk_size):
+    """Ділить діапазони ID [(start, count), ...] на частини не більші за chunk_size."""
+    return [(start + offset, min(chunk_size, count - offset))
+            for start, count in ranges for offset in range(0, count, chunk_size)]
+
+
+def generate_parallel(conn_info, table, ranges, parents=None, workers=None, chunk_size=None, progress=None):
+    """Генерує рядки з ID з діапазонів ranges кількома процесами. Повертає (записано рядків, список помилок)."""
+    workers = workers or os.cpu_count()
+    count = sum(n for _, n in ranges)
+    if chunk_size is None:
+        # ~4 частини на процес для рівномірного навантаження, але не менше одного пакета
+        chunk_size = min(1_000_000, max(BATCH_SIZE, math.ceil(count / (workers * 4))))
+    chunks = split_ranges(ranges, chunk_size)
+    seeds = np.random.SeedSequence().spawn(len(chunks))
+
+    written, processed, errors = 0, 0, []
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_init_worker,
+                             initargs=(conn_info, table, parents)) as pool:
+        futures = {pool.submit(_copy_chunk, chunk_start, chunk_count, seed): (chunk_start, chunk_count)
+                   for (chunk_start, chunk_count), seed in zip(chunks, seeds)}
+        for future in as_completed(futures):
+            chunk_start, chunk_count = futures[future]
+            try:
+                written += future.result()
+            except Exception as e:
+                errors.append(f"ID {chunk_start}..{chunk_start + chunk_count - 1}: {e}")
+            processed += chunk_count
+            if progress:
+                progress(processed, count)
+    return written, errors
+
+
+def print_progress(done, total):
+    print(f"\r  ... {done}/{total} ({done * 100 // total}%)", end="" if done < total else "\n", flush=True)
+
+
+def rate_message(what, count, seconds, written=None):
+    rate = count / seconds if seconds > 0 else float("inf")
+    message = f"Успішно згенеровано {count} {what} за {seconds * 1000:.2f} мс ({rate:,.0f} рядків/с)."
+    if written is not None and written < count:
+        message += f" Пропущено через конфлікт UNIQUE: {count - written}."
+    return message
+
+
+def parallel_message(what, count, written, errors, seconds):
+    if not errors:
+        return rate_message(what, count, seconds, written)
+    return (f"Згенеровано {written} з {count} {what} за {seconds * 1000:.2f} мс; "
+            f"не записано частин: {len(errors)}. Перша помилка: {errors[0]}")
@@ -0,0 +1,163 @@
+import os
+import threading
+
+# --- ВИДІЛЕННЯ ID БЛОКАМИ (HI-LO) ---
+# Кожна таблиця має послідовність з INCREMENT BY = ID_BLOCK_SIZE. Один nextval() повертає
+# початок блоку [hi, hi + block), який процес роздає локально без звернень до БД.
+# Послідовність ніколи не видасть двом процесам один блок, тому MAX(id)+1 більше не потрібен.
+
+ID_BLOCK_SIZE = 100
+
+# Версія міграції install_sequences для schema.py
+SCHEMA_VERSION = 1
+
+# таблиця -> (повне ім'я, PK-стовпець, послідовність)
+SEQUENCES = {
+    "user": ('public."user"', "id", "public.user_id_seq"),
+    "entry": ("public.entry", "entry_id", "public.entry_entry_id_seq"),
+    "reminder": ("public.reminder", "reminder_id", "public.reminder_reminder_id_seq"),
+}
+
+
+def _short_name(sequence):
+    return sequence.split(".", 1)[1]
+
+
+def install_sequences(cursor, block_size=ID_BLOCK_SIZE):
+    """Міграція: послідовність + DEFAULT nextval() для PK кожної таблиці. Ідемпотентна."""
+    cursor.execute("""
+        SELECT c.table_name, s.increment_by, c.column_default
+        FROM information_schema.columns c
+        LEFT JOIN pg_sequences s
+          ON s.schemaname = c.table_schema AND s.sequencename = c.table_name || '_' || c.column_name || '_seq'
+        WHERE c.table_schema = 'public'
+          AND (c.table_name, c.column_name) IN (('user', 'id'), ('entry', 'entry_id'), ('reminder', 'reminder_id'))
+    """)
+    installed = {name: (increment, default) for name, increment, default in cursor.fetchall()}
+
+    for name, (table, column, sequence) in SEQUENCES.items():
+        increment, default = installed.get(name, (None, None))
+        if increment == block_size and default and "nextval" in default:
+            continue
+        cursor.execute(f"CREATE SEQUENCE IF NOT EXISTS {sequence} AS integer")
+        cursor.execute(f"ALTER SEQUENCE {sequence} INCREMENT BY {block_size} OWNED BY {table}.{column}")
+        cursor.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT nextval('{sequence}')")
+        sync_sequence(cursor, name)
+
+
+def _sync_query(table):
+    full_name, column, sequence = SEQUENCES[table]
+    return (f"""
+        SELECT setval(%s, t.max_id, true)
+        FROM (SELECT MAX({column}) AS max_id FROM {full_name}) t, {sequence} s, pg_sequences p
+        WHERE p.schemaname = 'public' AND p.sequencename = %s
+          AND t.max_id >= CASE WHEN s.is_called THEN s.last_value + p.increment_by ELSE s.last_value END
+    """, (sequence, _short_name(sequence)))
+
+
+def sync_sequence(cursor, table):
+    """Підтягує послідовність до MAX(id) після вставок з явним ID.
+
+    Послідовність лише просувається вперед: блоки, уже видані іншим процесам, не повторяться.
+    Після TRUNCATE ... RESTART IDENTITY послідовність вже скинута, а таблиця порожня - нічого не змінюється.
+    """
+    cursor.execute(*_sync_query(table))
+
+
+class IdAllocator:
+    """Локальний (на процес) кеш блоків ID для кожної таблиці."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._blocks = {}  # таблиця -> [наступний вільний ID, кінець блоку)
+        self._increments = {}
+
+    def _check_pid(self):
+        # Після fork дочірній процес не повинен роздавати ті самі ID, що й батьківський
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._blocks.clear()
+
+    def _take(self, table):
+        with self._lock:
+            self._check_pid()
+            block = self._blocks.get(table)
+            if block and block[0] < block[1]:
+                block[0] += 1
+                return block[0] - 1
+            return None
+
+    def _store(self, table, hi, increment):
+        with self._lock:
+            self._increments[table] = increment
+            self._blocks[table] = [hi + 1, hi + increment]
+            return hi
+
+    def _nextval_query(self, table):
+        sequence = SEQUENCES[table][2]
+        return ("SELECT nextval(%s), increment_by FROM pg_sequences WHERE schemaname = 'public' "
+                "AND sequencename = %s", (sequence, _short_name(sequence)))
+
+    def next_id(self, cursor, table):
+        new_id = self._take(table)
+        if new_id is None:
+            cursor.execute(*self._nextval_query(table))
+            new_id = self._store(table, *cursor.fetchone())
+        return new_id
+
+    async def next_id_async(self, cursor, table):
+        new_id = self._take(table)
+        if new_id is None:
+            await cursor.execute(*self._nextval_query(table))
+            new_id = self._store(table, *(await cursor.fetchone()))
+        return new_id
+
+    def reserve(self, cursor, table, count):
+        """Резервує count ID для масової вставки. Повертає список діапазонів [(start, count), ...].
+        ValueError - для від'ємного count (помилка вводу, а не стану послідовності)."""
+        if count < 0:
+            raise ValueError(f"Кількість має бути невід'ємною, отримано {count}.")
+        if count == 0:
+            return []
+        increment = self._increments.get(table)
+        if increment is None:
+            cursor.execute("SELECT increment_by FROM pg_sequences WHERE schemaname = 'public' AND sequencename = %s",
+                           (_short_name(SEQUENCES[table][2]),))
+            increment = self._increments[table] = cursor.fetchone()[0]
+
+        blocks = -(-count // increment)
+        cursor.execute("SELECT nextval(%s) FROM generate_series(1, %s)", (SEQUENCES[table][2], blocks))
+        starts = sorted(row[0] for row in cursor.fetchall())
+
+        # Зазвичай блоки йдуть підряд - зливаємо їх у суцільні діапазони
+        ranges = []
+        for start in starts:
+            if ranges and ranges[-1][0] + ranges[-1][1] == start:
+                ranges[-1][1] += increment
+            else:
+                ranges.append([start, increment])
+
+        # Хвіст останнього блоку не потрібен масовій вставці - віддаємо його одиночним вставкам
+        extra = blocks * increment - count
+        if extra:
+            ranges[-1][1] -= extra
+            last_start, last_count = ranges[-1]
+            with self._lock:
+                self._blocks[table] = [last_start + last_count, last_start + last_count + extra]
+        return [tuple(r) for r in ranges]
+
+    def sync(self, cursor, table):
+        """Синхронізує послідовність після вставки з явним ID і скидає локальний блок таблиці."""
+        sync_sequence(cursor, table)
+        self.reset(table)
+
+    async def sync_async(self, cursor, table):
+        await cursor.execute(*_sync_query(table))
+        self.reset(table)
+
+    def reset(self, *tables):
+        """Забуває кешовані блоки (після TRUNCATE або синхронізації послідовності)."""
+        with self._lock:
+            for table in tables or list(self._blocks):
+                self._blocks.pop(table, None)
@@ -0,0 +1,119 @@
+from collections import namedtuple
+
+# --- ДЕКЛАРОВАНИЙ НАБІР ВТОРИННИХ ІНДЕКСІВ ---
+# Перевіряється при connect(); відсутні індекси будуються через CREATE INDEX CONCURRENTLY,
+# тобто без блокування запису в таблиці. Ті самі btree-індекси оголошені в моделях modelORM.py.
+
+IndexSpec = namedtuple("IndexSpec", "name table definition extension")
+
+INDEXES = [
+    # FK-зв'язки: записи користувача / нагадування запису (і сортування за ними)
+    IndexSpec("ix_entry_user_id", "public.entry", "(user_id, entry_id)", None),
+    IndexSpec("ix_reminder_entry_id", "public.reminder", "(entry_id)", None),
+    # Фільтр дат у search_flexible, delete_reminders_by_date та сортування нагадувань
+    IndexSpec("ix_reminder_remind_at", "public.reminder", "(remind_at, reminder_id)", None),
+    # Частковий індекс: активних нагадувань значно менше, ніж усіх
+    IndexSpec("ix_reminder_active", "public.reminder", "(entry_id) WHERE active", None),
+    # Повнотекстовий пошук (стовпці tsvector додає fulltext.install_columns)
+    IndexSpec("ix_entry_search_simple", "public.entry", "USING gin (search_simple)", None),
+    IndexSpec("ix_entry_search_english", "public.entry", "USING gin (search_english)", None),
+    # ILIKE '%...%' з search_flexible може використати лише триграмний GIN-індекс
+    IndexSpec("ix_user_username_trgm", 'public."user"', "USING gin (username gin_trgm_ops)", "pg_trgm"),
+    IndexSpec("ix_user_email_trgm", 'public."user"', "USING gin (email gin_trgm_ops)", "pg_trgm"),
+    IndexSpec("ix_entry_title_trgm", "public.entry", "USING gin (title gin_trgm_ops)", "pg_trgm"),
+    IndexSpec("ix_entry_text_trgm", "public.entry", "USING gin (text gin_trgm_ops)", "pg_trgm"),
+]
+
+# Версія міграції ensure_indexes для schema.py
+SCHEMA_VERSION = 1
+
+# Скалярна перевірка для schema.py (при кожному connect()): кожен індекс з INDEXES є і валідний.
+# Індекси, що потребують розширення, очікуються лише коли воно встановлене - після CREATE EXTENSION
+# пропущені раніше індекси добудуються на наступному connect().
+_SPECS = ", ".join(f"('{spec.name}', " + (f"'{spec.extension}'" if spec.extension else "NULL") + "::text)"
+                   for spec in INDEXES)
+INTACT_QUERY = f"""
+    SELECT NOT EXISTS (
+        SELECT 1 FROM (VALUES {_SPECS}) AS spec(name, extension)
+        WHERE (spec.extension IS NULL OR EXISTS (SELECT 1 FROM pg_extension e WHERE e.extname = spec.extension))
+          AND NOT EXISTS (
+              SELECT 1 FROM pg_index i
+              JOIN pg_class c ON c.oid = i.indexrelid
+              JOIN pg_namespace n ON n.oid = c.relnamespace
+              WHERE n.nspname = 'public' AND c.relname = spec.name AND i.indisvalid
+          )
+    )
+"""
+
+
+def _ensure_extension(cur, name):
+    import psycopg
+
+    try:
+        cur.execute(f"CREATE EXTENSION IF NOT EXISTS {name}")
+        return True
+    except psycopg.Error:
+        # Розширення не встановлене на сервері або бракує прав - пропускаємо залежні індекси
+        return False
+
+
+def ensure_indexes(conn_info):
+    """Будує відсутні індекси з INDEXES. Повертає (побудовані, пропущені) імена."""
+    # psycopg імпортується лише тут: REPORT_HEADERS / REPORT_QUERY потрібні й бекендам без нього
+    import psycopg
+
+    built, skipped = [], []
+    # CONCURRENTLY не працює всередині транзакції - окреме з'єднання в режимі autocommit
+    with psycopg.connect(conn_info, autocommit=True) as conn, conn.cursor() as cur:
+        cur.execute("""
+            SELECT c.relname, i.indisvalid
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'public'
+        """)
+        existing = dict(cur.fetchall())
+        extensions = {}
+
+        for spec in INDEXES:
+            if existing.get(spec.name):
+                continue
+            if spec.extension:
+                if spec.extension not in extensions:
+                    extensions[spec.extension] = _ensure_extension(cur, spec.extension)
+                if not extensions[spec.extension]:
+                    skipped.append(spec.name)
+                    continue
+            if spec.name in existing:
+                # Невалідний залишок перерваної CONCURRENTLY-побудови
+                cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS public.{spec.name}")
+            cur.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {spec.name} ON {spec.table} {spec.definition}")
+            built.append(spec.name)
+    return built, skipped
+
+
+# --- ЗВІТ ПО ВИКОРИСТАННЮ ІНДЕКСІВ ---
+REPORT_HEADERS = ["Index", "Table", "Scans", "Size", "Tuples Read", "Unused"]
+
+REPORT_QUERY = """
+    SELECT
+        s.indexrelname,
+        s.relname,
+        s.idx_scan,
+        pg_size_pretty(pg_relation_size(s.indexrelid)),
+        s.idx_tup_read,
+        CASE WHEN s.idx_scan = 0 AND NOT i.indisunique AND NOT i.indisprimary THEN 'UNUSED' ELSE '' END
+    FROM pg_stat_user_indexes s
+    JOIN pg_index i ON i.indexrelid = s.indexrelid
+    WHERE s.schemaname = 'public'
+    ORDER BY s.idx_scan DESC, pg_relation_size(s.indexrelid) DESC
+"""
+
+
+def index_message(built, skipped):
+    parts = []
+    if built:
+        parts.append(f"Побудовано індекси: {', '.join(built)}.")
+    if skipped:
+        parts.append(f"Пропущено (немає розширення pg_trgm): {', '.join(skipped)}.")
+    return " ".join(parts)
@@ -0,0 +1,315 @@
+import bisect
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import paging
+
+# --- МЕТРИКИ ОПЕРАЦІЙ ---
+# InstrumentedModel обгортає model.Model або modelORM.Model (у т.ч. через CachedModel) і для кожного
+# публічного методу рахує виклики, помилки, кількість повернутих рядків і гістограму часу виконання.
+# Гістограма має фіксовані межі кошиків (геометрична прогресія), тому запис - це bisect і
+# кілька додавань під спільним lock; p50/p95/p99 оцінюються з кошиків.
+# stream_* повертають генератор рядків: час і кількість рядків записуються, коли його дочитали, закрили
+# або читання обірвалося помилкою, а не в момент повернення.
+# Експорт: JSON або текстовий формат Prometheus (файл або HTTP /metrics, див. serve()).
+#   DIARY_METRICS_PORT=9108   (controller.py піднімає HTTP-ендпоінт метрик на цьому порту)
+
+# Межі кошиків у секундах: 50 мкс ... ~65 с, крок x1.5
+BUCKETS = tuple(0.00005 * 1.5 ** i for i in range(36))
+QUANTILES = (0.5, 0.95, 0.99)
+
+HEADERS = ["Backend", "Operation", "Calls", "Errors", "Rows", "p50, ms", "p95, ms", "p99, ms", "Max, ms"]
+
+# Методи, що повертають дані: рядок замість даних означає помилку
+DATA_PREFIXES = ("get_", "find_", "search_", "verify_", "stream_")
+# Початок повідомлень про помилку в методах, що повертають текст
+ERROR_PREFIXES = ("Помилка", "Критична помилка", "Неможливо")
+
+BACKENDS = {"model": "psycopg", "modelORM": "sqlalchemy", "modelSQLite": "sqlite"}
+
+
+# Лічильники для to_prometheus: (ім'я, тип, опис, індекс значення в рядку snapshot())
+PROMETHEUS_COUNTERS = (
+    ("diary_operation_calls_total", "counter", "Виклики методів Model.", 2),
+    ("diary_operation_errors_total", "counter", "Виклики, що завершились помилкою.", 3),
+    ("diary_operation_rows_total", "counter", "Рядки, повернуті методами Model.", 4),
+)
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # останній - понад BUCKETS[-1]
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """Оцінка квантиля (секунди): лінійна інтерполяція всередині кошика."""
+        count = sum(self.counts)
+        if not count:
+            return 0.0
+        rank = q * count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                low = BUCKETS[i - 1] if i > 0 else 0.0
+                high = BUCKETS[i] if i < len(BUCKETS) else self.max
+                return min(low + (high - low) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+
+class OperationStats:
+    __slots__ = ("calls", "errors", "rows", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.histogram = Histogram()
+
+
+def _rows(operation, result):
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, paging.Page):
+        return len(result.rows)
+    if isinstance(result, tuple) and operation.startswith(DATA_PREFIXES):
+        # search_* -> (рядки, мс); get_user_*_details -> (username, рядки)
+        for item in result[:2]:
+            if isinstance(item, list):
+                return len(item)
+    return 0
+
+
+def is_error(operation, result):
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    if not isinstance(result, str):
+        return False
+    # get_user_*/stream_user_* повертають (username, рядки) або текст "не знайдено";
+    # помилку - ("Помилка: ...", []), тож для них рахуються лише ERROR_PREFIXES
+    if operation.startswith(DATA_PREFIXES) and not operation.startswith(("get_user_", "stream_user_")):
+        return True
+    return result.startswith(ERROR_PREFIXES)
+
+
+class Metrics:
+    """Потокобезпечний реєстр статистики за (бекенд, операція)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+        self.started = time.time()
+
+    def record(self, backend, operation, seconds, result=None, failed=False, rows=None):
+        if rows is None:
+            rows = 0 if failed else _rows(operation, result)
+        failed = failed or is_error(operation, result)
+        with self._lock:
+            stats = self._stats.get((backend, operation))
+            if stats is None:
+                stats = self._stats[(backend, operation)] = OperationStats()
+            stats.calls += 1
+            stats.errors += failed
+            stats.rows += rows
+            stats.histogram.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """[(бекенд, операція, calls, errors, rows, копія гістограми)] у стабільному порядку."""
+        with self._lock:
+            items = []
+            for (backend, operation), s in sorted(self._stats.items()):
+                histogram = Histogram()
+                histogram.counts = list(s.histogram.counts)
+                histogram.total, histogram.max = s.histogram.total, s.histogram.max
+                items.append((backend, operation, s.calls, s.errors, s.rows, histogram))
+            return items
+
+    # --- ЕКСПОРТ ---
+    def rows(self):
+        """Рядки під HEADERS для View.print_table."""
+        return [(backend, operation, calls, errors, rows,
+                 *(round(h.quantile(q) * 1000, 3) for q in QUANTILES), round(h.max * 1000, 3))
+                for backend, operation, calls, errors, rows, h in self.snapshot()]
+
+    def to_json(self):
+        operations = []
+        for backend, operation, calls, errors, rows, h in self.snapshot():
+            operations.append({
+                "backend": backend,
+                "operation": operation,
+                "calls": calls,
+                "errors": errors,
+                "rows": rows,
+                "latency_ms": {
+                    **{f"p{round(q * 100)}": round(h.quantile(q) * 1000, 3) for q in QUANTILES},
+                    "avg": round(h.total / calls * 1000, 3) if calls else 0.0,
+                    "max": round(h.max * 1000, 3),
+                },
+            })
+        return json.dumps({"started": self.started, "collected": time.time(), "operations": operations},
+                          ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        """Текстовий формат Prometheus: кожна родина метрик - суцільна група під власними HELP/TYPE."""
+        items = self.snapshot()
+        lines = []
+        for name, kind, help_text, column in PROMETHEUS_COUNTERS:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for item in items:
+                lines.append(f"{name}{{{_labels(item)}}} {item[column]}")
+
+        name = "diary_operation_duration_seconds"
+        lines += [f"# HELP {name} Час виконання методів Model.", f"# TYPE {name} histogram"]
+        for item in items:
+            labels, calls, h = _labels(item), item[2], item[5]
+            cumulative = 0
+            for bound, n in zip(BUCKETS, h.counts):
+                cumulative += n
+                lines.append(f'{name}_bucket{{{labels},le="{bound:.6g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {calls}')
+            lines.append(f"{name}_sum{{{labels}}} {h.total:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {calls}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Записує метрики у файл: *.json - JSON, інакше - формат Prometheus."""
+        text = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+
+def _labels(item):
+    backend, operation = item[:2]
+    return f'backend="{backend}",operation="{operation}"'
+
+
+def _backend_name(model):
+    # Крізь обгортки (CachedModel.model) до справжньої моделі
+    while hasattr(model, "model"):
+        model = model.model
+    module = type(model).__module__
+    return BACKENDS.get(module, module)
+
+
+def _measured_rows(rows, done):
+    """Проксі генератора stream_*: done(кількість рядків, failed) - коли його дочитали, закрили або він упав."""
+    count, failed = 0, False
+    try:
+        for row in rows:
+            count += 1
+            yield row
+    except GeneratorExit:
+        raise
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        if hasattr(rows, "close"):
+            rows.close()
+        done(count, failed)
+
+
+class InstrumentedModel:
+    """Обгортка, що вимірює кожен публічний метод моделі. Решта атрибутів - без змін."""
+
+    def __init__(self, model, metrics=None, backend=None):
+        self.model = model
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.backend = backend or _backend_name(model)
+        self._wrappers = {}
+
+    def __getattr__(self, name):
+        attr = getattr(self.model, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        wrapper = self._wrappers.get(name)
+        if wrapper is None:
+            wrapper = self._wrappers[name] = self._wrap(name)
+        return wrapper
+
+    def _wrap(self, name):
+        # Метод береться з моделі при кожному виклику: обгортки на кшталт CachedModel
+        # можуть щоразу повертати нову функцію
+        model = self.model
+        record = self.metrics.record
+        backend = self.backend
+        clock = time.perf_counter
+
+        def measured(*args, **kwargs):
+            start = clock()
+            try:
+                result = getattr(model, name)(*args, **kwargs)
+            except BaseException:
+                record(backend, name, clock() - start, failed=True)
+                raise
+            if isinstance(result, tuple) and len(result) == 2 and isinstance(result[1], Iterator):
+                # Потік: вимір завершується разом із читанням рядків
+                def done(rows, failed):
+                    record(backend, name, clock() - start, failed=failed, rows=rows)
+                return result[0], _measured_rows(result[1], done)
+            record(backend, name, clock() - start, result)
+            return result
+        measured.__name__ = name
+        return measured
+
+    def get_metrics(self):
+        return self.metrics.rows()
+
+    def export_metrics(self, path):
+        try:
+            return f"Метрики збережено у {self.metrics.export(path)}."
+        except OSError as e:
+            return f"Помилка: {e}"
+
+
+# --- HTTP-ЕНДПОІНТ ---
+def serve(metrics, port, host="127.0.0.1"):
+    """Фоновий HTTP-сервер: /metrics (Prometheus) і /metrics.json. Повертає сервер (shutdown() - зупинка)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, content_type = metrics.to_prometheus(), "text/plain; version=0.0.4; charset=utf-8"
+            elif self.path == "/metrics.json":
+                body, content_type = metrics.to_json(), "application/json; charset=utf-8"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass  # не засмічуємо консоль меню
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-http").start()
+    return server
+
+
+def serve_from_env(metrics):
+    """serve() на порту з DIARY_METRICS_PORT; None, якщо змінну не задано."""
+    port = os.environ.get("DIARY_METRICS_PORT")
+    return serve(metrics, int(port)) if port else None
@@ -1,62 +1,314 @@
+import itertools
 import psycopg
+import threading
 import time
+from contextlib import contextmanager
+from functools import wraps
 from psycopg import errors
 
+import bulk
+import cascade
+import ids
+import fulltext
+import indexes
+import paging
+import schema
+import search
+import statements
+import transfer
+import userstats
+
+try:
+    from psycopg_pool import ConnectionPool, PoolTimeout
+except ImportError:  # пул потрібен лише у режимі pool_max_size
+    ConnectionPool = None
+
+    class PoolTimeout(Exception):
+        pass
+
+
+# Скільки рядків серверний курсор потокових методів передає за один запит до БД
+STREAM_BATCH_SIZE = 2000
+
+USER_ENTRIES_QUERY = statements.STATEMENTS["user_entries"]
+USER_REMINDERS_QUERY = statements.STATEMENTS["user_reminders"]
+
+_stream_names = itertools.count(1)
+
+
+class _ThreadState(threading.local):
+    connection = None
+    cursor = None
+
+
+def _pooled(method=None, *, error_result=None):
+    """У режимі пулу видає методу власне з'єднання та курсор на час виклику.
+
+    Помилка видачі з'єднання повертається в тій самій формі, що й власні помилки методу:
+    error_result(повідомлення) для методів, що повертають кортеж, інакше - рядок."""
+    if method is None:
+        return lambda m: _pooled(m, error_result=error_result)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        # Без пулу або при вкладеному виклику (напр. *_cascade_by_attr -> *_cascade)
+        # працюємо з уже виданим з'єднанням
+        if self.pool is None or self._local.connection is not None:
+            return method(self, *args, **kwargs)
+        try:
+            with self._checkout():
+                return method(self, *args, **kwargs)
+        except PoolTimeout as e:
+            message = f"Помилка пулу з'єднань: {e}"
+            return error_result(message) if error_result else message
+    return wrapper
+
+
+def _timed_error(message):
+    # search_* повертають (рядки, мс)
+    return message, 0
+
+
+def _rows_error(message):
+    # get_user_*/stream_user_* - (username, рядки), add_*_bulk - (повідомлення, помилки рядків)
+    return message, []
+
 
 class Model:
-    def __init__(self, db_name, user, password, host, port):
+    def __init__(self, db_name, user, password, host, port,
+                 pool_min_size=None, pool_max_size=None, pool_timeout=30.0):
         self.conn_info = f"dbname={db_name} user={user} password={password} host={host} port={port}"
-        self.connection = None
-        self.cursor = None
+        self._connection = None
+        self._cursor = None
+
+        # --- РЕЖИМ ПУЛУ З'ЄДНАНЬ ---
+        # Вмикається, якщо задано pool_max_size. Кожен виклик методу бере з'єднання з пулу,
+        # а курсор живе в межах потоку (thread-local), тому Model можна ділити між потоками.
+        self.pool = None
+        self.pool_min_size = pool_min_size if pool_min_size is not None else 1
+        self.pool_max_size = pool_max_size
+        self.pool_timeout = pool_timeout
+        self._local = _ThreadState()
+        # Блоки ID з послідовностей, що роздаються локально (див. ids.py)
+        self.ids = ids.IdAllocator()
+        # Лічильники підготовлених запитів (statements.py); переживають перепідключення
+        self.statement_stats = statements.StatementStats()
+        self._stats_lock = threading.Lock()
+        self._pool_counters = {
+            "checkouts": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+            "timeouts": 0,
+            "in_use": 0,
+            "in_use_peak": 0,
+        }
+
+    # У режимі пулу connection/cursor належать поточному потоку, інакше - спільні
+    @property
+    def connection(self):
+        return self._local.connection if self.pool is not None else self._connection
+
+    @connection.setter
+    def connection(self, value):
+        if self.pool is not None:
+            self._local.connection = value
+        else:
+            self._connection = value
+
+    @property
+    def cursor(self):
+        return self._local.cursor if self.pool is not None else self._cursor
+
+    @cursor.setter
+    def cursor(self, value):
+        if self.pool is not None:
+            self._local.cursor = value
+        else:
+            self._cursor = value
 
     def connect(self):
         try:
+            if self.pool_max_size is not None:
+                if ConnectionPool is None:
+                    raise RuntimeError("для режиму пулу встановіть пакет psycopg_pool")
+                self.pool = ConnectionPool(
+                    self.conn_info,
+                    min_size=self.pool_min_size,
+                    max_size=self.pool_max_size,
+                    timeout=self.pool_timeout,
+                    # Перевірка "живості" з'єднання при кожній видачі з пулу
+                    check=ConnectionPool.check_connection,
+                    configure=statements.configure,
+                    open=False,
+                )
+                self.pool.open(wait=True, timeout=self.pool_timeout)
+                with self.pool.connection() as conn:
+                    self._prepare_schema(conn)
+                return True
+
             self.connection = psycopg.connect(self.conn_info)
+            statements.configure(self.connection)
             self.cursor = self.connection.cursor()
+            self._prepare_schema(self.connection)
             return True
         except Exception as e:
+            if self.pool is not None:
+                self.pool.close()
+                self.pool = None
             print(f"Помилка підключення: {e}")
             return False
 
+    def _prepare_schema(self, conn):
+        # Міграції - лише модулів із застарілою версією чи пошкодженими об'єктами (schema.py), інакше один SELECT
+        schema.ensure(conn, self.conn_info)
+
     def disconnect(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+            return
         if self.cursor: self.cursor.close()
         if self.connection: self.connection.close()
 
+    @contextmanager
+    def _checkout(self):
+        start = time.perf_counter()
+        acquired = False
+        try:
+            # Вихід з блоку повертає з'єднання в пул (commit/rollback відкритої транзакції робить пул)
+            with self.pool.connection(timeout=self.pool_timeout) as conn:
+                acquired = True
+                self._count_checkout((time.perf_counter() - start) * 1000)
+                self._local.connection = conn
+                self._local.cursor = conn.cursor()
+                try:
+                    yield conn
+                finally:
+                    self._local.cursor.close()
+                    self._local.cursor = None
+                    self._local.connection = None
+                    with self._stats_lock:
+                        self._pool_counters["in_use"] -= 1
+        except PoolTimeout:
+            if not acquired:
+                with self._stats_lock:
+                    self._pool_counters["timeouts"] += 1
+            raise
+
+    def _count_checkout(self, waited_ms):
+        with self._stats_lock:
+            c = self._pool_counters
+            c["checkouts"] += 1
+            c["wait_ms_total"] += waited_ms
+            c["wait_ms_max"] = max(c["wait_ms_max"], waited_ms)
+            c["in_use"] += 1
+            c["in_use_peak"] = max(c["in_use_peak"], c["in_use"])
+
+    # --- СТАТИСТИКА ПУЛУ ---
+    def get_pool_stats(self):
+        if self.pool is None:
+            return {}
+        with self._stats_lock:
+            stats = dict(self._pool_counters)
+        checkouts = stats["checkouts"] or 1
+        stats["wait_ms_avg"] = stats["wait_ms_total"] / checkouts
+        stats["utilisation"] = stats["in_use"] / self.pool_max_size
+        stats["utilisation_peak"] = stats["in_use_peak"] / self.pool_max_size
+        # Лічильники самого psycopg_pool: requests_waiting, requests_wait_ms, connections_lost...
+        stats.update(self.pool.get_stats())
+        return stats
+
+    # --- ПІДГОТОВЛЕНІ ЗАПИТИ ---
+    def _execute(self, name, params):
+        return statements.execute(self.cursor, self.statement_stats, name, params)
+
+    def get_statement_stats(self):
+        """Рядки під statements.STATS_HEADERS: виклики й час кожного підготовленого запиту."""
+        return self.statement_stats.rows()
+
+    # --- ЗВІТ ПО ІНДЕКСАХ ---
+    @_pooled
+    def get_index_report(self):
+        try:
+            self.cursor.execute(indexes.REPORT_QUERY)
+            return self.cursor.fetchall()
+        except Exception as e:
+            return str(e)
+
+    # --- ЛІЧИЛЬНИКИ USER_STATS ---
+    @_pooled
+    def rebuild_user_stats(self):
+        start_time = time.time()
+        try:
+            count = userstats.rebuild(self.cursor)
+            self.connection.commit()
+            return f"Лічильники перераховано для {count} користувачів за {(time.time() - start_time) * 1000:.2f} мс."
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e}"
+
+    @_pooled
+    def verify_user_stats(self, limit=100):
+        """Розбіжності user_stats з фактичними даними (порожній список - лічильники коректні)."""
+        try:
+            self.cursor.execute(*userstats.verify_query(limit))
+            return self.cursor.fetchall()
+        except Exception as e:
+            self.connection.rollback()
+            return str(e)
+
     # --- ВИВЕДЕННЯ ТОП-10 ---
+    @_pooled
     def get_top_users(self, limit=10):
         try:
-            self.cursor.execute('SELECT id, username, email FROM public."user" ORDER BY id LIMIT %s', (limit,))
+            self._execute("top_users", (limit,))
             return self.cursor.fetchall()
         except Exception as e:
             return str(e)
 
+    @_pooled
     def get_top_entries(self, limit=10):
         try:
-            self.cursor.execute('SELECT entry_id, title, text, user_id FROM public.entry ORDER BY entry_id LIMIT %s',
-                                (limit,))
+            self._execute("top_entries", (limit,))
             return self.cursor.fetchall()
         except Exception as e:
             return str(e)
 
+    @_pooled
     def get_top_reminders(self, limit=10):
         try:
-            self.cursor.execute(
-                'SELECT reminder_id, entry_id, remind_at, active FROM public.reminder ORDER BY reminder_id LIMIT %s',
-                (limit,))
+            self._execute("top_reminders", (limit,))
             return self.cursor.fetchall()
         except Exception as e:
             return str(e)
 
+    # --- ПОСТОРІНКОВИЙ ПЕРЕГЛЯД (KEYSET) ---
+    @_pooled
+    def get_page(self, table, order="id", cursor=None, page_size=paging.DEFAULT_PAGE_SIZE):
+        """Сторінка таблиці (paging.Page). cursor - next_cursor/prev_cursor попередньої сторінки."""
+        try:
+            table, order, keys, direction, page_size = paging.resolve(table, order, cursor, page_size)
+        except paging.CursorError as e:
+            return str(e)
+        try:
+            self.cursor.execute(paging.build_page_query(table, order, keys, direction), [*(keys or []), page_size + 1])
+            return paging.make_page(table, order, self.cursor.fetchall(), keys, direction, page_size)
+        except Exception as e:
+            self.connection.rollback()
+            return str(e)
+
     # --- ДОДАВАННЯ ---
+    @_pooled
     def add_user(self, user_id, username, email, password):
         try:
-            if user_id is None:
-                self.cursor.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM public."user"')
-                user_id = self.cursor.fetchone()[0]
+            explicit_id = user_id is not None
+            if not explicit_id:
+                user_id = self.ids.next_id(self.cursor, "user")
                 print(f"(Автоматично обрано ID: {user_id})")
 
-            query = 'INSERT INTO public."user" (id, username, email, password) VALUES (%s, %s, %s, %s)'
-            self.cursor.execute(query, (user_id, username, email, password))
+            self._execute("add_user", (user_id, username, email, password))
+            if explicit_id:
+                self.ids.sync(self.cursor, "user")
             self.connection.commit()
             return "Користувача успішно додано."
         except errors.UniqueViolation:
@@ -66,15 +318,17 @@ class Model:
             self.connection.rollback()
             return f"Помилка: {e}"
 
+    @_pooled
     def add_entry(self, entry_id, title, text, user_id):
         try:
-            if entry_id is None:
-                self.cursor.execute('SELECT COALESCE(MAX(entry_id), 0) + 1 FROM public.entry')
-                entry_id = self.cursor.fetchone()[0]
+            explicit_id = entry_id is not None
+            if not explicit_id:
+                entry_id = self.ids.next_id(self.cursor, "entry")
                 print(f"(Автоматично обрано ID: {entry_id})")
 
-            query = "INSERT INTO public.entry (entry_id, title, text, user_id) VALUES (%s, %s, %s, %s)"
-            self.cursor.execute(query, (entry_id, title, text, user_id))
+            self._execute("add_entry", (entry_id, title, text, user_id))
+            if explicit_id:
+                self.ids.sync(self.cursor, "entry")
             self.connection.commit()
             return "Запис успішно додано."
         except errors.ForeignKeyViolation:
@@ -84,15 +338,17 @@ class Model:
             self.connection.rollback()
             return f"Помилка: {e}"
 
+    @_pooled
     def add_reminder(self, reminder_id, entry_id, remind_at, active):
         try:
-            if reminder_id is None:
-                self.cursor.execute('SELECT COALESCE(MAX(reminder_id), 0) + 1 FROM public.reminder')
-                reminder_id = self.cursor.fetchone()[0]
+            explicit_id = reminder_id is not None
+            if not explicit_id:
+                reminder_id = self.ids.next_id(self.cursor, "reminder")
                 print(f"(Автоматично обрано ID: {reminder_id})")
 
-            query = "INSERT INTO public.reminder (reminder_id, entry_id, remind_at, active) VALUES (%s, %s, %s, %s)"
-            self.cursor.execute(query, (reminder_id, entry_id, remind_at, active))
+            self._execute("add_reminder", (reminder_id, entry_id, remind_at, active))
+            if explicit_id:
+                self.ids.sync(self.cursor, "reminder")
             self.connection.commit()
             return "Нагадування успішно додано."
         except errors.ForeignKeyViolation:
@@ -102,36 +358,118 @@ class Model:
             self.connection.rollback()
             return f"Помилка: {e}"
 
+    # --- МАСОВЕ ДОДАВАННЯ ---
+    # rows - кортежі в порядку аргументів add_* (id=None - ID з послідовності), див. bulk.py.
+    # Повертають (повідомлення, [(номер рядка, id, помилка), ...]); кожні batch_size рядків - один commit.
+    @_pooled(error_result=_rows_error)
+    def add_users_bulk(self, rows, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        return self._add_bulk("user", rows, batch_size)
+
+    @_pooled(error_result=_rows_error)
+    def add_entries_bulk(self, rows, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        return self._add_bulk("entry", rows, batch_size)
+
+    @_pooled(error_result=_rows_error)
+    def add_reminders_bulk(self, rows, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        return self._add_bulk("reminder", rows, batch_size)
+
+    def _add_bulk(self, table, rows, batch_size):
+        start_time = time.time()
+        rows, failed = bulk.normalize(table, rows)
+        total = len(rows) + len(failed)
+        inserted = 0
+        try:
+            query = bulk.insert_query(table)
+            for batch, auto in bulk.batches(rows, batch_size):
+                if auto:
+                    new_ids = bulk.id_ranges_to_list(self.ids.reserve(self.cursor, table, len(batch)))
+                    batch = bulk.assign_ids(batch, new_ids)
+                wanted = bulk.parent_ids(table, batch)
+                if wanted is not None:
+                    self.cursor.execute(bulk.parent_query(table), (wanted,))
+                    batch, missing = bulk.split_missing_parents(table, batch, {r[0] for r in self.cursor.fetchall()})
+                    failed += missing
+
+                batch_failed = self._insert_batch(table, query, batch)
+                inserted += len(batch) - len(batch_failed)
+                failed += batch_failed
+                if not auto:
+                    self.ids.sync(self.cursor, table)
+                self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e} (додано {inserted} з {total})", sorted(failed)
+        return bulk.result_message(table, inserted, total, len(failed), time.time() - start_time), sorted(failed)
+
+    def _insert_batch(self, table, query, batch):
+        """Вставляє пакет, повертає помилки його рядків."""
+        failed = []
+        try:
+            # executemany з returning=True йде одним pipeline; результат - окремий набір на кожен рядок
+            self.cursor.executemany(query, [row for _, row in batch], returning=True)
+            for number, row in batch:
+                if self.cursor.fetchone() is None:
+                    failed.append((number, row[0], bulk.conflict_message(table)))
+                self.cursor.nextset()
+            return failed
+        except psycopg.Error:
+            self.connection.rollback()
+
+        # Повтор порядково: кожен рядок у власному savepoint, помилка не скасовує решту пакета
+        failed = []
+        with self.connection.transaction():
+            for number, row in batch:
+                try:
+                    with self.connection.transaction():
+                        self.cursor.execute(query, row)
+                        if self.cursor.fetchone() is None:
+                            failed.append((number, row[0], bulk.conflict_message(table)))
+                except psycopg.Error as e:
+                    failed.append((number, row[0], bulk.row_error(table, row, e)))
+        return failed
+
     # --- ВИДАЛЕННЯ ---
+    # FK каскадні (cascade.py), тому залежні рядки перевіряються явно. Повертає кількість видалених
+    # рядків або None, якщо є залежні (тоді нічого не видалено); commit/rollback робить викликач.
+    def _delete_restricted(self, table, where, params):
+        lock, dependents, delete = cascade.restrict_queries(table, where)
+        self.cursor.execute(lock, params)
+        keys = [row[0] for row in self.cursor.fetchall()]
+        if not keys:
+            return 0
+        self.cursor.execute(dependents, (keys,))
+        if self.cursor.fetchone()[0]:
+            return None
+        self.cursor.execute(delete, (keys,))
+        return self.cursor.rowcount
+
+    @_pooled
     def delete_user(self, user_id):
         try:
-            self.cursor.execute('DELETE FROM public."user" WHERE id = %s', (user_id,))
-            if self.cursor.rowcount > 0:
+            count = self._delete_restricted("user", "id = %s", (user_id,))
+            if count:
                 self.connection.commit()
                 return f"Користувача {user_id} видалено."
             self.connection.rollback()
-            return "ID не знайдено."
-        except errors.ForeignKeyViolation:
-            self.connection.rollback()
-            return "Неможливо видалити: є пов'язані записи."
+            return "ID не знайдено." if count == 0 else "Неможливо видалити: є пов'язані записи."
         except Exception as e:
             self.connection.rollback()
             return f"Помилка: {e}"
 
+    @_pooled
     def delete_entry(self, entry_id):
         try:
-            self.cursor.execute('DELETE FROM public.entry WHERE entry_id = %s', (entry_id,))
-            if self.cursor.rowcount > 0:
+            count = self._delete_restricted("entry", "entry_id = %s", (entry_id,))
+            if count:
                 self.connection.commit()
                 return f"Запис {entry_id} видалено."
-            return "ID не знайдено."
-        except errors.ForeignKeyViolation:
             self.connection.rollback()
-            return "Неможливо видалити: є пов'язані нагадування."
+            return "ID не знайдено." if count == 0 else "Неможливо видалити: є пов'язані нагадування."
         except Exception as e:
             self.connection.rollback()
             return f"Помилка: {e}"
 
+    @_pooled
     def delete_reminder(self, reminder_id):
         try:
             self.cursor.execute('DELETE FROM public.reminder WHERE reminder_id = %s', (reminder_id,))
@@ -144,46 +482,42 @@ class Model:
             return f"Помилка: {e}"
 
     # Видалення користувача за Username або Email
+    @_pooled
     def delete_user_by_attr(self, attr_name, value):
         try:
-            query = f'DELETE FROM public."user" WHERE {attr_name} = %s'
-            self.cursor.execute(query, (value,))
+            count = self._delete_restricted("user", f"{attr_name} = %s", (value,))
 
-            if self.cursor.rowcount > 0:
+            if count:
                 self.connection.commit()
-                return f"Видалено користувачів: {self.cursor.rowcount}."
-            else:
-                self.connection.rollback()
-                return f"Користувача з {attr_name}='{value}' не знайдено."
-        except errors.ForeignKeyViolation:
+                return f"Видалено користувачів: {count}."
             self.connection.rollback()
-            return "Неможливо видалити: є пов'язані записи."
+            if count is None:
+                return "Неможливо видалити: є пов'язані записи."
+            return f"Користувача з {attr_name}='{value}' не знайдено."
         except Exception as e:
             self.connection.rollback()
             return f"Помилка: {e}"
 
     # Видалення всіх записів певного автора (за Username)
+    @_pooled
     def delete_entries_by_author(self, username):
         try:
-            query = """
-                DELETE FROM public.entry 
-                WHERE user_id = (SELECT id FROM public."user" WHERE username = %s)
-            """
-            self.cursor.execute(query, (username,))
+            where = 'user_id = (SELECT id FROM public."user" WHERE username = %s)'
+            count = self._delete_restricted("entry", where, (username,))
 
-            if self.cursor.rowcount > 0:
+            if count:
                 self.connection.commit()
-                return f"Видалено записів автора '{username}': {self.cursor.rowcount}."
-            else:
-                return f"Записів автора '{username}' не знайдено (або автора не існує)."
-        except errors.ForeignKeyViolation:
+                return f"Видалено записів автора '{username}': {count}."
             self.connection.rollback()
-            return "Неможливо видалити: є пов'язані нагадування."
+            if count is None:
+                return "Неможливо видалити: є пов'язані нагадування."
+            return f"Записів автора '{username}' не знайдено (або автора не існує)."
         except Exception as e:
             self.connection.rollback()
             return f"Помилка: {e}"
 
     # Видалення нагадувань за датою (тільки по дню, ігноруючи час)
+    @_pooled
     def delete_reminders_by_date(self, date_str):
         try:
             query = "DELETE FROM public.reminder WHERE DATE(remind_at) = %s"
@@ -199,23 +533,22 @@ class Model:
             return f"Помилка: {e}"
 
     # --- КАСКАДНЕ ВИДАЛЕННЯ (FORCE DELETE) ---
+    # Один DELETE батьківських рядків, залежні видаляє ON DELETE CASCADE (cascade.py)
+    @_pooled
     def delete_user_cascade(self, user_id):
         try:
-            self.cursor.execute("""
-                DELETE FROM public.reminder 
-                WHERE entry_id IN (SELECT entry_id FROM public.entry WHERE user_id = %s)
-            """, (user_id,))
-
-            self.cursor.execute('DELETE FROM public.entry WHERE user_id = %s', (user_id,))
-
-            self.cursor.execute('DELETE FROM public."user" WHERE id = %s', (user_id,))
-
+            users, entries, reminders = self._execute("delete_user_cascade", (user_id,)).fetchone()
+            if not users:
+                self.connection.rollback()
+                return "Користувача не знайдено."
             self.connection.commit()
-            return f"Успішно видалено користувача {user_id} та всі його дані."
+            return (f"Успішно видалено користувача {user_id} та всі його дані "
+                    f"({cascade.removed_message(entries, reminders)}).")
         except Exception as e:
             self.connection.rollback()
             return f"Помилка каскадного видалення: {e}"
 
+    @_pooled
     def delete_user_cascade_by_attr(self, attr_name, value):
         try:
             query_find = f'SELECT id FROM public."user" WHERE {attr_name} = %s'
@@ -232,46 +565,35 @@ class Model:
         except Exception as e:
             return f"Помилка каскаду: {e}"
 
+    @_pooled
     def delete_entry_cascade(self, entry_id):
         try:
-            self.cursor.execute('DELETE FROM public.reminder WHERE entry_id = %s', (entry_id,))
-
-            self.cursor.execute('DELETE FROM public.entry WHERE entry_id = %s', (entry_id,))
-
+            entries, reminders = self._execute("delete_entry_cascade", (entry_id,)).fetchone()
+            if not entries:
+                self.connection.rollback()
+                return "Запис не знайдено."
             self.connection.commit()
-            return f"Успішно видалено запис {entry_id} та його нагадування."
+            return f"Успішно видалено запис {entry_id} та його нагадування ({reminders})."
         except Exception as e:
             self.connection.rollback()
             return f"Помилка каскадного видалення: {e}"
 
+    @_pooled
     def delete_entries_cascade_by_author(self, username):
         try:
-            query_rem = """
-                DELETE FROM public.reminder 
-                WHERE entry_id IN (
-                    SELECT entry_id FROM public.entry 
-                    WHERE user_id = (SELECT id FROM public."user" WHERE username = %s)
-                )
-            """
-            self.cursor.execute(query_rem, (username,))
-
-            query_ent = """
-                DELETE FROM public.entry 
-                WHERE user_id = (SELECT id FROM public."user" WHERE username = %s)
-            """
-            self.cursor.execute(query_ent, (username,))
-
-            if self.cursor.rowcount > 0:
+            entries, reminders = self._execute("delete_entries_cascade_by_author", (username,)).fetchone()
+            if entries:
                 self.connection.commit()
-                return f"Успішно видалено всі записи та нагадування автора '{username}'."
-            else:
-                self.connection.rollback()
-                return f"Записів автора '{username}' не знайдено."
+                return (f"Успішно видалено всі записи та нагадування автора '{username}' "
+                        f"({cascade.removed_message(entries, reminders)}).")
+            self.connection.rollback()
+            return f"Записів автора '{username}' не знайдено."
 
         except Exception as e:
             self.connection.rollback()
             return f"Помилка: {e}"
 
+    @_pooled
     def delete_reminders_by_status(self, is_active):
         try:
             query = "DELETE FROM public.reminder WHERE active = %s"
@@ -288,102 +610,70 @@ class Model:
             return f"Помилка: {e}"
 
     # --- ОЧИЩЕННЯ КОНКРЕТНИХ ТАБЛИЦЬ ---
+    @_pooled
     def clear_table_users(self):
         try:
             self.cursor.execute('TRUNCATE TABLE public."user" RESTART IDENTITY CASCADE')
             self.connection.commit()
+            self.ids.reset("user", "entry", "reminder")
             return "Таблицю Users (та всі залежні дані) повністю очищено. ID скинуто."
         except Exception as e:
             self.connection.rollback()
             return f"Помилка: {e}"
 
+    @_pooled
     def clear_table_entries(self):
         try:
             self.cursor.execute('TRUNCATE TABLE public.entry RESTART IDENTITY CASCADE')
             self.connection.commit()
+            self.ids.reset("entry", "reminder")
             return "Таблицю Entries (та залежні нагадування) повністю очищено. ID скинуто."
         except Exception as e:
             self.connection.rollback()
             return f"Помилка: {e}"
 
+    @_pooled
     def clear_table_reminders(self):
         try:
             self.cursor.execute('TRUNCATE TABLE public.reminder RESTART IDENTITY CASCADE')
             self.connection.commit()
+            self.ids.reset("reminder")
             return "Таблицю Reminders повністю очищено. ID скинуто."
         except Exception as e:
             self.connection.rollback()
             return f"Помилка: {e}"
 
     # --- ПОШУК ЗА ІДЕНТИФІКАТОРОМ ---
+    @_pooled
     def find_user_by_id(self, user_id):
         try:
-            query = 'SELECT id, username, email, password FROM public."user" WHERE id = %s'
-            self.cursor.execute(query, (user_id,))
+            self._execute("find_user", (user_id,))
             return self.cursor.fetchall()
         except Exception as e:
             return str(e)
 
+    @_pooled
     def find_entry_by_id(self, entry_id):
         try:
-            query = 'SELECT entry_id, title, text, user_id FROM public.entry WHERE entry_id = %s'
-            self.cursor.execute(query, (entry_id,))
+            self._execute("find_entry", (entry_id,))
             return self.cursor.fetchall()
         except Exception as e:
             return str(e)
 
+    @_pooled
     def find_reminder_by_id(self, reminder_id):
         try:
-            query = 'SELECT reminder_id, entry_id, remind_at, active FROM public.reminder WHERE reminder_id = %s'
-            self.cursor.execute(query, (reminder_id,))
+            self._execute("find_reminder", (reminder_id,))
             return self.cursor.fetchall()
         except Exception as e:
             return str(e)
 
     # --- ГНУЧКИЙ ПОШУК ---
+    @_pooled(error_result=_timed_error)
     def search_flexible(self, filters):
         start_time = time.time()
 
-        query = """
-            SELECT 
-                u.id, 
-                u.username, 
-                u.email, 
-                COUNT(DISTINCT e.entry_id) as entries_count,
-                COUNT(DISTINCT r.reminder_id) as reminders_count
-            FROM public."user" u
-            LEFT JOIN public.entry e ON u.id = e.user_id
-            LEFT JOIN public.reminder r ON e.entry_id = r.entry_id
-            WHERE 1=1
-        """
-        params = []
-
-        if filters.get('username'):
-            query += " AND u.username ILIKE %s"
-            params.append(f"%{filters['username']}%")
-
-        if filters.get('email'):
-            query += " AND u.email ILIKE %s"
-            params.append(f"%{filters['email']}%")
-
-        if filters.get('title'):
-            query += " AND e.title ILIKE %s"
-            params.append(f"%{filters['title']}%")
-
-        if filters.get('text'):
-            query += " AND e.text ILIKE %s"
-            params.append(f"%{filters['text']}%")
-
-        if filters.get('is_active') is not None:
-            query += " AND r.active = %s"
-            params.append(filters['is_active'])
-
-        if filters.get('date_from') and filters.get('date_to'):
-            query += " AND r.remind_at BETWEEN %s AND %s"
-            params.append(filters['date_from'])
-            params.append(filters['date_to'])
-
-        query += " GROUP BY u.id, u.username, u.email ORDER BY u.id"
+        query, params = search.build_search_query(filters)
 
         try:
             self.cursor.execute(query, params)
@@ -393,180 +683,200 @@ class Model:
         except Exception as e:
             return str(e), 0
 
+    # --- ПОВНОТЕКСТОВИЙ ПОШУК ---
+    @_pooled(error_result=_timed_error)
+    def search_entries_fulltext(self, query, language=fulltext.DEFAULT_LANGUAGE, limit=10):
+        start_time = time.time()
+        try:
+            self.cursor.execute(fulltext.build_search_query(language), {"query": query, "limit": limit})
+            results = self.cursor.fetchall()
+            exec_time = (time.time() - start_time) * 1000
+            return results, exec_time
+        except Exception as e:
+            self.connection.rollback()
+            return str(e), 0
+
+    @_pooled(error_result=_rows_error)
     def get_user_entries_details(self, user_id):
         try:
-            self.cursor.execute('SELECT username FROM public."user" WHERE id = %s', (user_id,))
+            self._execute("username", (user_id,))
             user = self.cursor.fetchone()
 
             if not user:
                 return "Користувача з таким ID не знайдено."
 
-            query = """
-                SELECT entry_id, title, text 
-                FROM public.entry 
-                WHERE user_id = %s
-                ORDER BY entry_id
-            """
-            self.cursor.execute(query, (user_id,))
+            self._execute("user_entries", (user_id,))
             results = self.cursor.fetchall()
 
             return user[0], results
         except Exception as e:
-            return str(e), []
+            return f"Помилка: {e}", []
 
     # --- ОТРИМАННЯ НАГАДУВАНЬ КОНКРЕТНОГО КОРИСТУВАЧА ---
+    @_pooled(error_result=_rows_error)
     def get_user_reminders_details(self, user_id):
         try:
-            self.cursor.execute('SELECT username FROM public."user" WHERE id = %s', (user_id,))
+            self._execute("username", (user_id,))
             user = self.cursor.fetchone()
 
             if not user:
                 return "Користувача з таким ID не знайдено."
 
-            query = """
-                SELECT r.reminder_id, e.title, r.remind_at, r.active
-                FROM public.reminder r
-                JOIN public.entry e ON r.entry_id = e.entry_id
-                WHERE e.user_id = %s
-                ORDER BY r.remind_at
-            """
-            self.cursor.execute(query, (user_id,))
+            self._execute("user_reminders", (user_id,))
             results = self.cursor.fetchall()
 
             return user[0], results
         except Exception as e:
-            return str(e), []
+            return f"Помилка: {e}", []
+
+    # --- ПОТОКОВЕ ЧИТАННЯ (СЕРВЕРНІ КУРСОРИ) ---
+    # Варіанти get_user_*_details, що повертають (username, генератор рядків). Рядки читаються
+    # іменованим серверним курсором по batch_size за раз, тому перший рядок доступний одразу,
+    # а пам'ять не залежить від кількості записів користувача.
+    # Генератор тримає власне з'єднання (з пулу або, без пулу, окреме): commit інших методів
+    # на основному з'єднанні не закриває курсор, поки рядки ще читаються.
+    # З'єднання, DECLARE і перша порція - ще в _stream_details: помилки видачі з пулу чи запиту
+    # повертаються як звичайно, а під час читання лишається лише обрив з'єднання.
+    @_pooled(error_result=_rows_error)
+    def stream_user_entries_details(self, user_id, batch_size=STREAM_BATCH_SIZE):
+        return self._stream_details(user_id, USER_ENTRIES_QUERY, batch_size)
+
+    @_pooled(error_result=_rows_error)
+    def stream_user_reminders_details(self, user_id, batch_size=STREAM_BATCH_SIZE):
+        return self._stream_details(user_id, USER_REMINDERS_QUERY, batch_size)
+
+    def _stream_details(self, user_id, query, batch_size):
+        try:
+            self._execute("username", (user_id,))
+            user = self.cursor.fetchone()
+
+            if not user:
+                return "Користувача з таким ID не знайдено."
+
+            rows = self._stream(query, (user_id,), batch_size)
+            next(rows)
+            return user[0], rows
+        except Exception as e:
+            return f"Помилка: {e}", []
+
+    def _stream(self, query, params, batch_size):
+        """Генератор рядків; перший next() лише відкриває курсор і читає першу порцію."""
+        if self.pool is None:
+            with psycopg.connect(self.conn_info) as conn:
+                yield from self._stream_rows(conn, query, params, batch_size)
+            return
+
+        # Метод, що створив генератор, уже повернув своє з'єднання в пул,
+        # тому генератор бере власне і тримає його, доки його не дочитають або не закриють
+        start = time.perf_counter()
+        with self.pool.connection(timeout=self.pool_timeout) as conn:
+            self._count_checkout((time.perf_counter() - start) * 1000)
+            try:
+                yield from self._stream_rows(conn, query, params, batch_size)
+            finally:
+                with self._stats_lock:
+                    self._pool_counters["in_use"] -= 1
+
+    @staticmethod
+    def _stream_rows(conn, query, params, batch_size):
+        with conn.cursor(name=f"stream_{next(_stream_names)}") as cur:
+            cur.execute(query, params)
+            rows = cur.fetchmany(batch_size)
+            yield  # запит виконано, перша порція прочитана
+            while rows:
+                yield from rows
+                rows = cur.fetchmany(batch_size)
+
+    # --- ІМПОРТ / ЕКСПОРТ (COPY, див. transfer.py) ---
+    # Працюють через окреме з'єднання; таблиці - у порядку FK (user -> entry -> reminder).
+    def export_data(self, directory, fmt="csv", compress=False):
+        try:
+            results = transfer.export_tables(self.conn_info, directory, fmt, compress,
+                                             progress=transfer.print_progress)
+            return transfer.summary_message("Експортовано", results) + f" Каталог: {directory}"
+        except Exception as e:
+            return f"Помилка експорту: {e}"
+
+    def import_data(self, directory, batch_size=transfer.DEFAULT_BATCH_SIZE, resume=True):
+        """Повертає (повідомлення, [(таблиця, рядок файлу, id, помилка), ...])."""
+        errors = []
+        try:
+            results = transfer.import_tables(self.conn_info, directory, batch_size, resume, errors,
+                                             progress=transfer.print_progress)
+            return transfer.summary_message("Імпортовано", results), errors
+        except Exception as e:
+            return f"Помилка імпорту: {e} (оброблені пакети збережено, повторний імпорт продовжить з місця зупинки)", errors
+        finally:
+            # Імпорт просунув послідовності - локальні блоки ID більше не актуальні
+            self.ids.reset()
 
     # --- ГЕНЕРАЦІЯ ДАНИХ ---
-    def generate_users(self, count):
+    # Рядки генеруються пакетами на клієнті (NumPy) і заливаються через бінарний COPY (див. generator.py).
+    # workers > 1 - паралельна генерація: діапазон ID ділиться між процесами з власними з'єднаннями.
+    # generator.py (з NumPy) імпортується лише при генерації - решті команд він не потрібен на старті.
+    @_pooled
+    def generate_users(self, count, workers=1):
         start_time = time.time()
         try:
-            self.cursor.execute('SELECT COALESCE(MAX(id), 0) FROM public."user"')
-            start_id = self.cursor.fetchone()[0] + 1
-
-            query = """
-                INSERT INTO public."user" (id, username, email, password)
-                SELECT 
-                    i, 
-
-                    -- Username: 6 випадкових літер + підкреслення + ID
-                    (SELECT array_to_string(ARRAY(
-                        SELECT chr(trunc(65 + random() * 25)::int) 
-                        FROM generate_series(1, 6 + (i - i))
-                    ), '')) || '_' || i,
-
-                    -- Email: 3 випадкові літери + ID + домен
-                    (SELECT array_to_string(ARRAY(
-                        SELECT chr(trunc(65 + random() * 25)::int) 
-                        FROM generate_series(1, 3 + (i - i))
-                    ), '')) || i || '@gen.com',
-
-                    -- Password: 10 випадкових літер
-                    (SELECT array_to_string(ARRAY(
-                        SELECT chr(trunc(65 + random() * 25)::int) 
-                        FROM generate_series(1, 10 + (i - i))
-                    ), ''))
-
-                FROM generate_series(%s::int, %s::int) AS i
-                ON CONFLICT DO NOTHING
-            """
-            self.cursor.execute(query, (start_id, start_id + count - 1))
-            self.connection.commit()
-
-            exec_time = (time.time() - start_time) * 1000
-            return f"Успішно згенеровано {count} користувачів за {exec_time:.2f} мс."
+            return self._generate("user", "користувачів", count, None, workers, start_time)
         except Exception as e:
             self.connection.rollback()
             return f"Помилка генерації User: {e}"
 
-    def generate_entries(self, count):
-        self.cursor.execute('SELECT count(*) FROM public."user"')
-        if self.cursor.fetchone()[0] == 0:
-            return "Помилка: Немає користувачів! Спочатку згенеруйте Users."
-
+    @_pooled
+    def generate_entries(self, count, workers=1):
         start_time = time.time()
         try:
-            self.cursor.execute('SELECT COALESCE(MAX(entry_id), 0) FROM public.entry')
-            start_id = self.cursor.fetchone()[0] + 1
-
-            query = """
-                WITH all_ids AS (
-                    SELECT array_agg(id) as id_list FROM public."user"
-                )
-                INSERT INTO public.entry (entry_id, title, text, user_id)
-                SELECT 
-                    i,
-
-                    -- TITLE: 10 випадкових літер
-                    (SELECT array_to_string(ARRAY(
-                        SELECT chr(trunc(65 + random() * 25)::int) 
-                        FROM generate_series(1, 10 + (i - i))
-                    ), '')),
-
-                    -- TEXT: 10 випадкових літер
-                    (SELECT array_to_string(ARRAY(
-                        SELECT chr(trunc(65 + random() * 25)::int) 
-                        FROM generate_series(1, 10 + (i - i))
-                    ), '')),
-
-                    -- User ID: випадковий з існуючих
-                    id_list[floor(random() * array_length(id_list, 1) + 1)]
-
-                FROM generate_series(%s::int, %s::int) AS i, all_ids
-            """
-            self.cursor.execute(query, (start_id, start_id + count - 1))
-            self.connection.commit()
+            import generator
+            user_ids = generator.load_parent_ids(self.cursor, 'public."user"', "id")
+            if user_ids is None:
+                self.connection.rollback()
+                return "Помилка: Немає користувачів! Спочатку згенеруйте Users."
 
-            exec_time = (time.time() - start_time) * 1000
-            return f"Успішно згенеровано {count} записів за {exec_time:.2f} мс."
+            return self._generate("entry", "записів", count, user_ids, workers, start_time)
         except Exception as e:
             self.connection.rollback()
             return f"Помилка генерації Entry: {e}"
 
-    def generate_reminders(self, count):
-        self.cursor.execute('SELECT count(*) FROM public.entry')
-        if self.cursor.fetchone()[0] == 0:
-            return "Помилка: Немає записів (Entries)! Спочатку згенеруйте Entries."
-
+    @_pooled
+    def generate_reminders(self, count, workers=1):
         start_time = time.time()
         try:
-            self.cursor.execute('SELECT COALESCE(MAX(reminder_id), 0) FROM public.reminder')
-            start_id = self.cursor.fetchone()[0] + 1
-
-            query = """
-                WITH all_ids AS (
-                    SELECT array_agg(entry_id) as id_list FROM public.entry
-                )
-                INSERT INTO public.reminder (reminder_id, entry_id, remind_at, active)
-                SELECT 
-                    i,
-                    -- Беремо випадковий ID з масиву id_list
-                    id_list[floor(random() * array_length(id_list, 1) + 1)],
-
-                    timestamp '2025-09-01 08:00:00' + 
-                    random() * (timestamp '2026-06-30 20:00:00' - timestamp '2025-09-01 08:00:00'),
-
-                    (random() > 0.5)
-                FROM generate_series(%s::int, %s::int) AS i, all_ids
-            """
-            self.cursor.execute(query, (start_id, start_id + count - 1))
-            self.connection.commit()
+            import generator
+            entry_ids = generator.load_parent_ids(self.cursor, "public.entry", "entry_id")
+            if entry_ids is None:
+                self.connection.rollback()
+                return "Помилка: Немає записів (Entries)! Спочатку згенеруйте Entries."
 
-            exec_time = (time.time() - start_time) * 1000
-            return f"Успішно згенеровано {count} нагадувань за {exec_time:.2f} мс."
+            return self._generate("reminder", "нагадувань", count, entry_ids, workers, start_time)
         except Exception as e:
             self.connection.rollback()
             return f"Помилка генерації Reminder: {e}"
 
+    def _generate(self, table, what, count, parents, workers, start_time):
+        import generator
+
+        # ID резервуються в послідовності наперед - жодного MAX(id) і конфліктів з іншими вставками
+        ranges = self.ids.reserve(self.cursor, table, count)
+        if workers > 1:
+            # Батьківські ID уже прочитані з закомічених даних; завершуємо власну транзакцію
+            self.connection.commit()
+            written, errors = generator.generate_parallel(self.conn_info, table, ranges, parents,
+                                                          workers=workers, progress=generator.print_progress)
+            return generator.parallel_message(what, count, written, errors, time.time() - start_time)
+
+        written = sum(generator.copy_table(self.cursor, table, start_id, chunk_count, parents)
+                      for start_id, chunk_count in ranges)
+        self.connection.commit()
+        return generator.rate_message(what, count, time.time() - start_time, written)
+
     # --- РЕДАГУВАННЯ (UPDATE) ---
+    @_pooled
     def update_user(self, current_id, new_id, new_username, new_email, new_password):
         try:
-            query = """
-                UPDATE public."user" 
-                SET id = %s, username = %s, email = %s, password = %s 
-                WHERE id = %s
-            """
-            self.cursor.execute(query, (new_id, new_username, new_email, new_password, current_id))
+            self._execute("update_user", (new_id, new_username, new_email, new_password, current_id))
+            if new_id != current_id:
+                self.ids.sync(self.cursor, "user")
             self.connection.commit()
             return "Користувача успішно оновлено."
         except errors.UniqueViolation:
@@ -582,14 +892,12 @@ class Model:
             self.connection.rollback()
             return f"Помилка оновлення: {e}"
 
+    @_pooled
     def update_entry(self, current_id, new_id, new_title, new_text, new_user_id):
         try:
-            query = """
-                UPDATE public.entry 
-                SET entry_id = %s, title = %s, text = %s, user_id = %s 
-                WHERE entry_id = %s
-            """
-            self.cursor.execute(query, (new_id, new_title, new_text, new_user_id, current_id))
+            self._execute("update_entry", (new_id, new_title, new_text, new_user_id, current_id))
+            if new_id != current_id:
+                self.ids.sync(self.cursor, "entry")
             self.connection.commit()
             return "Запис успішно оновлено."
         except errors.ForeignKeyViolation:
@@ -602,14 +910,12 @@ class Model:
             self.connection.rollback()
             return f"Помилка оновлення: {e}"
 
+    @_pooled
     def update_reminder(self, current_id, new_id, new_entry_id, new_date, new_active):
         try:
-            query = """
-                UPDATE public.reminder 
-                SET reminder_id = %s, entry_id = %s, remind_at = %s, active = %s 
-                WHERE reminder_id = %s
-            """
-            self.cursor.execute(query, (new_id, new_entry_id, new_date, new_active, current_id))
+            self._execute("update_reminder", (new_id, new_entry_id, new_date, new_active, current_id))
+            if new_id != current_id:
+                self.ids.sync(self.cursor, "reminder")
             self.connection.commit()
             return "Нагадування успішно оновлено."
         except errors.ForeignKeyViolation:
@@ -623,12 +929,14 @@ class Model:
             return f"Помилка оновлення: {e}"
 
 # --- ПОВНЕ ОЧИЩЕННЯ БАЗИ ---
+    @_pooled
     def delete_all_data(self):
         try:
             query = 'TRUNCATE TABLE public."user", public.entry, public.reminder RESTART IDENTITY CASCADE'
             self.cursor.execute(query)
             self.connection.commit()
+            self.ids.reset()
             return "Всі таблиці успішно очищено. База даних порожня."
         except Exception as e:
             self.connection.rollback()
-            return f"Критична помилка очищення: {e}"
\ No newline at end of file
+            return f"Критична помилка очищення: {e}"
\ No newline at end of file
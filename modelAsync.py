@@ -0,0 +1,528 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from functools import wraps
+import psycopg
+from psycopg import errors
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
+
+import cascade
+import fulltext
+import ids
+import schema
+import search
+import statements
+
+
+def _pooled(method):
+    """Помилка видачі з'єднання з пулу (або обірваного з'єднання під час rollback) - рядком, як у
+    model._pooled, а не винятком: with self._cursor() у методах стоїть перед їхнім try."""
+    @wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        try:
+            return await method(self, *args, **kwargs)
+        except (PoolTimeout, psycopg.OperationalError) as e:
+            return f"Помилка пулу з'єднань: {e}"
+    return wrapper
+
+
+# Асинхронний варіант model.Model на psycopg.AsyncConnection.
+# Кожен метод бере з'єднання з асинхронного пулу, тому з одного event loop
+# одночасно можуть виконуватись сотні запитів (обмежено лише pool_max_size).
+class AsyncModel:
+    def __init__(self, db_name, user, password, host, port, pool_min_size=1, pool_max_size=20, pool_timeout=30.0):
+        self.conn_info = f"dbname={db_name} user={user} password={password} host={host} port={port}"
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
+        self.pool_timeout = pool_timeout
+        self.pool = None
+        self.ids = ids.IdAllocator()
+
+    async def connect(self):
+        try:
+            self.pool = AsyncConnectionPool(
+                self.conn_info,
+                min_size=self.pool_min_size,
+                max_size=self.pool_max_size,
+                timeout=self.pool_timeout,
+                check=AsyncConnectionPool.check_connection,
+                open=False,
+            )
+            await self.pool.open(wait=True, timeout=self.pool_timeout)
+            # Ті самі міграції, що й у model.py (послідовності ids.py, tsvector, user_stats, каскадні FK,
+            # індекси). Вони синхронні, а indexes.py відкриває окреме з'єднання, тому - в окремому потоці,
+            # щоб не блокувати event loop
+            await asyncio.to_thread(self._prepare_schema)
+            return True
+        except Exception as e:
+            if self.pool is not None:
+                await self.pool.close()
+            self.pool = None
+            print(f"Помилка підключення: {e}")
+            return False
+
+    def _prepare_schema(self):
+        with psycopg.connect(self.conn_info) as conn:
+            schema.ensure(conn, self.conn_info)
+
+    async def disconnect(self):
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    @asynccontextmanager
+    async def _cursor(self):
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                yield conn, cur
+
+    async def _fetchall(self, query, params=None):
+        try:
+            async with self._cursor() as (conn, cur):
+                await cur.execute(query, params)
+                return await cur.fetchall()
+        except Exception as e:
+            return str(e)
+
+    # --- ВИВЕДЕННЯ ТОП-10 ---
+    async def get_top_users(self, limit=10):
+        return await self._fetchall('SELECT id, username, email FROM public."user" ORDER BY id LIMIT %s', (limit,))
+
+    async def get_top_entries(self, limit=10):
+        return await self._fetchall(
+            'SELECT entry_id, title, text, user_id FROM public.entry ORDER BY entry_id LIMIT %s', (limit,))
+
+    async def get_top_reminders(self, limit=10):
+        return await self._fetchall(
+            'SELECT reminder_id, entry_id, remind_at, active FROM public.reminder ORDER BY reminder_id LIMIT %s',
+            (limit,))
+
+    # --- ДОДАВАННЯ ---
+    @_pooled
+    async def add_user(self, user_id, username, email, password):
+        async with self._cursor() as (conn, cur):
+            try:
+                explicit_id = user_id is not None
+                if not explicit_id:
+                    user_id = await self.ids.next_id_async(cur, "user")
+                    print(f"(Автоматично обрано ID: {user_id})")
+
+                query = 'INSERT INTO public."user" (id, username, email, password) VALUES (%s, %s, %s, %s)'
+                await cur.execute(query, (user_id, username, email, password))
+                if explicit_id:
+                    await self.ids.sync_async(cur, "user")
+                await conn.commit()
+                return "Користувача успішно додано."
+            except errors.UniqueViolation:
+                await conn.rollback()
+                return "Помилка: Такий ID, email або username вже існує."
+            except Exception as e:
+                await conn.rollback()
+                return f"Помилка: {e}"
+
+    @_pooled
+    async def add_entry(self, entry_id, title, text, user_id):
+        async with self._cursor() as (conn, cur):
+            try:
+                explicit_id = entry_id is not None
+                if not explicit_id:
+                    entry_id = await self.ids.next_id_async(cur, "entry")
+                    print(f"(Автоматично обрано ID: {entry_id})")
+
+                query = "INSERT INTO public.entry (entry_id, title, text, user_id) VALUES (%s, %s, %s, %s)"
+                await cur.execute(query, (entry_id, title, text, user_id))
+                if explicit_id:
+                    await self.ids.sync_async(cur, "entry")
+                await conn.commit()
+                return "Запис успішно додано."
+            except errors.ForeignKeyViolation:
+                await conn.rollback()
+                return f"Помилка: User ID {user_id} не існує."
+            except Exception as e:
+                await conn.rollback()
+                return f"Помилка: {e}"
+
+    @_pooled
+    async def add_reminder(self, reminder_id, entry_id, remind_at, active):
+        async with self._cursor() as (conn, cur):
+            try:
+                explicit_id = reminder_id is not None
+                if not explicit_id:
+                    reminder_id = await self.ids.next_id_async(cur, "reminder")
+                    print(f"(Автоматично обрано ID: {reminder_id})")
+
+                query = "INSERT INTO public.reminder (reminder_id, entry_id, remind_at, active) VALUES (%s, %s, %s, %s)"
+                await cur.execute(query, (reminder_id, entry_id, remind_at, active))
+                if explicit_id:
+                    await self.ids.sync_async(cur, "reminder")
+                await conn.commit()
+                return "Нагадування успішно додано."
+            except errors.ForeignKeyViolation:
+                await conn.rollback()
+                return f"Помилка: Entry ID {entry_id} не існує."
+            except Exception as e:
+                await conn.rollback()
+                return f"Помилка: {e}"
+
+    # --- ВИДАЛЕННЯ ---
+    # Як model.Model._delete_restricted: кількість видалених рядків або None, якщо є залежні
+    @staticmethod
+    async def _delete_restricted(cur, table, where, params):
+        lock, dependents, delete = cascade.restrict_queries(table, where)
+        await cur.execute(lock, params)
+        keys = [row[0] for row in await cur.fetchall()]
+        if not keys:
+            return 0
+        await cur.execute(dependents, (keys,))
+        if (await cur.fetchone())[0]:
+            return None
+        await cur.execute(delete, (keys,))
+        return cur.rowcount
+
+    @_pooled
+    async def delete_user(self, user_id):
+        async with self._cursor() as (conn, cur):
+            try:
+                count = await self._delete_restricted(cur, "user", "id = %s", (user_id,))
+                if count:
+                    await conn.commit()
+                    return f"Користувача {user_id} видалено."
+                await conn.rollback()
+                return "ID не знайдено." if count == 0 else "Неможливо видалити: є пов'язані записи."
+            except Exception as e:
+                await conn.rollback()
+                return f"Помилка: {e}"
+
+    @_pooled
+    async def delete_entry(self, entry_id):
+        async with self._cursor() as (conn, cur):
+            try:
+                count = await self._delete_restricted(cur, "entry", "entry_id = %s", (entry_id,))
+                if count:
+                    await conn.commit()
+                    return f"Запис {entry_id} видалено."
+                await conn.rollback()
+                return "ID не знайдено." if count == 0 else "Неможливо видалити: є пов'язані нагадування."
+            except Exception as e:
+                await conn.rollback()
+                return f"Помилка: {e}"
+
+    @_pooled
+    async def delete_reminder(self, reminder_id):
+        async with self._cursor() as (conn, cur):
+            try:
+                await cur.execute('DELETE FROM public.reminder WHERE reminder_id = %s', (reminder_id,))
+                if cur.rowcount > 0:
+                    await conn.commit()
+                    return f"Нагадування {reminder_id} видалено."
+                return "ID не знайдено."
+            except Exception as e:
+                await conn.rollback()
+                return f"Помилка: {e}"
+
+    @_pooled
+    async def delete_user_by_attr(self, attr_name, value):
+        async with self._cursor() as (conn, cur):
+            try:
+                count = await self._delete_restricted(cur, "user", f"{attr_name} = %s", (value,))
+
+                if count:
+                    await conn.commit()
+                    return f"Видалено користувачів: {count}."
+                await conn.rollback()
+                if count is None:
+                    return "Неможливо видалити: є пов'язані записи."
+                return f"Користувача з {attr_name}='{value}' не знайдено."
+            except Exception as e:
+                await conn.rollback()
+                return f"Помилка: {e}"
+
+    @_pooled
+    async def delete_entries_by_author(self, username):
+        async with self._cursor() as (conn, cur):
+            try:
+                where = 'user_id = (SELECT id FROM public."user" WHERE username = %s)'
+                count = await self._delete_restricted(cur, "entry", where, (username,))
+
+                if count:
+                    await conn.commit()
+                    return f"Видалено записів автора '{username}': {count}."
+                await conn.rollback()
+                if count is None:
+                    return "Неможливо видалити: є пов'язані нагадування."
+                return f"Записів автора '{username}' не знайдено (або автора не існує)."
+            except Exception as e:
+                await conn.rollback()
+                return f"Помилка: {e}"
+
+    @_pooled
+    async def delete_reminders_by_date(self, date_str):
+        async with self._cursor() as (conn, cur):
+            try:
+                await cur.execute("DELETE FROM public.reminder WHERE DATE(remind_at) = %s", (date_str,))
+
+                if cur.rowcount > 0:
+                    await conn.commit()
+                    return f"Видалено нагадувань за {date_str}: {cur.rowcount}."
+                return "Нагадувань за цю дату не знайдено."
+            except Exception as e:
+                await conn.rollback()
+                return f"Помилка: {e}"
+
+    @_pooled
+    async def delete_reminders_by_status(self, is_active):
+        async with self._cursor() as (conn, cur):
+            try:
+                await cur.execute("DELETE FROM public.reminder WHERE active = %s", (is_active,))
+
+                if cur.rowcount > 0:
+                    await conn.commit()
+                    status_str = "активних" if is_active else "неактивних"
+                    return f"Успішно видалено {cur.rowcount} {status_str} нагадувань."
+                return "Нагадувань з таким статусом не знайдено."
+            except Exception as e:
+                await conn.rollback()
+                return f"Помилка: {e}"
+
+    # --- КАСКАДНЕ ВИДАЛЕННЯ (FORCE DELETE) ---
+    # Один DELETE батьківських рядків, залежні видаляє ON DELETE CASCADE (cascade.py)
+    @_pooled
+    async def delete_user_cascade(self, user_id):
+        async with self._cursor() as (conn, cur):
+            try:
+                await cur.execute(statements.STATEMENTS["delete_user_cascade"], (user_id,))
+                users, entries, reminders = await cur.fetchone()
+                if not users:
+                    await conn.rollback()
+                    return "Користувача не знайдено."
+                await conn.commit()
+                return (f"Успішно видалено користувача {user_id} та всі його дані "
+                        f"({cascade.removed_message(entries, reminders)}).")
+            except Exception as e:
+                await conn.rollback()
+                return f"Помилка каскадного видалення: {e}"
+
+    async def delete_user_cascade_by_attr(self, attr_name, value):
+        try:
+            async with self._cursor() as (conn, cur):
+                await cur.execute(f'SELECT id FROM public."user" WHERE {attr_name} = %s', (value,))
+                res = await cur.fetchone()
+
+            if not res:
+                return f"Користувача з {attr_name}='{value}' не знайдено."
+
+            return await self.delete_user_cascade(res[0])
+        except Exception as e:
+            return f"Помилка каскаду: {e}"
+
+    @_pooled
+    async def delete_entry_cascade(self, entry_id):
+        async with self._cursor() as (conn, cur):
+            try:
+                await cur.execute(statements.STATEMENTS["delete_entry_cascade"], (entry_id,))
+                entries, reminders = await cur.fetchone()
+                if not entries:
+                    await conn.rollback()
+                    return "Запис не знайдено."
+                await conn.commit()
+                return f"Успішно видалено запис {entry_id} та його нагадування ({reminders})."
+            except Exception as e:
+                await conn.rollback()
+                return f"Помилка каскадного видалення: {e}"
+
+    @_pooled
+    async def delete_entries_cascade_by_author(self, username):
+        async with self._cursor() as (conn, cur):
+            try:
+                await cur.execute(statements.STATEMENTS["delete_entries_cascade_by_author"], (username,))
+                entries, reminders = await cur.fetchone()
+                if entries:
+                    await conn.commit()
+                    return (f"Успішно видалено всі записи та нагадування автора '{username}' "
+                            f"({cascade.removed_message(entries, reminders)}).")
+                await conn.rollback()
+                return f"Записів автора '{username}' не знайдено."
+            except Exception as e:
+                await conn.rollback()
+                return f"Помилка: {e}"
+
+    # --- ОЧИЩЕННЯ КОНКРЕТНИХ ТАБЛИЦЬ ---
+    @_pooled
+    async def _truncate(self, query, message, tables, error_prefix="Помилка"):
+        async with self._cursor() as (conn, cur):
+            try:
+                await cur.execute(query)
+                await conn.commit()
+                self.ids.reset(*tables)
+                return message
+            except Exception as e:
+                await conn.rollback()
+                return f"{error_prefix}: {e}"
+
+    async def clear_table_users(self):
+        return await self._truncate('TRUNCATE TABLE public."user" RESTART IDENTITY CASCADE',
+                                    "Таблицю Users (та всі залежні дані) повністю очищено. ID скинуто.",
+                                    ("user", "entry", "reminder"))
+
+    async def clear_table_entries(self):
+        return await self._truncate('TRUNCATE TABLE public.entry RESTART IDENTITY CASCADE',
+                                    "Таблицю Entries (та залежні нагадування) повністю очищено. ID скинуто.",
+                                    ("entry", "reminder"))
+
+    async def clear_table_reminders(self):
+        return await self._truncate('TRUNCATE TABLE public.reminder RESTART IDENTITY CASCADE',
+                                    "Таблицю Reminders повністю очищено. ID скинуто.",
+                                    ("reminder",))
+
+    async def delete_all_data(self):
+        return await self._truncate(
+            'TRUNCATE TABLE public."user", public.entry, public.reminder RESTART IDENTITY CASCADE',
+            "Всі таблиці успішно очищено. База даних порожня.",
+            ("user", "entry", "reminder"), error_prefix="Критична помилка очищення")
+
+    # --- ПОШУК ЗА ІДЕНТИФІКАТОРОМ ---
+    async def find_user_by_id(self, user_id):
+        return await self._fetchall('SELECT id, username, email, password FROM public."user" WHERE id = %s',
+                                    (user_id,))
+
+    async def find_entry_by_id(self, entry_id):
+        return await self._fetchall('SELECT entry_id, title, text, user_id FROM public.entry WHERE entry_id = %s',
+                                    (entry_id,))
+
+    async def find_reminder_by_id(self, reminder_id):
+        return await self._fetchall(
+            'SELECT reminder_id, entry_id, remind_at, active FROM public.reminder WHERE reminder_id = %s',
+            (reminder_id,))
+
+    # --- ГНУЧКИЙ ПОШУК ---
+    async def search_flexible(self, filters):
+        start_time = time.time()
+
+        query, params = search.build_search_query(filters)
+        results = await self._fetchall(query, params)
+        if isinstance(results, str):
+            return results, 0
+        return results, (time.time() - start_time) * 1000
+
+    async def search_entries_fulltext(self, query, language=fulltext.DEFAULT_LANGUAGE, limit=10):
+        start_time = time.time()
+        try:
+            sql = fulltext.build_search_query(language)
+        except ValueError as e:
+            return str(e), 0
+        results = await self._fetchall(sql, {"query": query, "limit": limit})
+        if isinstance(results, str):
+            return results, 0
+        return results, (time.time() - start_time) * 1000
+
+    async def get_user_entries_details(self, user_id):
+        try:
+            async with self._cursor() as (conn, cur):
+                await cur.execute('SELECT username FROM public."user" WHERE id = %s', (user_id,))
+                user = await cur.fetchone()
+
+                if not user:
+                    return "Користувача з таким ID не знайдено."
+
+                await cur.execute("""
+                    SELECT entry_id, title, text
+                    FROM public.entry
+                    WHERE user_id = %s
+                    ORDER BY entry_id
+                """, (user_id,))
+                return user[0], await cur.fetchall()
+        except Exception as e:
+            return f"Помилка: {e}", []
+
+    async def get_user_reminders_details(self, user_id):
+        try:
+            async with self._cursor() as (conn, cur):
+                await cur.execute('SELECT username FROM public."user" WHERE id = %s', (user_id,))
+                user = await cur.fetchone()
+
+                if not user:
+                    return "Користувача з таким ID не знайдено."
+
+                await cur.execute("""
+                    SELECT r.reminder_id, e.title, r.remind_at, r.active
+                    FROM public.reminder r
+                    JOIN public.entry e ON r.entry_id = e.entry_id
+                    WHERE e.user_id = %s
+                    ORDER BY r.remind_at
+                """, (user_id,))
+                return user[0], await cur.fetchall()
+        except Exception as e:
+            return f"Помилка: {e}", []
+
+    # --- РЕДАГУВАННЯ (UPDATE) ---
+    @_pooled
+    async def update_user(self, current_id, new_id, new_username, new_email, new_password):
+        async with self._cursor() as (conn, cur):
+            try:
+                await cur.execute("""
+                    UPDATE public."user"
+                    SET id = %s, username = %s, email = %s, password = %s
+                    WHERE id = %s
+                """, (new_id, new_username, new_email, new_password, current_id))
+                if new_id != current_id:
+                    await self.ids.sync_async(cur, "user")
+                await conn.commit()
+                return "Користувача успішно оновлено."
+            except errors.UniqueViolation:
+                await conn.rollback()
+                return "Помилка: Такий ID, Username або Email вже зайняті."
+            except errors.ForeignKeyViolation:
+                await conn.rollback()
+                return "Помилка: Не можна змінити ID, бо існують пов'язані записи."
+            except errors.StringDataRightTruncation:
+                await conn.rollback()
+                return "Помилка: Дані занадто довгі! Максимум 20 символів."
+            except Exception as e:
+                await conn.rollback()
+                return f"Помилка оновлення: {e}"
+
+    @_pooled
+    async def update_entry(self, current_id, new_id, new_title, new_text, new_user_id):
+        async with self._cursor() as (conn, cur):
+            try:
+                await cur.execute("""
+                    UPDATE public.entry
+                    SET entry_id = %s, title = %s, text = %s, user_id = %s
+                    WHERE entry_id = %s
+                """, (new_id, new_title, new_text, new_user_id, current_id))
+                if new_id != current_id:
+                    await self.ids.sync_async(cur, "entry")
+                await conn.commit()
+                return "Запис успішно оновлено."
+            except errors.ForeignKeyViolation:
+                await conn.rollback()
+                return f"Помилка: User ID {new_user_id} не існує."
+            except errors.StringDataRightTruncation:
+                await conn.rollback()
+                return "Помилка: Текст або заголовок занадто довгі (макс. 20 символів)."
+            except Exception as e:
+                await conn.rollback()
+                return f"Помилка оновлення: {e}"
+
+    @_pooled
+    async def update_reminder(self, current_id, new_id, new_entry_id, new_date, new_active):
+        async with self._cursor() as (conn, cur):
+            try:
+                await cur.execute("""
+                    UPDATE public.reminder
+                    SET reminder_id = %s, entry_id = %s, remind_at = %s, active = %s
+                    WHERE reminder_id = %s
+                """, (new_id, new_entry_id, new_date, new_active, current_id))
+                if new_id != current_id:
+                    await self.ids.sync_async(cur, "reminder")
+                await conn.commit()
+                return "Нагадування успішно оновлено."
+            except errors.ForeignKeyViolation:
+                await conn.rollback()
+                return f"Помилка: Entry ID {new_entry_id} не існує."
+            except errors.DatatypeMismatch:
+                await conn.rollback()
+                return "Помилка: Невірний формат дати."
+            except Exception as e:
+                await conn.rollback()
+                return f"Помилка оновлення: {e}"
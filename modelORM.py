@@ -1,11 +1,80 @@
+import functools
+import os
+import threading
 import time
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, ForeignKey, func, text, select
-from sqlalchemy.orm import declarative_base, sessionmaker, relationship, joinedload
+from sqlalchemy import create_engine, Column, Integer, BigInteger, String, Boolean, DateTime, ForeignKey, Index, func, text, \
+    select, cast, tuple_, delete, exists, bindparam, event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import declarative_base, sessionmaker, scoped_session, relationship, joinedload, selectinload, \
+    lazyload
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
+import bulk
+import cascade
+import ids
+import fulltext
+import indexes
+import ormtemplates
+import paging
+import schema
+import statements
+import transfer
+import userstats
+
 # --- ОГОЛОШЕННЯ БАЗОВИХ КЛАСІВ ORM ---
+# Скільки рядків серверний курсор потокових методів передає за один запит до БД
+STREAM_BATCH_SIZE = 2000
+
+# --- СТРАТЕГІЇ ЗАВАНТАЖЕННЯ ЗВ'ЯЗКІВ ---
+# Зв'язки оголошені з lazy="raise_on_sql": неявне дозавантаження (N+1 - окремий запит на кожен об'єкт)
+# кидає помилку замість тихого запиту. Метод, що читає зв'язок, явно задає стратегію:
+#   selectin - другий запит ... WHERE id IN (...) для всіх батьківських об'єктів разом;
+#   joined   - LEFT JOIN у тому ж запиті (один запит, але рядки батька повторюються);
+#   lazy     - дозавантаження при першому зверненні (запит на кожен об'єкт).
+# Model(loader=...) - стратегія для всіх викликів, параметр loader= методу - для одного виклику.
+#   DIARY_ORM_LOADER=selectin
+# Кількість запитів операцій перевіряє querybudget.py.
+LOADERS = {"selectin": selectinload, "joined": joinedload, "lazy": lazyload}
+DEFAULT_LOADER = "selectin"
+
+# --- ЖИТТЄВИЙ ЦИКЛ СЕСІЙ ---
+# session_mode (DIARY_ORM_SESSION):
+#   operation - кожен метод даних (@_operation) відкриває нову сесію і закриває її після себе: identity map
+#               живе одну операцію, тож пам'ять не росте з кількістю переглянутих рядків;
+#   thread    - одна сесія на потік (scoped_session) до disconnect();
+#   shared    - одна сесія на весь час роботи.
+# Поза операцією (бенчмарки, консоль) self.session - сесія потоку.
+# У режимі operation методи читання (@_operation(read_only=True)) працюють у сесії для читання: без autoflush і без
+# транзакції - на сервер іде лише сам SELECT, без BEGIN/ROLLBACK навколо нього (ROLLBACK до того ж
+# скидає кеш підготовлених запитів psycopg). Її з'єднання - з окремого пулу read_engine, завжди
+# в AUTOCOMMIT, щоб не перемикати рівень ізоляції при кожному взятті з'єднання.
+# stream_* читають серверним курсором, якому потрібна транзакція: вони отримують звичайну сесію
+# і передають її генератору, а той закриває її, дочитавши рядки.
+# expire_on_commit (DIARY_ORM_EXPIRE_ON_COMMIT=0/1) за замовчуванням вимкнено в режимі operation:
+# об'єкти не переживають операцію, перечитувати їх після commit нема потреби.
+SESSION_MODES = ("operation", "thread", "shared")
+DEFAULT_SESSION_MODE = "operation"
+
+# --- РЕЖИМ ЧИТАННЯ ---
+# read_mode (DIARY_ORM_READ):
+#   rows    - get_top_*, find_*_by_id, get_user_*_details вибирають Core select() лише потрібних стовпців
+#             і повертають кортежі: без створення об'єктів, identity map та інструментації;
+#   objects - ті самі методи будують ORM-об'єкти й перетворюють їх на кортежі (зв'язки - за loader).
+READ_MODES = ("rows", "objects")
+DEFAULT_READ_MODE = "rows"
+
+# --- ШАБЛОНИ ЗАПИТІВ ---
+# get_top_*, find_*, get_page, search_flexible, get_user_*_details і stream_* виконують оператори,
+# побудовані один раз на варіант (ormtemplates.StatementTemplates): значення - через bindparam().
+# Статистика: get_statement_stats() - виклики й час кожного шаблону (як у model.py),
+# get_compile_cache_stats() - влучання в кеш скомпільованого SQL engine-ів.
+#   DIARY_ORM_TEMPLATES=0 - будувати оператори щоразу (для порівняння)
+
 Base = declarative_base()
 
+# Версія міграції create_all для schema.py; збільшується при зміні таблиць, оголошених нижче
+TABLES_VERSION = 1
+
 
 class User(Base):
     __tablename__ = 'user'
@@ -16,99 +85,338 @@ class User(Base):
     email = Column(String(100), unique=True, nullable=False)
     password = Column(String(100), nullable=False)
 
-    # Зв'язок 1:M (User -> Entries)
-    entries = relationship("Entry", back_populates="user", cascade="all, delete-orphan")
+    # Зв'язок 1:M (User -> Entries). passive_deletes: дочірні рядки видаляє ON DELETE CASCADE у БД,
+    # ORM їх для цього не завантажує (cascade.py)
+    entries = relationship("Entry", back_populates="user", cascade="all, delete-orphan", passive_deletes=True,
+                           order_by="Entry.entry_id", lazy="raise_on_sql")
 
 
 class Entry(Base):
     __tablename__ = 'entry'
-    __table_args__ = {'schema': 'public'}
+    # Вторинні індекси - див. indexes.INDEXES (триграмні GIN будуються лише там, бо потребують pg_trgm)
+    __table_args__ = (
+        Index('ix_entry_user_id', 'user_id', 'entry_id'),
+        {'schema': 'public'},
+    )
 
     entry_id = Column(Integer, primary_key=True)
     title = Column(String(50), nullable=False)
     text = Column(String, nullable=False)
-    user_id = Column(Integer, ForeignKey('public.user.id'), nullable=False)
+    user_id = Column(Integer, ForeignKey('public.user.id', ondelete='CASCADE'), nullable=False)
 
     # Зв'язки
-    user = relationship("User", back_populates="entries")
-    reminders = relationship("Reminder", back_populates="entry", cascade="all, delete-orphan")
+    user = relationship("User", back_populates="entries", lazy="raise_on_sql")
+    reminders = relationship("Reminder", back_populates="entry", cascade="all, delete-orphan", passive_deletes=True,
+                             order_by="Reminder.remind_at", lazy="raise_on_sql")
 
 
 class Reminder(Base):
     __tablename__ = 'reminder'
-    __table_args__ = {'schema': 'public'}
+    __table_args__ = (
+        Index('ix_reminder_entry_id', 'entry_id'),
+        Index('ix_reminder_remind_at', 'remind_at', 'reminder_id'),
+        Index('ix_reminder_active', 'entry_id', postgresql_where=text('active')),
+        {'schema': 'public'},
+    )
 
     reminder_id = Column(Integer, primary_key=True)
-    entry_id = Column(Integer, ForeignKey('public.entry.entry_id'), nullable=False)
+    entry_id = Column(Integer, ForeignKey('public.entry.entry_id', ondelete='CASCADE'), nullable=False)
     remind_at = Column(DateTime, nullable=False)
     active = Column(Boolean, default=True)
 
     # Зв'язки
-    entry = relationship("Entry", back_populates="reminders")
+    entry = relationship("Entry", back_populates="reminders", lazy="raise_on_sql")
+
+
+class UserStats(Base):
+    # Лічильники користувача; підтримуються тригерами в БД (userstats.py), ORM їх лише читає
+    __tablename__ = 'user_stats'
+    __table_args__ = {'schema': 'public'}
+
+    user_id = Column(Integer, ForeignKey('public.user.id', ondelete='CASCADE', onupdate='CASCADE'),
+                     primary_key=True)
+    entries_count = Column(BigInteger, nullable=False, server_default='0')
+    reminders_count = Column(BigInteger, nullable=False, server_default='0')
+    active_reminders_count = Column(BigInteger, nullable=False, server_default='0')
+
+
+# --- СЕСІЯ НА ОПЕРАЦІЮ ---
+def _operation(method=None, *, read_only=False):
+    """Відкриває методу даних сесію на час виклику (режим operation); read_only - сесія для читання."""
+    if method is None:
+        return functools.partial(_operation, read_only=read_only)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        local = self._local
+        # Вкладений виклик працює в сесії зовнішнього; thread/shared - довгоживучі сесії;
+        # до connect() фабрик сесій ще немає
+        if self.session_mode != "operation" or self.Session is None or getattr(local, "session", None) is not None:
+            return method(self, *args, **kwargs)
+        local.session = (self.ReadSession if read_only else self.Session)()
+        local.detached = False
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            session, local.session = local.session, None
+            if not local.detached:
+                session.close()
+    return wrapper
 
 
 # --- ГОЛОВНИЙ КЛАС МОДЕЛІ ---
 class Model:
-    def __init__(self, db_name, user, password, host, port):
-        # Формування URL підключення для SQLAlchemy
-        self.db_url = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{db_name}"
+    def __init__(self, db_name, user, password, host, port, loader=None, session_mode=None, expire_on_commit=None,
+                 read_mode=None, templates=None):
+        # Формування URL підключення для SQLAlchemy (драйвер psycopg 3 - потрібен для COPY у generate_*)
+        self.db_url = f"postgresql+psycopg://{user}:{password}@{host}:{port}/{db_name}"
+        # Рядок підключення libpq для процесів паралельної генерації
+        self.conn_info = f"dbname={db_name} user={user} password={password} host={host} port={port}"
         self.engine = None
+        self.read_engine = None
         self.Session = None
-        self.session = None
+        self.ReadSession = None
+        self._scoped = None
+        self._local = threading.local()
+        # Блоки ID з послідовностей, що роздаються локально (див. ids.py)
+        self.ids = ids.IdAllocator()
+        self.loader = loader or os.environ.get("DIARY_ORM_LOADER", DEFAULT_LOADER)
+        if self.loader not in LOADERS:
+            raise ValueError(f"Невідома стратегія завантаження '{self.loader}'. Доступні: {', '.join(LOADERS)}")
+        self.session_mode = session_mode or os.environ.get("DIARY_ORM_SESSION", DEFAULT_SESSION_MODE)
+        if self.session_mode not in SESSION_MODES:
+            raise ValueError(f"Невідомий режим сесій '{self.session_mode}'. Доступні: {', '.join(SESSION_MODES)}")
+        if expire_on_commit is None:
+            env = os.environ.get("DIARY_ORM_EXPIRE_ON_COMMIT")
+            expire_on_commit = env == "1" if env else self.session_mode != "operation"
+        self.expire_on_commit = expire_on_commit
+        self.read_mode = read_mode or os.environ.get("DIARY_ORM_READ", DEFAULT_READ_MODE)
+        if self.read_mode not in READ_MODES:
+            raise ValueError(f"Невідомий режим читання '{self.read_mode}'. Доступні: {', '.join(READ_MODES)}")
+        if templates is None:
+            templates = os.environ.get("DIARY_ORM_TEMPLATES", "1") != "0"
+        self.templates = ormtemplates.StatementTemplates(templates)
+        self.statement_stats = statements.StatementStats()
+        self.compile_cache = ormtemplates.CompileCacheStats()
 
     def connect(self):
         try:
             self.engine = create_engine(self.db_url, echo=False)  # echo=True для налагодження SQL
 
-            # Створення таблиць, якщо їх немає (автоматична генерація схеми)
-            Base.metadata.create_all(self.engine)
-
-            self.Session = sessionmaker(bind=self.engine)
-            self.session = self.Session()
+            # Міграції - лише модулів із застарілою версією чи пошкодженими об'єктами (schema.py), інакше один SELECT
+            conn = self.engine.raw_connection()
+            try:
+                schema.ensure(conn.driver_connection, self.conn_info, [
+                    # Створення таблиць, якщо їх немає (автоматична генерація схеми); create_all не додає
+                    # індекси до вже існуючих таблиць - їх перевіряє indexes.py
+                    ("tables", TABLES_VERSION, lambda conn, conn_info: Base.metadata.create_all(self.engine)),
+                ])
+            finally:
+                conn.close()
+
+            self.Session = sessionmaker(bind=self.engine, expire_on_commit=self.expire_on_commit)
+            if self.session_mode == "operation":
+                self.read_engine = create_engine(self.db_url, isolation_level="AUTOCOMMIT", pool_reset_on_return=None)
+                self.ReadSession = sessionmaker(bind=self.read_engine, autoflush=False, expire_on_commit=False)
+            for engine in (self.engine, self.read_engine):
+                if engine is not None:
+                    event.listen(engine, "before_cursor_execute", self.compile_cache)
+            # shared - один ключ реєстру на всі потоки, інакше - сесія на потік
+            self._scoped = scoped_session(self.Session,
+                                          scopefunc=(lambda: None) if self.session_mode == "shared" else None)
             return True
         except Exception as e:
             print(f"Помилка підключення: {e}")
             return False
 
     def disconnect(self):
-        if self.session:
-            self.session.close()
+        if self._scoped:
+            self._scoped.remove()
+        if self.read_engine:
+            self.read_engine.dispose()
         if self.engine:
             self.engine.dispose()
 
+    @property
+    def session(self):
+        """Сесія поточної операції; поза операцією (або в режимах thread/shared) - сесія потоку."""
+        session = getattr(self._local, "session", None)
+        if session is not None:
+            return session
+        return self._scoped() if self._scoped else None
+
+    def _detach_session(self):
+        """Передає сесію операції викликачу (потоковому генератору); None - сесію закриє не він."""
+        if getattr(self._local, "session", None) is None:
+            return None
+        self._local.detached = True
+        return self._local.session
+
+    def _load(self, relationship_attr, loader=None):
+        """Опція завантаження зв'язку за стратегією виклику (або моделі, якщо loader=None)."""
+        loader = loader or self.loader
+        if loader not in LOADERS:
+            raise ValueError(f"Невідома стратегія завантаження '{loader}'. Доступні: {', '.join(LOADERS)}")
+        return LOADERS[loader](relationship_attr)
+
+    # --- ШАБЛОНИ ЗАПИТІВ ---
+    def _execute(self, name, variant, build, params=None, execution_options=None, session=None):
+        """Виконує шаблон name (варіант variant, див. ormtemplates.StatementTemplates) і записує його час."""
+        statement = self.templates.get((name, variant), build)
+        start = time.perf_counter()
+        try:
+            result = (session or self.session).execute(statement, params, execution_options=execution_options or {})
+        except Exception:
+            self.statement_stats.record(name, (time.perf_counter() - start) * 1000, failed=True)
+            raise
+        self.statement_stats.record(name, (time.perf_counter() - start) * 1000)
+        return result
+
+    def get_statement_stats(self):
+        """Рядки під statements.STATS_HEADERS: виклики й час кожного шаблону запиту."""
+        return self.statement_stats.rows()
+
+    def get_compile_cache_stats(self):
+        stats = self.compile_cache.stats()
+        stats.update(templates=len(self.templates), template_builds=self.templates.builds,
+                     template_reuses=self.templates.reuses)
+        return stats
+
+    def _read(self, name, entity, columns, refine, **params):
+        """Рядки зі стовпців columns сутності entity (за read_mode - Core select або через ORM-об'єкти).
+        refine(select) додає до шаблону умови з bindparam(), params - їхні значення."""
+        objects = self.read_mode == "objects"
+
+        def build():
+            return refine(select(entity) if objects else select(*(getattr(entity, c) for c in columns)))
+
+        result = self._execute(name, self.read_mode, build, params)
+        if objects:
+            return [tuple(getattr(o, c) for c in columns) for o in result.scalars()]
+        # Кортежі, а не Row: Row - контейнер, який відстежує gc, тож збережені результати (CachedModel)
+        # робили б збирання сміття дорожчим
+        return list(map(tuple, result))
+
+    # Курсор psycopg у транзакції поточної сесії (для COPY та роботи з послідовностями)
+    def _raw_cursor(self):
+        return self.session.connection().connection.driver_connection.cursor()
+
+    def _next_id(self, table):
+        with self._raw_cursor() as cur:
+            return self.ids.next_id(cur, table)
+
+    def _sync_ids(self, table):
+        # Вставка/оновлення з явним ID: спершу flush, потім підтягуємо послідовність
+        self.session.flush()
+        with self._raw_cursor() as cur:
+            self.ids.sync(cur, table)
+
+    # --- ЗВІТ ПО ІНДЕКСАХ ---
+    @_operation(read_only=True)
+    def get_index_report(self):
+        try:
+            return [tuple(row) for row in self.session.execute(text(indexes.REPORT_QUERY))]
+        except Exception as e:
+            self.session.rollback()
+            return str(e)
+
+    # --- ЛІЧИЛЬНИКИ USER_STATS ---
+    @_operation
+    def rebuild_user_stats(self):
+        start_time = time.time()
+        try:
+            with self._raw_cursor() as cur:
+                count = userstats.rebuild(cur)
+            self.session.commit()
+            return f"Лічильники перераховано для {count} користувачів за {(time.time() - start_time) * 1000:.2f} мс."
+        except Exception as e:
+            self.session.rollback()
+            return f"Помилка: {e}"
+
+    @_operation(read_only=True)
+    def verify_user_stats(self, limit=100):
+        """Розбіжності user_stats з фактичними даними (порожній список - лічильники коректні)."""
+        try:
+            return self.session.connection().exec_driver_sql(*userstats.verify_query(limit)).all()
+        except Exception as e:
+            self.session.rollback()
+            return str(e)
+
     # --- ВИВЕДЕННЯ ТОП-10 ---
     # Примітка: View очікує список кортежів (tuples), тому ми конвертуємо об'єкти.
 
+    @_operation(read_only=True)
     def get_top_users(self, limit=10):
         try:
-            users = self.session.query(User).order_by(User.id).limit(limit).all()
-            return [(u.id, u.username, u.email) for u in users]
+            return self._read("top_users", User, ("id", "username", "email"),
+                              lambda q: q.order_by(User.id).limit(bindparam("limit")), limit=limit)
         except Exception as e:
             return str(e)
 
+    @_operation(read_only=True)
     def get_top_entries(self, limit=10):
         try:
-            entries = self.session.query(Entry).order_by(Entry.entry_id).limit(limit).all()
-            return [(e.entry_id, e.title, e.text, e.user_id) for e in entries]
+            return self._read("top_entries", Entry, ("entry_id", "title", "text", "user_id"),
+                              lambda q: q.order_by(Entry.entry_id).limit(bindparam("limit")), limit=limit)
         except Exception as e:
             return str(e)
 
+    @_operation(read_only=True)
     def get_top_reminders(self, limit=10):
         try:
-            rems = self.session.query(Reminder).order_by(Reminder.reminder_id).limit(limit).all()
-            return [(r.reminder_id, r.entry_id, r.remind_at, r.active) for r in rems]
+            return self._read("top_reminders", Reminder, ("reminder_id", "entry_id", "remind_at", "active"),
+                              lambda q: q.order_by(Reminder.reminder_id).limit(bindparam("limit")), limit=limit)
         except Exception as e:
             return str(e)
 
+    # --- ПОСТОРІНКОВИЙ ПЕРЕГЛЯД (KEYSET) ---
+    @_operation(read_only=True)
+    def get_page(self, table, order="id", cursor=None, page_size=paging.DEFAULT_PAGE_SIZE):
+        """Сторінка таблиці (paging.Page). cursor - next_cursor/prev_cursor попередньої сторінки."""
+        try:
+            table, order, keys, direction, page_size = paging.resolve(table, order, cursor, page_size)
+        except paging.CursorError as e:
+            return str(e)
+        try:
+            params = {"limit": page_size + 1}
+            if keys is not None:
+                params.update((f"key{i}", value) for i, value in enumerate(keys))
+            rows = [tuple(row) for row in self._execute(
+                "page", (table, order, direction, keys is not None),
+                lambda: self._page_query(table, order, direction, keys is not None), params)]
+            return paging.make_page(table, order, rows, keys, direction, page_size)
+        except Exception as e:
+            self.session.rollback()
+            return str(e)
+
+    @staticmethod
+    def _page_query(table, order, direction, after_keys):
+        entity = {"user": User, "entry": Entry, "reminder": Reminder}[table]
+        spec = paging.TABLES[table]
+        key_columns = [getattr(entity, name) for name in spec.orders[order]]
+        backward = direction == "prev"
+
+        query = select(*(getattr(entity, name) for name in spec.columns))
+        if after_keys:
+            key = tuple_(*key_columns)
+            bound = tuple_(*(bindparam(f"key{i}", type_=c.type) for i, c in enumerate(key_columns)))
+            query = query.where(key < bound if backward else key > bound)
+        return query.order_by(*(c.desc() if backward else c.asc() for c in key_columns)).limit(bindparam("limit"))
+
     # --- ДОДАВАННЯ (CREATE) ---
+    @_operation
     def add_user(self, user_id, username, email, password):
         try:
-            # Якщо user_id передано явно, використовуємо його, інакше автоінкремент
+            # Якщо user_id передано явно, використовуємо його, інакше наступний ID з блоку
             new_user = User(username=username, email=email, password=password)
             if user_id is not None:
                 new_user.id = user_id
+                self.session.add(new_user)
+                self._sync_ids("user")
+            else:
+                new_user.id = self._next_id("user")
+                self.session.add(new_user)
 
-            self.session.add(new_user)
             self.session.commit()
             return "Користувача успішно додано."
         except IntegrityError:
@@ -118,13 +426,18 @@ class Model:
             self.session.rollback()
             return f"Помилка: {e}"
 
+    @_operation
     def add_entry(self, entry_id, title, text, user_id):
         try:
             new_entry = Entry(title=title, text=text, user_id=user_id)
             if entry_id is not None:
                 new_entry.entry_id = entry_id
+                self.session.add(new_entry)
+                self._sync_ids("entry")
+            else:
+                new_entry.entry_id = self._next_id("entry")
+                self.session.add(new_entry)
 
-            self.session.add(new_entry)
             self.session.commit()
             return "Запис успішно додано."
         except IntegrityError:
@@ -134,14 +447,19 @@ class Model:
             self.session.rollback()
             return f"Помилка: {e}"
 
+    @_operation
     def add_reminder(self, reminder_id, entry_id, remind_at, active):
         try:
             # Перетворення рядка дати у об'єкт datetime (якщо це рядок), хоча SQLAlchemy може сама це зробити
             new_rem = Reminder(entry_id=entry_id, remind_at=remind_at, active=active)
             if reminder_id is not None:
                 new_rem.reminder_id = reminder_id
+                self.session.add(new_rem)
+                self._sync_ids("reminder")
+            else:
+                new_rem.reminder_id = self._next_id("reminder")
+                self.session.add(new_rem)
 
-            self.session.add(new_rem)
             self.session.commit()
             return "Нагадування успішно додано."
         except IntegrityError:
@@ -151,39 +469,129 @@ class Model:
             self.session.rollback()
             return f"Помилка: {e}"
 
+    # --- МАСОВЕ ДОДАВАННЯ ---
+    # Як у model.Model (див. bulk.py), але пакет іде одним INSERT ... VALUES (...), (...) ON CONFLICT
+    # DO NOTHING RETURNING (insertmanyvalues SQLAlchemy) у savepoint-і, а не через executemany.
+    @_operation
+    def add_users_bulk(self, rows, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        return self._add_bulk(User, "user", rows, batch_size)
+
+    @_operation
+    def add_entries_bulk(self, rows, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        return self._add_bulk(Entry, "entry", rows, batch_size)
+
+    @_operation
+    def add_reminders_bulk(self, rows, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        return self._add_bulk(Reminder, "reminder", rows, batch_size)
+
+    def _add_bulk(self, model, table, rows, batch_size):
+        start_time = time.time()
+        rows, failed = bulk.normalize(table, rows)
+        total = len(rows) + len(failed)
+        inserted = 0
+        columns = bulk.TABLES[table].columns
+        try:
+            stmt = (pg_insert(model.__table__).on_conflict_do_nothing()
+                    .returning(model.__table__.c[columns[0]]))
+            for batch, auto in bulk.batches(rows, batch_size):
+                if auto:
+                    with self._raw_cursor() as cur:
+                        new_ids = bulk.id_ranges_to_list(self.ids.reserve(cur, table, len(batch)))
+                        batch = bulk.assign_ids(batch, new_ids)
+                wanted = bulk.parent_ids(table, batch)
+                if wanted is not None:
+                    existing = self.session.connection().exec_driver_sql(bulk.parent_query(table), (wanted,))
+                    batch, missing = bulk.split_missing_parents(table, batch, {r[0] for r in existing})
+                    failed += missing
+
+                batch_failed = self._insert_batch(stmt, table, columns, batch)
+                inserted += len(batch) - len(batch_failed)
+                failed += batch_failed
+                if not auto:
+                    self._sync_ids(table)
+                self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            return f"Помилка: {e} (додано {inserted} з {total})", sorted(failed)
+        return bulk.result_message(table, inserted, total, len(failed), time.time() - start_time), sorted(failed)
+
+    def _insert_batch(self, stmt, table, columns, batch):
+        """Вставляє пакет, повертає помилки його рядків."""
+        if not batch:
+            return []
+        try:
+            with self.session.begin_nested():
+                returned = [r[0] for r in self.session.execute(stmt, [dict(zip(columns, row)) for _, row in batch])]
+        except SQLAlchemyError:
+            returned = None
+
+        failed = []
+        if returned is not None:
+            # RETURNING повертає лише вставлені рядки; повторний ID у пакеті - конфлікт другого входження
+            returned = set(returned)
+            for number, row in batch:
+                if row[0] in returned:
+                    returned.discard(row[0])
+                else:
+                    failed.append((number, row[0], bulk.conflict_message(table)))
+            return failed
+
+        # Повтор порядково: кожен рядок у власному savepoint, помилка не скасовує решту пакета
+        for number, row in batch:
+            try:
+                with self.session.begin_nested():
+                    if self.session.execute(stmt, dict(zip(columns, row))).first() is None:
+                        failed.append((number, row[0], bulk.conflict_message(table)))
+            except SQLAlchemyError as e:
+                failed.append((number, row[0], bulk.row_error(table, row, e)))
+        return failed
+
     # --- ВИДАЛЕННЯ (DELETE) ---
+    # FK каскадні (cascade.py), тому звичайне видалення спершу блокує рядки (FOR UPDATE) і перевіряє
+    # залежні. Повертає кількість видалених рядків або None, якщо є залежні; commit робить викликач.
+    def _delete_restricted(self, pk, fk, condition):
+        keys = self.session.scalars(select(pk).where(condition).order_by(pk).with_for_update()).all()
+        if not keys:
+            return 0
+        if self.session.scalar(select(exists().where(fk.in_(keys)))):
+            return None
+        return self.session.execute(delete(pk.class_).where(pk.in_(keys))).rowcount
+
+    @_operation
     def delete_user(self, user_id):
         try:
-            user = self.session.get(User, user_id)
-            if not user:
+            count = self._delete_restricted(User.id, Entry.user_id, User.id == user_id)
+            if count is None:
+                self.session.rollback()
+                return "Неможливо видалити: є пов'язані записи (спробуйте каскадне видалення)."
+            if not count:
+                self.session.rollback()
                 return "ID не знайдено."
 
-            self.session.delete(user)
             self.session.commit()
             return f"Користувача {user_id} видалено."
-        except IntegrityError:
-            self.session.rollback()
-            return "Неможливо видалити: є пов'язані записи (спробуйте каскадне видалення)."
         except Exception as e:
             self.session.rollback()
             return f"Помилка: {e}"
 
+    @_operation
     def delete_entry(self, entry_id):
         try:
-            entry = self.session.get(Entry, entry_id)
-            if not entry:
+            count = self._delete_restricted(Entry.entry_id, Reminder.entry_id, Entry.entry_id == entry_id)
+            if count is None:
+                self.session.rollback()
+                return "Неможливо видалити: є пов'язані нагадування."
+            if not count:
+                self.session.rollback()
                 return "ID не знайдено."
 
-            self.session.delete(entry)
             self.session.commit()
             return f"Запис {entry_id} видалено."
-        except IntegrityError:
-            self.session.rollback()
-            return "Неможливо видалити: є пов'язані нагадування."
         except Exception as e:
             self.session.rollback()
             return f"Помилка: {e}"
 
+    @_operation
     def delete_reminder(self, reminder_id):
         try:
             rem = self.session.get(Reminder, reminder_id)
@@ -197,26 +605,25 @@ class Model:
             self.session.rollback()
             return f"Помилка: {e}"
 
+    @_operation
     def delete_user_by_attr(self, attr_name, value):
         try:
             # Динамічний фільтр
-            query = self.session.query(User).filter(getattr(User, attr_name) == value)
-            count = query.count()
-
+            count = self._delete_restricted(User.id, Entry.user_id, getattr(User, attr_name) == value)
+            if count is None:
+                self.session.rollback()
+                return "Неможливо видалити: є пов'язані записи."
             if count == 0:
+                self.session.rollback()
                 return f"Користувача з {attr_name}='{value}' не знайдено."
 
-            # Важливо: delete(synchronize_session=False) для масового видалення
-            query.delete(synchronize_session=False)
             self.session.commit()
             return f"Видалено користувачів: {count}."
-        except IntegrityError:
-            self.session.rollback()
-            return "Неможливо видалити: є пов'язані записи."
         except Exception as e:
             self.session.rollback()
             return f"Помилка: {e}"
 
+    @_operation
     def delete_entries_by_author(self, username):
         try:
             # Знаходимо ID юзера
@@ -224,19 +631,20 @@ class Model:
             if not user:
                 return f"Автора '{username}' не знайдено."
 
-            count = self.session.query(Entry).filter_by(user_id=user.id).delete()
+            count = self._delete_restricted(Entry.entry_id, Reminder.entry_id, Entry.user_id == user.id)
+            if count is None:
+                self.session.rollback()
+                return "Неможливо видалити: є пов'язані нагадування."
             self.session.commit()
 
             if count > 0:
                 return f"Видалено записів автора '{username}': {count}."
             return f"Записів автора '{username}' не знайдено."
-        except IntegrityError:
-            self.session.rollback()
-            return "Неможливо видалити: є пов'язані нагадування."
         except Exception as e:
             self.session.rollback()
             return f"Помилка: {e}"
 
+    @_operation
     def delete_reminders_by_date(self, date_str):
         try:
             # Порівняння дати (cast до DATE)
@@ -252,70 +660,88 @@ class Model:
             return f"Помилка: {e}"
 
     # --- КАСКАДНЕ ВИДАЛЕННЯ ---
-    # В ORM це простіше, якщо в моделі вказано cascade="all, delete-orphan".
-    # Але для надійності тут реалізовано явно, як вимагала логіка.
-
+    # Один DELETE батьківських рядків (ON DELETE CASCADE у БД, passive_deletes у відношеннях): об'єкти
+    # не завантажуються в сесію. Кількість видалених рядків рахують підзапити того ж оператора (cascade.py).
+
+    def _delete_users_cascade(self, condition):
+        """(користувачів, записів, нагадувань)"""
+        deleted = delete(User).where(condition).returning(User.id).cte("deleted")
+        user_ids = select(deleted.c.id)
+        return self.session.execute(select(
+            select(func.count()).select_from(deleted).scalar_subquery(),
+            select(func.count()).select_from(Entry).where(Entry.user_id.in_(user_ids)).scalar_subquery(),
+            select(func.count()).select_from(Reminder).join(Entry, Entry.entry_id == Reminder.entry_id)
+            .where(Entry.user_id.in_(user_ids)).scalar_subquery(),
+        )).one()
+
+    def _delete_entries_cascade(self, condition):
+        """(записів, нагадувань)"""
+        deleted = delete(Entry).where(condition).returning(Entry.entry_id).cte("deleted")
+        return self.session.execute(select(
+            select(func.count()).select_from(deleted).scalar_subquery(),
+            select(func.count()).select_from(Reminder)
+            .where(Reminder.entry_id.in_(select(deleted.c.entry_id))).scalar_subquery(),
+        )).one()
+
+    @_operation
     def delete_user_cascade(self, user_id):
         try:
-            user = self.session.get(User, user_id)
-            if not user:
+            users, entries, reminders = self._delete_users_cascade(User.id == user_id)
+            if not users:
+                self.session.rollback()
                 return "Користувача не знайдено."
 
-            # Завдяки cascade="all, delete-orphan" у моделі User, видалення юзера
-            # автоматично видалить його entries, а ті - reminders.
-            self.session.delete(user)
             self.session.commit()
-            return f"Успішно видалено користувача {user_id} та всі його дані (через ORM cascade)."
+            return (f"Успішно видалено користувача {user_id} та всі його дані "
+                    f"({cascade.removed_message(entries, reminders)}).")
         except Exception as e:
             self.session.rollback()
             return f"Помилка каскадного видалення: {e}"
 
+    @_operation
     def delete_user_cascade_by_attr(self, attr_name, value):
         try:
-            users = self.session.query(User).filter(getattr(User, attr_name) == value).all()
+            users, entries, reminders = self._delete_users_cascade(getattr(User, attr_name) == value)
             if not users:
+                self.session.rollback()
                 return f"Користувача з {attr_name}='{value}' не знайдено."
 
-            for u in users:
-                self.session.delete(u)
-
             self.session.commit()
-            return f"Успішно видалено користувачів ({len(users)}) та їх дані."
+            return f"Успішно видалено користувачів ({users}) та їх дані ({cascade.removed_message(entries, reminders)})."
         except Exception as e:
             self.session.rollback()
             return f"Помилка каскаду: {e}"
 
+    @_operation
     def delete_entry_cascade(self, entry_id):
         try:
-            entry = self.session.get(Entry, entry_id)
-            if not entry:
+            entries, reminders = self._delete_entries_cascade(Entry.entry_id == entry_id)
+            if not entries:
+                self.session.rollback()
                 return "Запис не знайдено."
 
-            self.session.delete(entry)
             self.session.commit()
-            return f"Успішно видалено запис {entry_id} та його нагадування."
+            return f"Успішно видалено запис {entry_id} та його нагадування ({reminders})."
         except Exception as e:
             self.session.rollback()
             return f"Помилка: {e}"
 
+    @_operation
     def delete_entries_cascade_by_author(self, username):
         try:
-            user = self.session.query(User).filter_by(username=username).first()
-            if not user:
+            user_id = self.session.scalar(select(User.id).where(User.username == username))
+            if user_id is None:
                 return "Автора не знайдено."
 
-            # Видаляємо всі записи цього юзера. Каскад ORM підтягне нагадування.
-            count = 0
-            for entry in user.entries:
-                self.session.delete(entry)
-                count += 1
-
+            entries, reminders = self._delete_entries_cascade(Entry.user_id == user_id)
             self.session.commit()
-            return f"Успішно видалено всі записи ({count}) та нагадування автора '{username}'."
+            return (f"Успішно видалено всі записи та нагадування автора '{username}' "
+                    f"({cascade.removed_message(entries, reminders)}).")
         except Exception as e:
             self.session.rollback()
             return f"Помилка: {e}"
 
+    @_operation
     def delete_reminders_by_status(self, is_active):
         try:
             count = self.session.query(Reminder).filter_by(active=is_active).delete(synchronize_session=False)
@@ -329,86 +755,81 @@ class Model:
     # --- ОЧИЩЕННЯ ТАБЛИЦЬ (TRUNCATE) ---
     # ORM не має прямого методу TRUNCATE, використовуємо execute(text(...))
 
+    @_operation
     def clear_table_users(self):
         try:
             self.session.execute(text('TRUNCATE TABLE public."user" RESTART IDENTITY CASCADE'))
             self.session.commit()
+            self.ids.reset("user", "entry", "reminder")
             return "Таблицю Users (та всі залежні дані) очищено."
         except Exception as e:
             self.session.rollback()
             return f"Помилка: {e}"
 
+    @_operation
     def clear_table_entries(self):
         try:
             self.session.execute(text('TRUNCATE TABLE public.entry RESTART IDENTITY CASCADE'))
             self.session.commit()
+            self.ids.reset("entry", "reminder")
             return "Таблицю Entries очищено."
         except Exception as e:
             self.session.rollback()
             return f"Помилка: {e}"
 
+    @_operation
     def clear_table_reminders(self):
         try:
             self.session.execute(text('TRUNCATE TABLE public.reminder RESTART IDENTITY CASCADE'))
             self.session.commit()
+            self.ids.reset("reminder")
             return "Таблицю Reminders очищено."
         except Exception as e:
             self.session.rollback()
             return f"Помилка: {e}"
 
     # --- ПОШУК ЗА ID ---
+    @_operation(read_only=True)
     def find_user_by_id(self, user_id):
         try:
-            u = self.session.get(User, user_id)
-            return [(u.id, u.username, u.email, u.password)] if u else []
+            return self._read("find_user", User, ("id", "username", "email", "password"),
+                              lambda q: q.where(User.id == bindparam("id")), id=user_id)
         except Exception as e:
             return str(e)
 
+    @_operation(read_only=True)
     def find_entry_by_id(self, entry_id):
         try:
-            e = self.session.get(Entry, entry_id)
-            return [(e.entry_id, e.title, e.text, e.user_id)] if e else []
+            return self._read("find_entry", Entry, ("entry_id", "title", "text", "user_id"),
+                              lambda q: q.where(Entry.entry_id == bindparam("id")), id=entry_id)
         except Exception as e:
             return str(e)
 
+    @_operation(read_only=True)
     def find_reminder_by_id(self, reminder_id):
         try:
-            r = self.session.get(Reminder, reminder_id)
-            return [(r.reminder_id, r.entry_id, r.remind_at, r.active)] if r else []
+            return self._read("find_reminder", Reminder, ("reminder_id", "entry_id", "remind_at", "active"),
+                              lambda q: q.where(Reminder.reminder_id == bindparam("id")), id=reminder_id)
         except Exception as e:
             return str(e)
 
     # --- ГНУЧКИЙ ПОШУК ---
+    @_operation(read_only=True)
     def search_flexible(self, filters):
         start_time = time.time()
         try:
-            query = self.session.query(
-                User.id,
-                User.username,
-                User.email,
-                func.count(func.distinct(Entry.entry_id)),
-                func.count(func.distinct(Reminder.reminder_id))
-            ).outerjoin(Entry, User.id == Entry.user_id) \
-                .outerjoin(Reminder, Entry.entry_id == Reminder.entry_id)
-
-            # Застосування фільтрів
-            if filters.get('username'):
-                query = query.filter(User.username.ilike(f"%{filters['username']}%"))
-            if filters.get('email'):
-                query = query.filter(User.email.ilike(f"%{filters['email']}%"))
-            if filters.get('title'):
-                query = query.filter(Entry.title.ilike(f"%{filters['title']}%"))
-            if filters.get('text'):
-                query = query.filter(Entry.text.ilike(f"%{filters['text']}%"))
+            # Варіант шаблону - набір заданих фільтрів, значення - параметри
+            params = {}
+            for name in ('username', 'email', 'title', 'text'):
+                if filters.get(name):
+                    params[name] = f"%{filters[name]}%"
             if filters.get('is_active') is not None:
-                query = query.filter(Reminder.active == filters['is_active'])
+                params['is_active'] = filters['is_active']
             if filters.get('date_from') and filters.get('date_to'):
-                query = query.filter(Reminder.remind_at.between(filters['date_from'], filters['date_to']))
+                params['date_from'], params['date_to'] = filters['date_from'], filters['date_to']
 
-            # Групування
-            query = query.group_by(User.id, User.username, User.email).order_by(User.id)
-
-            results = query.all()
+            active = tuple(params)
+            results = self._execute("search_flexible", active, lambda: self._search_query(active), params).all()
             # Результат вже є списком кортежів (tuple), конвертація не потрібна
 
             exec_time = (time.time() - start_time) * 1000
@@ -416,122 +837,275 @@ class Model:
         except Exception as e:
             return str(e), 0
 
-    def get_user_entries_details(self, user_id):
+    @staticmethod
+    def _search_query(active):
+        # Спочатку агрегація (нагадування -> записи -> користувачі), потім join з user - див. search.py
+        user_filters, entry_filters, reminder_filters = [], [], []
+        if 'username' in active:
+            user_filters.append(User.username.ilike(bindparam('username')))
+        if 'email' in active:
+            user_filters.append(User.email.ilike(bindparam('email')))
+        if 'title' in active:
+            entry_filters.append(Entry.title.ilike(bindparam('title')))
+        if 'text' in active:
+            entry_filters.append(Entry.text.ilike(bindparam('text')))
+        if 'is_active' in active:
+            reminder_filters.append(Reminder.active == bindparam('is_active'))
+        if 'date_from' in active:
+            reminder_filters.append(Reminder.remind_at.between(bindparam('date_from'), bindparam('date_to')))
+
+        if not entry_filters and not reminder_filters:
+            # Усі користувачі з повними лічильниками - готові значення з user_stats
+            return select(
+                User.id,
+                User.username,
+                User.email,
+                func.coalesce(UserStats.entries_count, 0),
+                func.coalesce(UserStats.reminders_count, 0)
+            ).outerjoin(UserStats, UserStats.user_id == User.id) \
+                .where(*user_filters) \
+                .order_by(User.id)
+
+        if user_filters:
+            entry_filters.append(Entry.user_id.in_(select(User.id).where(*user_filters)))
+
+        entry_stats = select(Entry.entry_id, Entry.user_id,
+                             func.count(Reminder.reminder_id).label('reminders')) \
+            .join(Reminder, Reminder.entry_id == Entry.entry_id, isouter=not reminder_filters) \
+            .where(*entry_filters, *reminder_filters) \
+            .group_by(Entry.entry_id) \
+            .cte('entry_stats')
+        stats = select(entry_stats.c.user_id,
+                       func.count().label('entries_count'),
+                       cast(func.sum(entry_stats.c.reminders), BigInteger).label('reminders_count')) \
+            .group_by(entry_stats.c.user_id) \
+            .cte('stats')
+
+        return select(
+            User.id,
+            User.username,
+            User.email,
+            stats.c.entries_count,
+            stats.c.reminders_count
+        ).join(stats, stats.c.user_id == User.id) \
+            .where(*user_filters) \
+            .order_by(User.id)
+
+    # --- ПОВНОТЕКСТОВИЙ ПОШУК ---
+    # Стовпці tsvector не оголошені в моделі Entry (щоб не завантажувати їх з кожним записом),
+    # тому запит виконується як SQL драйвера через з'єднання сесії
+    @_operation(read_only=True)
+    def search_entries_fulltext(self, query, language=fulltext.DEFAULT_LANGUAGE, limit=10):
+        start_time = time.time()
+        try:
+            results = self.session.connection().exec_driver_sql(
+                fulltext.build_search_query(language), {"query": query, "limit": limit}).all()
+            exec_time = (time.time() - start_time) * 1000
+            return results, exec_time
+        except Exception as e:
+            self.session.rollback()
+            return str(e), 0
+
+    @_operation(read_only=True)
+    def get_user_entries_details(self, user_id, loader=None):
+        if self.read_mode == "rows":
+            return self._user_entries_rows(user_id)
         try:
-            user = self.session.get(User, user_id)
+            # populate_existing: користувач уже може бути в сесії без завантаженого user.entries
+            loader = loader or self.loader
+            user = self._execute(
+                "user_entries", ("objects", loader),
+                lambda: select(User).where(User.id == bindparam("user_id")).options(self._load(User.entries, loader))
+                .execution_options(populate_existing=True), {"user_id": user_id}).scalars().unique().first()
             if not user:
                 return "Користувача з таким ID не знайдено."
 
-            # ORM lazy loading (або explicit join)
             res = [(e.entry_id, e.title, e.text) for e in user.entries]
             return user.username, res
         except Exception as e:
-            return str(e), []
+            self.session.rollback()
+            return f"Помилка: {e}", []
 
+    def _user_entries_rows(self, user_id):
+        # Один запит: LEFT JOIN повертає username навіть для користувача без записів
+        try:
+            rows = self._execute(
+                "user_entries", "rows",
+                lambda: select(User.username, Entry.entry_id, Entry.title, Entry.text)
+                .outerjoin(Entry, Entry.user_id == User.id)
+                .where(User.id == bindparam("user_id"))
+                .order_by(Entry.entry_id), {"user_id": user_id}).all()
+            if not rows:
+                return "Користувача з таким ID не знайдено."
+            return rows[0][0], [tuple(row[1:]) for row in rows if row[1] is not None]
+        except Exception as e:
+            self.session.rollback()
+            return f"Помилка: {e}", []
+
+    @_operation(read_only=True)
     def get_user_reminders_details(self, user_id):
         try:
-            user = self.session.get(User, user_id)
-            if not user:
+            if self.read_mode == "rows":
+                username = self._username(user_id)
+            else:
+                user = self.session.get(User, user_id)
+                username = user.username if user else None
+            if username is None:
                 return "Користувача з таким ID не знайдено."
 
             # Складний запит через join, бо Reminders не напряму в User
-            # Але ми можемо піти через entries в Python або зробити Join query
-            query = self.session.query(Reminder.reminder_id, Entry.title, Reminder.remind_at, Reminder.active) \
-                .join(Entry) \
-                .filter(Entry.user_id == user_id) \
-                .order_by(Reminder.remind_at)
+            results = self._execute("user_reminders", None, self._user_reminders_query, {"user_id": user_id})
+            return username, list(map(tuple, results))
+        except Exception as e:
+            return f"Помилка: {e}", []
+
+    # --- ПОТОКОВЕ ЧИТАННЯ ---
+    # Варіанти get_user_*_details, що повертають (username, генератор рядків) замість
+    # завантаження user.entries. yield_per вмикає stream_results: psycopg читає рядки
+    # серверним курсором по batch_size за раз, тож пам'ять не залежить від кількості записів.
+    # Генератор читає у власній сесії (сесії операції або, в режимах thread/shared, новій), тож commit
+    # інших методів не закриває курсор. Запит і перша порція - ще в _stream_details: їхні помилки
+    # повертаються як звичайно, а під час читання лишається лише обрив з'єднання.
+    @_operation
+    def stream_user_entries_details(self, user_id, batch_size=STREAM_BATCH_SIZE):
+        return self._stream_details(user_id, "stream_entries", self._user_entries_query, batch_size)
+
+    @_operation
+    def stream_user_reminders_details(self, user_id, batch_size=STREAM_BATCH_SIZE):
+        return self._stream_details(user_id, "user_reminders", self._user_reminders_query, batch_size)
+
+    @staticmethod
+    def _user_entries_query():
+        return select(Entry.entry_id, Entry.title, Entry.text) \
+            .where(Entry.user_id == bindparam("user_id")) \
+            .order_by(Entry.entry_id)
+
+    @staticmethod
+    def _user_reminders_query():
+        return select(Reminder.reminder_id, Entry.title, Reminder.remind_at, Reminder.active) \
+            .join(Entry) \
+            .where(Entry.user_id == bindparam("user_id")) \
+            .order_by(Reminder.remind_at)
+
+    def _username(self, user_id):
+        return self._execute("username", None, lambda: select(User.username).where(User.id == bindparam("user_id")),
+                             {"user_id": user_id}).scalar()
+
+    def _stream_details(self, user_id, name, build, batch_size):
+        try:
+            username = self._username(user_id)
+            if username is None:
+                return "Користувача з таким ID не знайдено."
+
+            rows = self._stream(self._detach_session() or self.Session(), name, build, {"user_id": user_id},
+                                batch_size)
+            next(rows)
+            return username, rows
+        except Exception as e:
+            self.session.rollback()
+            return f"Помилка: {e}", []
 
-            results = query.all()
-            return user.username, results
+    def _stream(self, session, name, build, params, batch_size):
+        """Генератор рядків; перший next() лише виконує запит і читає першу порцію. Закриває session."""
+        try:
+            with self._execute(name, None, build, params, {"yield_per": batch_size}, session=session) as result:
+                rows = result.fetchmany(batch_size)
+                yield
+                while rows:
+                    yield from map(tuple, rows)
+                    rows = result.fetchmany(batch_size)
+        finally:
+            session.close()
+
+    # --- ІМПОРТ / ЕКСПОРТ (COPY, див. transfer.py) ---
+    # Працюють через окреме з'єднання; таблиці - у порядку FK (user -> entry -> reminder).
+    def export_data(self, directory, fmt="csv", compress=False):
+        try:
+            results = transfer.export_tables(self.conn_info, directory, fmt, compress,
+                                             progress=transfer.print_progress)
+            return transfer.summary_message("Експортовано", results) + f" Каталог: {directory}"
         except Exception as e:
-            return str(e), []
+            return f"Помилка експорту: {e}"
+
+    def import_data(self, directory, batch_size=transfer.DEFAULT_BATCH_SIZE, resume=True):
+        """Повертає (повідомлення, [(таблиця, рядок файлу, id, помилка), ...])."""
+        errors = []
+        try:
+            results = transfer.import_tables(self.conn_info, directory, batch_size, resume, errors,
+                                             progress=transfer.print_progress)
+            return transfer.summary_message("Імпортовано", results), errors
+        except Exception as e:
+            return f"Помилка імпорту: {e} (оброблені пакети збережено, повторний імпорт продовжить з місця зупинки)", errors
+        finally:
+            # Імпорт просунув послідовності - локальні блоки ID більше не актуальні
+            self.ids.reset()
 
     # --- ГЕНЕРАЦІЯ ДАНИХ ---
-    # Використання raw SQL тут виправдано продуктивністю, але ми обгорнемо в text()
-    # Або можна переписати на ORM Bulk Inserts (session.bulk_save_objects),
-    # але для збереження швидкості генерації тисяч записів краще залишити insert...select.
+    # Генерація йде повз ORM: пакети рядків будуються на клієнті (NumPy) і заливаються
+    # бінарним COPY через драйверне з'єднання psycopg поточної сесії (див. generator.py).
+    # generator.py (з NumPy) імпортується лише при генерації - решті команд він не потрібен на старті.
 
-    def generate_users(self, count):
+    @_operation
+    def generate_users(self, count, workers=1):
         start_time = time.time()
         try:
-            # Визначаємо start_id
-            max_id = self.session.query(func.max(User.id)).scalar() or 0
-            start_id = max_id + 1
-
-            sql = text("""
-                INSERT INTO public."user" (id, username, email, password)
-                SELECT 
-                    i, 
-                    'User_' || i || '_' || substr(md5(random()::text), 1, 5),
-                    'user' || i || '@gen.com',
-                    substr(md5(random()::text), 1, 10)
-                FROM generate_series(:start, :end) AS i
-                ON CONFLICT DO NOTHING
-            """)
-            self.session.execute(sql, {'start': start_id, 'end': start_id + count - 1})
-            self.session.commit()
-
-            exec_time = (time.time() - start_time) * 1000
-            return f"Успішно згенеровано {count} користувачів за {exec_time:.2f} мс."
+            return self._generate("user", "користувачів", count, None, workers, start_time)
         except Exception as e:
             self.session.rollback()
             return f"Помилка генерації User: {e}"
 
-    def generate_entries(self, count):
-        if self.session.query(User).count() == 0:
-            return "Помилка: Немає користувачів!"
-
+    @_operation
+    def generate_entries(self, count, workers=1):
         start_time = time.time()
         try:
-            max_id = self.session.query(func.max(Entry.entry_id)).scalar() or 0
-            start_id = max_id + 1
-
-            sql = text("""
-                INSERT INTO public.entry (entry_id, title, text, user_id)
-                SELECT 
-                    i,
-                    'Title_' || substr(md5(random()::text), 1, 8),
-                    'Text content ' || i,
-                    (SELECT id FROM public."user" ORDER BY random() LIMIT 1)
-                FROM generate_series(:start, :end) AS i
-            """)
-            self.session.execute(sql, {'start': start_id, 'end': start_id + count - 1})
-            self.session.commit()
-
-            exec_time = (time.time() - start_time) * 1000
-            return f"Успішно згенеровано {count} записів за {exec_time:.2f} мс."
+            import generator
+            with self._raw_cursor() as cur:
+                user_ids = generator.load_parent_ids(cur, 'public."user"', "id")
+            if user_ids is None:
+                self.session.rollback()
+                return "Помилка: Немає користувачів!"
+
+            return self._generate("entry", "записів", count, user_ids, workers, start_time)
         except Exception as e:
             self.session.rollback()
             return f"Помилка генерації Entry: {e}"
 
-    def generate_reminders(self, count):
-        if self.session.query(Entry).count() == 0:
-            return "Помилка: Немає записів!"
-
+    @_operation
+    def generate_reminders(self, count, workers=1):
         start_time = time.time()
         try:
-            max_id = self.session.query(func.max(Reminder.reminder_id)).scalar() or 0
-            start_id = max_id + 1
-
-            sql = text("""
-                INSERT INTO public.reminder (reminder_id, entry_id, remind_at, active)
-                SELECT 
-                    i,
-                    (SELECT entry_id FROM public.entry ORDER BY random() LIMIT 1),
-                    NOW() + (random() * (INTERVAL '1 year')),
-                    (random() > 0.5)
-                FROM generate_series(:start, :end) AS i
-            """)
-            self.session.execute(sql, {'start': start_id, 'end': start_id + count - 1})
-            self.session.commit()
-
-            exec_time = (time.time() - start_time) * 1000
-            return f"Успішно згенеровано {count} нагадувань за {exec_time:.2f} мс."
+            import generator
+            with self._raw_cursor() as cur:
+                entry_ids = generator.load_parent_ids(cur, "public.entry", "entry_id")
+            if entry_ids is None:
+                self.session.rollback()
+                return "Помилка: Немає записів!"
+
+            return self._generate("reminder", "нагадувань", count, entry_ids, workers, start_time)
         except Exception as e:
             self.session.rollback()
             return f"Помилка генерації Reminder: {e}"
 
+    def _generate(self, table, what, count, parents, workers, start_time):
+        import generator
+
+        with self._raw_cursor() as cur:
+            ranges = self.ids.reserve(cur, table, count)
+        if workers > 1:
+            # Воркери працюють з власними з'єднаннями і бачать лише закомічені дані
+            self.session.commit()
+            written, errors = generator.generate_parallel(self.conn_info, table, ranges, parents,
+                                                          workers=workers, progress=generator.print_progress)
+            return generator.parallel_message(what, count, written, errors, time.time() - start_time)
+
+        with self._raw_cursor() as cur:
+            written = sum(generator.copy_table(cur, table, start_id, chunk_count, parents)
+                          for start_id, chunk_count in ranges)
+        self.session.commit()
+        return generator.rate_message(what, count, time.time() - start_time, written)
+
     # --- РЕДАГУВАННЯ (UPDATE) ---
+    @_operation
     def update_user(self, current_id, new_id, new_username, new_email, new_password):
         try:
             user = self.session.get(User, current_id)
@@ -543,6 +1117,8 @@ class Model:
             user.username = new_username
             user.email = new_email
             user.password = new_password
+            if new_id != current_id:
+                self._sync_ids("user")
 
             self.session.commit()
             return "Користувача успішно оновлено."
@@ -553,6 +1129,7 @@ class Model:
             self.session.rollback()
             return f"Помилка оновлення: {e}"
 
+    @_operation
     def update_entry(self, current_id, new_id, new_title, new_text, new_user_id):
         try:
             entry = self.session.get(Entry, current_id)
@@ -563,6 +1140,8 @@ class Model:
             entry.title = new_title
             entry.text = new_text
             entry.user_id = new_user_id
+            if new_id != current_id:
+                self._sync_ids("entry")
 
             self.session.commit()
             return "Запис успішно оновлено."
@@ -573,6 +1152,7 @@ class Model:
             self.session.rollback()
             return f"Помилка оновлення: {e}"
 
+    @_operation
     def update_reminder(self, current_id, new_id, new_entry_id, new_date, new_active):
         try:
             rem = self.session.get(Reminder, current_id)
@@ -583,6 +1163,8 @@ class Model:
             rem.entry_id = new_entry_id
             rem.remind_at = new_date
             rem.active = new_active
+            if new_id != current_id:
+                self._sync_ids("reminder")
 
             self.session.commit()
             return "Нагадування успішно оновлено."
@@ -594,13 +1176,15 @@ class Model:
             return f"Помилка оновлення: {e}"
 
     # --- ПОВНЕ ОЧИЩЕННЯ БАЗИ ---
+    @_operation
     def delete_all_data(self):
         try:
             # Очищення всіх таблиць з каскадом
             self.session.execute(
                 text('TRUNCATE TABLE public."user", public.entry, public.reminder RESTART IDENTITY CASCADE'))
             self.session.commit()
+            self.ids.reset()
             return "Всі таблиці успішно очищено. База даних порожня."
         except Exception as e:
             self.session.rollback()
-            return f"Критична помилка очищення: {e}"
\ No newline at end of file
+            return f"Критична помилка очищення: {e}"
@@ -0,0 +1,1033 @@
+import json
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import bulk
+import cascade
+import dialect
+import fulltext
+import paging
+import search
+import statements
+import transfer
+import userstats
+
+# --- ВБУДОВАНИЙ БЕКЕНД SQLITE ---
+# Той самий набір методів, що й у model.Model / modelORM.Model, але БД - файл SQLite у тому ж процесі:
+# без сервера і без мережевих звернень (крайові розгортання, швидкі тести). Схема еквівалентна:
+# ті самі таблиці, PK, FK, UNIQUE, довжини varchar (CHECK), btree-індекси з indexes.INDEXES,
+# user_stats з тригерами (userstats.py), повнотекстовий пошук - FTS5 замість tsvector + GIN.
+# Журнал WAL: читачі не блокуються записом, а commit - лише дописування в файл -wal.
+# SQL з statements/search/paging/bulk/userstats перекладається dialect.to_sqlite(); решта відмінностей:
+#   * TRUNCATE ... RESTART IDENTITY -> DELETE: INTEGER PRIMARY KEY видає MAX(id) + 1, тож після
+#     очищення ID знову починаються з 1;
+#   * generate_series / COPY -> пакети generator.row_batches через executemany;
+#   * DATE(remind_at) = дата -> діапазон [дата, дата + 1 день), що використовує ix_reminder_remind_at;
+#   * ID рядків без явного значення видає SQLite (записувач один, блоки ids.py не потрібні).
+#   DIARY_SQLITE_PATH=diary.sqlite3   (файл БД; ":memory:" - лише в пам'яті)
+
+DEFAULT_PATH = "diary.sqlite3"
+
+# Скільки рядків потокові методи читають з курсора за раз
+STREAM_BATCH_SIZE = 2000
+
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",  # у WAL-режимі commit не чекає fsync, цілісність БД зберігається
+    "foreign_keys": "ON",
+    "temp_store": "MEMORY",
+    "cache_size": -64_000,  # ~64 МБ сторінкового кешу
+    "mmap_size": 256 * 1024 * 1024,
+}
+
+# Дати зберігаються ISO-рядком "YYYY-MM-DD HH:MM:SS[.ffffff]": порядок рядків = хронологічний
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter("BOOLEAN", lambda value: value != b"0")
+
+# Версія схеми файлу (PRAGMA user_version): connect() виконує SCHEMA і міграції лише для файлу
+# старішої версії, інакше - одне читання заголовка. Збільшується разом зі зміною SCHEMA/FTS_TABLES.
+# DIARY_SCHEMA_FORCE=1 - як і для PostgreSQL (schema.py), виконати міграції попри версію.
+SCHEMA_VERSION = 1
+
+# Таблиці з FK (ON DELETE CASCADE, див. cascade.py); {name} - ім'я таблиці: SQLite не змінює
+# обмеження наявної таблиці, тож _migrate_foreign_keys перебудовує її під тимчасовим ім'ям
+CHILD_TABLES = {
+    "entry": """CREATE TABLE IF NOT EXISTS {name} (
+    entry_id INTEGER PRIMARY KEY,
+    title VARCHAR(50) NOT NULL CHECK (length(title) <= 50),
+    text TEXT NOT NULL,
+    user_id INTEGER NOT NULL REFERENCES "user" (id) ON DELETE CASCADE
+)""",
+    "reminder": """CREATE TABLE IF NOT EXISTS {name} (
+    reminder_id INTEGER PRIMARY KEY,
+    entry_id INTEGER NOT NULL REFERENCES entry (entry_id) ON DELETE CASCADE,
+    remind_at TIMESTAMP NOT NULL,
+    active BOOLEAN NOT NULL DEFAULT 1
+)""",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS "user" (
+    id INTEGER PRIMARY KEY,
+    username VARCHAR(50) NOT NULL UNIQUE CHECK (length(username) <= 50),
+    email VARCHAR(100) NOT NULL UNIQUE CHECK (length(email) <= 100),
+    password VARCHAR(100) NOT NULL CHECK (length(password) <= 100)
+);
+
+{entry};
+
+{reminder};
+
+CREATE TABLE IF NOT EXISTS user_stats (
+    user_id INTEGER PRIMARY KEY REFERENCES "user" (id) ON DELETE CASCADE ON UPDATE CASCADE,
+    entries_count INTEGER NOT NULL DEFAULT 0,
+    reminders_count INTEGER NOT NULL DEFAULT 0,
+    active_reminders_count INTEGER NOT NULL DEFAULT 0
+);
+
+-- Відповідники btree-індексів indexes.INDEXES (GIN по tsvector замінює FTS5, триграмних аналогів немає)
+CREATE INDEX IF NOT EXISTS ix_entry_user_id ON entry (user_id, entry_id);
+CREATE INDEX IF NOT EXISTS ix_reminder_entry_id ON reminder (entry_id);
+CREATE INDEX IF NOT EXISTS ix_reminder_remind_at ON reminder (remind_at, reminder_id);
+CREATE INDEX IF NOT EXISTS ix_reminder_active ON reminder (entry_id) WHERE active;
+
+-- --- user_stats (логіка тригерів userstats.py, але рівня рядка) ---
+CREATE TRIGGER IF NOT EXISTS trg_user_stats_entry_insert AFTER INSERT ON entry BEGIN
+    INSERT INTO user_stats (user_id, entries_count) VALUES (NEW.user_id, 1)
+    ON CONFLICT (user_id) DO UPDATE SET entries_count = entries_count + 1;
+END;
+
+-- Нагадування запису віднімаються ще до його видалення; їхній власний тригер запис уже не знайде
+CREATE TRIGGER IF NOT EXISTS trg_user_stats_entry_delete BEFORE DELETE ON entry BEGIN
+    UPDATE user_stats SET
+        entries_count = entries_count - 1,
+        reminders_count = reminders_count - (SELECT count(*) FROM reminder WHERE entry_id = OLD.entry_id),
+        active_reminders_count = active_reminders_count
+            - (SELECT count(*) FROM reminder WHERE entry_id = OLD.entry_id AND active)
+    WHERE user_id = OLD.user_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_user_stats_entry_update AFTER UPDATE OF user_id ON entry
+WHEN OLD.user_id IS NOT NEW.user_id BEGIN
+    UPDATE user_stats SET
+        entries_count = entries_count - 1,
+        reminders_count = reminders_count - (SELECT count(*) FROM reminder WHERE entry_id = NEW.entry_id),
+        active_reminders_count = active_reminders_count
+            - (SELECT count(*) FROM reminder WHERE entry_id = NEW.entry_id AND active)
+    WHERE user_id = OLD.user_id;
+    INSERT INTO user_stats (user_id, entries_count, reminders_count, active_reminders_count)
+    SELECT NEW.user_id, 1, count(*), count(*) FILTER (WHERE active) FROM reminder WHERE entry_id = NEW.entry_id
+    ON CONFLICT (user_id) DO UPDATE SET
+        entries_count = entries_count + excluded.entries_count,
+        reminders_count = reminders_count + excluded.reminders_count,
+        active_reminders_count = active_reminders_count + excluded.active_reminders_count;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_user_stats_reminder_insert AFTER INSERT ON reminder BEGIN
+    INSERT INTO user_stats (user_id, reminders_count, active_reminders_count)
+    SELECT user_id, 1, NEW.active FROM entry WHERE entry_id = NEW.entry_id
+    ON CONFLICT (user_id) DO UPDATE SET
+        reminders_count = reminders_count + 1,
+        active_reminders_count = active_reminders_count + excluded.active_reminders_count;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_user_stats_reminder_delete AFTER DELETE ON reminder BEGIN
+    UPDATE user_stats SET
+        reminders_count = reminders_count - 1,
+        active_reminders_count = active_reminders_count - OLD.active
+    WHERE user_id = (SELECT user_id FROM entry WHERE entry_id = OLD.entry_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_user_stats_reminder_update AFTER UPDATE OF entry_id, active ON reminder
+WHEN OLD.entry_id IS NOT NEW.entry_id OR OLD.active IS NOT NEW.active BEGIN
+    UPDATE user_stats SET
+        reminders_count = reminders_count - 1,
+        active_reminders_count = active_reminders_count - OLD.active
+    WHERE user_id = (SELECT user_id FROM entry WHERE entry_id = OLD.entry_id);
+    INSERT INTO user_stats (user_id, reminders_count, active_reminders_count)
+    SELECT user_id, 1, NEW.active FROM entry WHERE entry_id = NEW.entry_id
+    ON CONFLICT (user_id) DO UPDATE SET
+        reminders_count = reminders_count + 1,
+        active_reminders_count = active_reminders_count + excluded.active_reminders_count;
+END;
+""".replace("{entry}", CHILD_TABLES["entry"].format(name="entry")) \
+   .replace("{reminder}", CHILD_TABLES["reminder"].format(name="reminder"))
+
+# --- ПОВНОТЕКСТОВИЙ ПОШУК (FTS5) ---
+# мова fulltext.LANGUAGES -> (таблиця FTS5, токенізатор). Таблиці external content: текст не дублюється,
+# індекс підтримують тригери на entry. 'simple' - без стемінгу, як конфігурація PostgreSQL.
+FTS_TABLES = {
+    "simple": ("entry_fts_simple", "unicode61"),
+    "english": ("entry_fts_english", "porter unicode61"),
+}
+# Ваги bm25 для title і text (аналог ваг A і B у tsvector)
+FTS_WEIGHTS = "1.0, 0.4"
+
+
+def _fts_schema(name, tokenizer):
+    return f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5(
+            title, text, content='entry', content_rowid='entry_id', tokenize='{tokenizer}');
+        CREATE TRIGGER IF NOT EXISTS trg_{name}_insert AFTER INSERT ON entry BEGIN
+            INSERT INTO {name} (rowid, title, text) VALUES (NEW.entry_id, NEW.title, NEW.text);
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_{name}_delete AFTER DELETE ON entry BEGIN
+            INSERT INTO {name} ({name}, rowid, title, text) VALUES ('delete', OLD.entry_id, OLD.title, OLD.text);
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_{name}_update AFTER UPDATE OF entry_id, title, text ON entry BEGIN
+            INSERT INTO {name} ({name}, rowid, title, text) VALUES ('delete', OLD.entry_id, OLD.title, OLD.text);
+            INSERT INTO {name} (rowid, title, text) VALUES (NEW.entry_id, NEW.title, NEW.text);
+        END;
+    """
+
+
+def _fts_query(text):
+    """Запит у стилі websearch_to_tsquery -> вираз FTS5: слова й "фрази" через AND, OR, -слово. None - порожній."""
+    terms, excluded = [], []
+    for token in re.findall(r'-?"[^"]*"|\S+', text):
+        if token.upper() == "OR":
+            if terms and terms[-1] != "OR":
+                terms.append("OR")
+            continue
+        negative = token.startswith("-") and len(token) > 1
+        phrase = token.removeprefix("-").strip('"').replace('"', '""')
+        if phrase.strip():
+            (excluded if negative else terms).append(f'"{phrase}"')
+    if terms and terms[-1] == "OR":
+        terms.pop()
+    if not terms:
+        return None
+    match = " ".join(terms)
+    for term in excluded:
+        match = f"({match}) NOT {term}"
+    return match
+
+
+# --- МАСОВЕ ЗАВАНТАЖЕННЯ ---
+# Рядкові тригери вставки (user_stats, FTS) на мільйонах рядків коштують у рази більше за саму вставку.
+# На час пакета генерації/імпорту/add_*_bulk вони знімаються (у межах тієї ж транзакції), а для нових
+# рядків виконуються оператори BULK_REFRESH - як тригери рівня оператора в userstats.py.
+# Параметр - JSON-масив PK нових рядків.
+BULK_TRIGGERS = {
+    "entry": ["trg_user_stats_entry_insert", *(f"trg_{name}_insert" for name, _ in FTS_TABLES.values())],
+    "reminder": ["trg_user_stats_reminder_insert"],
+}
+NEW_ENTRIES = "entry_id IN (SELECT value FROM json_each(?))"
+BULK_REFRESH = {
+    "entry": [
+        f"""INSERT INTO user_stats (user_id, entries_count)
+            SELECT user_id, count(*) FROM entry WHERE {NEW_ENTRIES} GROUP BY user_id
+            ON CONFLICT (user_id) DO UPDATE SET entries_count = entries_count + excluded.entries_count""",
+        *(f"INSERT INTO {name} (rowid, title, text) SELECT entry_id, title, text FROM entry WHERE {NEW_ENTRIES}"
+          for name, _ in FTS_TABLES.values()),
+    ],
+    "reminder": [
+        """INSERT INTO user_stats (user_id, reminders_count, active_reminders_count)
+           SELECT e.user_id, count(*), count(*) FILTER (WHERE r.active)
+           FROM reminder r JOIN entry e ON e.entry_id = r.entry_id
+           WHERE r.reminder_id IN (SELECT value FROM json_each(?))
+           GROUP BY e.user_id
+           ON CONFLICT (user_id) DO UPDATE SET
+               reminders_count = reminders_count + excluded.reminders_count,
+               active_reminders_count = active_reminders_count + excluded.active_reminders_count""",
+    ],
+}
+
+# userstats.VERIFY_QUERY з FULL JOIN: SQLite не будує індекс для матеріалізованого підзапиту і порівнює
+# кожну пару рядків (квадратично). Тут те саме порівняння - через UNION ALL і одне групування.
+VERIFY_QUERY = dialect.to_sqlite(f"""
+    SELECT user_id, sum(stored_entries), sum(actual_entries), sum(stored_reminders), sum(actual_reminders),
+           sum(stored_active), sum(actual_active)
+    FROM (
+        SELECT user_id, entries_count AS stored_entries, 0 AS actual_entries,
+               reminders_count AS stored_reminders, 0 AS actual_reminders,
+               active_reminders_count AS stored_active, 0 AS actual_active
+        FROM user_stats
+        UNION ALL
+        SELECT user_id, 0, entries_count, 0, reminders_count, 0, active_reminders_count
+        FROM ({userstats.ACTUAL_QUERY})
+    )
+    GROUP BY user_id
+    HAVING sum(stored_entries) <> sum(actual_entries) OR sum(stored_reminders) <> sum(actual_reminders)
+        OR sum(stored_active) <> sum(actual_active)
+    ORDER BY 1
+    LIMIT ?
+""")
+
+# Незмінний SQL model.py (statements.STATEMENTS) у діалекті SQLite. Модуль sqlite3 сам кешує
+# підготовлені оператори з'єднання (cached_statements), тож повторний виклик не розбирає SQL знову
+STATEMENTS = {name: dialect.to_sqlite(query) for name, query in statements.STATEMENTS.items()}
+
+# таблиця -> (ім'я в SQLite, PK)
+TABLES = {table: (dialect.to_sqlite(spec.table), spec.columns[0]) for table, spec in bulk.TABLES.items()}
+
+INSERT_QUERIES = {
+    table: f"INSERT INTO {name} ({', '.join(spec.columns)}) VALUES ({', '.join(['?'] * len(spec.columns))})"
+    for (table, spec), (name, _) in zip(bulk.TABLES.items(), TABLES.values())
+}
+
+INDEX_QUERY = "SELECT name, tbl_name FROM sqlite_master WHERE type = 'index' ORDER BY tbl_name, name"
+
+# --- ВИДАЛЕННЯ З ЗАЛЕЖНИМИ РЯДКАМИ (cascade.py) ---
+# таблиця -> (дочірня таблиця, FK): звичайні delete_* перевіряють залежні, каскаду не роблять
+CHILDREN = {"user": ("entry", "user_id"), "entry": ("reminder", "entry_id")}
+# Лічильники каскаду до DELETE: (батьківських, [записів,] нагадувань). {where} посилається на параметр ?1
+CASCADE_COUNTS = {
+    "user": """
+        SELECT count(*),
+               (SELECT count(*) FROM entry WHERE user_id IN (SELECT id FROM "user" WHERE {where})),
+               (SELECT count(*) FROM reminder r JOIN entry e ON e.entry_id = r.entry_id
+                WHERE e.user_id IN (SELECT id FROM "user" WHERE {where}))
+        FROM "user" WHERE {where}
+    """,
+    "entry": """
+        SELECT count(*), (SELECT count(*) FROM reminder WHERE entry_id IN (SELECT entry_id FROM entry WHERE {where}))
+        FROM entry WHERE {where}
+    """,
+}
+AUTHOR_ENTRIES = 'user_id = (SELECT id FROM "user" WHERE username = ?1)'
+
+
+def _timestamp(value):
+    """datetime з рядка вводу (як приведення до timestamp у PostgreSQL); ValueError - невірний формат."""
+    return value if isinstance(value, datetime) else datetime.fromisoformat(str(value).strip())
+
+
+def _pretty_size(size):
+    if size is None:
+        return "-"
+    for unit in ("bytes", "kB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}"
+        size /= 1024
+
+
+class Model:
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("DIARY_SQLITE_PATH", DEFAULT_PATH)
+        self.connection = None
+        self.cursor = None
+        # Лічильники зареєстрованих запитів (як statements.py у model.py)
+        self.statement_stats = statements.StatementStats()
+
+    def connect(self):
+        try:
+            if sqlite3.sqlite_version_info < dialect.MIN_SQLITE_VERSION:
+                raise RuntimeError(f"потрібна SQLite {'.'.join(map(str, dialect.MIN_SQLITE_VERSION))}+, "
+                                   f"встановлено {sqlite3.sqlite_version}")
+            self.connection = sqlite3.connect(self.path, detect_types=sqlite3.PARSE_DECLTYPES,
+                                              cached_statements=len(STATEMENTS) + 64)
+            for name, value in PRAGMAS.items():
+                self.connection.execute(f"PRAGMA {name} = {value}")
+            self.cursor = self.connection.cursor()
+            self._prepare_schema()
+            return True
+        except Exception as e:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+            print(f"Помилка підключення: {e}")
+            return False
+
+    def _prepare_schema(self):
+        if (os.environ.get("DIARY_SCHEMA_FORCE") != "1"
+                and self.connection.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION):
+            return
+        # Усе IF NOT EXISTS; лічильники й FTS-індекси заповнюються, лише якщо їх щойно створено
+        existing = {row[0] for row in self.cursor.execute("SELECT name FROM sqlite_master")}
+        self._migrate_foreign_keys(existing)
+        self.connection.executescript(SCHEMA + "".join(_fts_schema(*spec) for spec in FTS_TABLES.values()))
+        if "user_stats" not in existing:
+            self._rebuild_user_stats()
+        for name, _ in FTS_TABLES.values():
+            if name not in existing:
+                self.cursor.execute(f"INSERT INTO {name} ({name}) VALUES ('rebuild')")
+        self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.connection.commit()
+
+    def _migrate_foreign_keys(self, existing):
+        # Файли, створені до ON DELETE CASCADE: таблиця копіюється в нову з тим самим SQL, стара видаляється.
+        # Разом зі старою зникають її індекси й тригери - їх одразу відтворює SCHEMA в _prepare_schema.
+        # rowid зберігаються, тож FTS-індекси (external content) і user_stats лишаються чинними.
+        stale = [table for table in CHILD_TABLES if table in existing and any(
+            row[6] != "CASCADE" for row in self.cursor.execute(f"PRAGMA foreign_key_list({table})"))]
+        if not stale:
+            return
+        self.connection.commit()
+        self.connection.execute("PRAGMA foreign_keys = OFF")  # діє лише поза транзакцією
+        self.connection.execute("PRAGMA legacy_alter_table = ON")  # RENAME не переписує тригери інших таблиць
+        try:
+            self.connection.execute("BEGIN IMMEDIATE")
+            for table in stale:
+                self.cursor.execute(CHILD_TABLES[table].format(name=f"{table}_migrated"))
+                self.cursor.execute(f"INSERT INTO {table}_migrated SELECT * FROM {table}")
+                self.cursor.execute(f"DROP TABLE {table}")
+                self.cursor.execute(f"ALTER TABLE {table}_migrated RENAME TO {table}")
+            self.connection.commit()
+            print(f"(FK {', '.join(stale)} перебудовано з ON DELETE CASCADE)")
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            self.connection.execute("PRAGMA legacy_alter_table = OFF")
+            self.connection.execute(f"PRAGMA foreign_keys = {PRAGMAS['foreign_keys']}")
+
+    @contextmanager
+    def _bulk_load(self, table, keys):
+        """Знімає тригери BULK_TRIGGERS[table] до кінця блоку; keys (PK вставлених рядків) заповнює викликач.
+
+        DDL у SQLite транзакційний: після помилки викликач робить rollback, і тригери повертаються разом з ним.
+        """
+        triggers = BULK_TRIGGERS.get(table)
+        if not triggers:
+            yield
+            return
+        if not self.connection.in_transaction:
+            self.connection.execute("BEGIN IMMEDIATE")
+        placeholders = ", ".join("?" * len(triggers))
+        saved = self.cursor.execute(f"SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name IN ({placeholders})",
+                                    triggers).fetchall()
+        for name in triggers:
+            self.cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        yield
+        if keys:
+            for query in BULK_REFRESH[table]:
+                self.cursor.execute(query, (json.dumps(keys),))
+        for (sql,) in saved:
+            self.cursor.execute(sql)
+
+    def disconnect(self):
+        if self.connection:
+            # Оновлює статистику планувальника для таблиць, що суттєво змінились
+            self.connection.execute("PRAGMA optimize")
+            self.cursor.close()
+            self.connection.close()
+            self.connection = None
+
+    # --- ЗАРЕЄСТРОВАНІ ЗАПИТИ ---
+    def _execute(self, name, params):
+        start = time.perf_counter()
+        try:
+            self.cursor.execute(STATEMENTS[name], params)
+        except Exception:
+            self.statement_stats.record(name, (time.perf_counter() - start) * 1000, failed=True)
+            raise
+        self.statement_stats.record(name, (time.perf_counter() - start) * 1000)
+        return self.cursor
+
+    def get_statement_stats(self):
+        """Рядки під statements.STATS_HEADERS: виклики й час кожного зареєстрованого запиту."""
+        return self.statement_stats.rows()
+
+    def get_pool_stats(self):
+        return {}  # пулу з'єднань немає - БД у тому ж процесі
+
+    # --- ЗВІТ ПО ІНДЕКСАХ ---
+    def get_index_report(self):
+        """Рядки під indexes.REPORT_HEADERS; лічильників сканувань SQLite не веде."""
+        try:
+            indexes = self.cursor.execute(INDEX_QUERY).fetchall()
+            try:
+                sizes = dict(self.cursor.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"))
+            except sqlite3.Error:  # SQLite зібрано без dbstat
+                sizes = {}
+            return [(name, table, "-", _pretty_size(sizes.get(name)), "-", "") for name, table in indexes]
+        except Exception as e:
+            return str(e)
+
+    # --- ЛІЧИЛЬНИКИ USER_STATS ---
+    def _rebuild_user_stats(self):
+        self.cursor.execute("DELETE FROM user_stats")
+        self.cursor.execute(dialect.to_sqlite(f"""
+            INSERT INTO user_stats (user_id, entries_count, reminders_count, active_reminders_count)
+            {userstats.ACTUAL_QUERY}
+        """))
+        return self.cursor.rowcount
+
+    def rebuild_user_stats(self):
+        start_time = time.time()
+        try:
+            self.connection.execute("BEGIN IMMEDIATE")  # зміни під час перерахунку не загубляться
+            count = self._rebuild_user_stats()
+            self.connection.commit()
+            return f"Лічильники перераховано для {count} користувачів за {(time.time() - start_time) * 1000:.2f} мс."
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e}"
+
+    def verify_user_stats(self, limit=100):
+        """Розбіжності user_stats з фактичними даними (порожній список - лічильники коректні)."""
+        try:
+            return self.cursor.execute(VERIFY_QUERY, (limit,)).fetchall()
+        except Exception as e:
+            return str(e)
+
+    # --- ВИВЕДЕННЯ ТОП-10 ---
+    def get_top_users(self, limit=10):
+        try:
+            return self._execute("top_users", (limit,)).fetchall()
+        except Exception as e:
+            return str(e)
+
+    def get_top_entries(self, limit=10):
+        try:
+            return self._execute("top_entries", (limit,)).fetchall()
+        except Exception as e:
+            return str(e)
+
+    def get_top_reminders(self, limit=10):
+        try:
+            return self._execute("top_reminders", (limit,)).fetchall()
+        except Exception as e:
+            return str(e)
+
+    # --- ПОСТОРІНКОВИЙ ПЕРЕГЛЯД (KEYSET) ---
+    def get_page(self, table, order="id", cursor=None, page_size=paging.DEFAULT_PAGE_SIZE):
+        """Сторінка таблиці (paging.Page). cursor - next_cursor/prev_cursor попередньої сторінки."""
+        try:
+            table, order, keys, direction, page_size = paging.resolve(table, order, cursor, page_size)
+        except paging.CursorError as e:
+            return str(e)
+        try:
+            query = dialect.to_sqlite(paging.build_page_query(table, order, keys, direction))
+            rows = self.cursor.execute(query, [*(keys or []), page_size + 1]).fetchall()
+            return paging.make_page(table, order, rows, keys, direction, page_size)
+        except Exception as e:
+            return str(e)
+
+    # --- ДОДАВАННЯ ---
+    # id=None - ID видає SQLite (MAX(id) + 1)
+    def add_user(self, user_id, username, email, password):
+        try:
+            self._execute("add_user", (user_id, username, email, password))
+            if user_id is None:
+                print(f"(Автоматично обрано ID: {self.cursor.lastrowid})")
+            self.connection.commit()
+            return "Користувача успішно додано."
+        except sqlite3.IntegrityError as e:
+            self.connection.rollback()
+            if bulk.sqlite_violation(e) == "UNIQUE":
+                return "Помилка: Такий ID, email або username вже існує."
+            return f"Помилка: {e}"
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e}"
+
+    def add_entry(self, entry_id, title, text, user_id):
+        try:
+            self._execute("add_entry", (entry_id, title, text, user_id))
+            if entry_id is None:
+                print(f"(Автоматично обрано ID: {self.cursor.lastrowid})")
+            self.connection.commit()
+            return "Запис успішно додано."
+        except sqlite3.IntegrityError as e:
+            self.connection.rollback()
+            if bulk.sqlite_violation(e) == "FOREIGN KEY":
+                return f"Помилка: User ID {user_id} не існує."
+            return f"Помилка: {e}"
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e}"
+
+    def add_reminder(self, reminder_id, entry_id, remind_at, active):
+        try:
+            self._execute("add_reminder", (reminder_id, entry_id, _timestamp(remind_at), active))
+            if reminder_id is None:
+                print(f"(Автоматично обрано ID: {self.cursor.lastrowid})")
+            self.connection.commit()
+            return "Нагадування успішно додано."
+        except sqlite3.IntegrityError as e:
+            self.connection.rollback()
+            if bulk.sqlite_violation(e) == "FOREIGN KEY":
+                return f"Помилка: Entry ID {entry_id} не існує."
+            return f"Помилка: {e}"
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e}"
+
+    # --- МАСОВЕ ДОДАВАННЯ ---
+    # Як у model.py: (повідомлення, [(номер рядка, id, помилка), ...]), кожні batch_size рядків - один commit.
+    # Рядки вставляються по одному (в одному процесі це дешево), тож помилка завжди прив'язана до рядка.
+    def add_users_bulk(self, rows, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        return self._add_bulk("user", rows, batch_size)
+
+    def add_entries_bulk(self, rows, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        return self._add_bulk("entry", rows, batch_size)
+
+    def add_reminders_bulk(self, rows, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        return self._add_bulk("reminder", rows, batch_size)
+
+    def _add_bulk(self, table, rows, batch_size):
+        start_time = time.time()
+        rows, failed = bulk.normalize(table, rows)
+        total = len(rows) + len(failed)
+        inserted = 0
+        query = dialect.to_sqlite(bulk.insert_query(table))
+        try:
+            for batch, _ in bulk.batches(rows, batch_size):
+                keys = []
+                with self._bulk_load(table, keys):
+                    for number, row in batch:
+                        try:
+                            if (key := self.cursor.execute(query, row).fetchone()) is None:
+                                failed.append((number, row[0], bulk.conflict_message(table)))
+                            else:
+                                keys.append(key[0])
+                        except sqlite3.IntegrityError as e:
+                            failed.append((number, row[0], bulk.row_error(table, row, e)))
+                self.connection.commit()
+                inserted += len(keys)
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e} (додано {inserted} з {total})", sorted(failed)
+        return bulk.result_message(table, inserted, total, len(failed), time.time() - start_time), sorted(failed)
+
+    # --- ВИДАЛЕННЯ ---
+    def _delete(self, query, params):
+        """Виконує DELETE і фіксує його, якщо щось видалено. Повертає кількість рядків."""
+        count = self.cursor.execute(query, params).rowcount
+        if count > 0:
+            self.connection.commit()
+        else:
+            self.connection.rollback()  # не тримаємо транзакцію запису відкритою
+        return count
+
+    def _begin_write(self):
+        # Записувач у SQLite один: між перевіркою і DELETE ніхто інший не змінить дані
+        if not self.connection.in_transaction:
+            self.connection.execute("BEGIN IMMEDIATE")
+
+    def _delete_restricted(self, table, where, params):
+        """DELETE без каскаду: кількість видалених рядків або None, якщо є залежні (тоді нічого не видалено)."""
+        name, pk = TABLES[table]
+        child, fk = CHILDREN[table]
+        self._begin_write()
+        query = f"SELECT EXISTS (SELECT 1 FROM {child} WHERE {fk} IN (SELECT {pk} FROM {name} WHERE {where}))"
+        if self.cursor.execute(query, params).fetchone()[0]:
+            self.connection.rollback()
+            return None
+        return self._delete(f"DELETE FROM {name} WHERE {where}", params)
+
+    def _delete_cascade(self, table, where, params):
+        """Каскад одним DELETE (ON DELETE CASCADE). Лічильники CASCADE_COUNTS - до нього, у тій самій транзакції."""
+        self._begin_write()
+        counts = self.cursor.execute(CASCADE_COUNTS[table].format(where=where), params).fetchone()
+        self._delete(f"DELETE FROM {TABLES[table][0]} WHERE {where}", params)
+        return counts
+
+    def delete_user(self, user_id):
+        try:
+            count = self._delete_restricted("user", "id = ?1", (user_id,))
+            if count:
+                return f"Користувача {user_id} видалено."
+            return "ID не знайдено." if count == 0 else "Неможливо видалити: є пов'язані записи."
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e}"
+
+    def delete_entry(self, entry_id):
+        try:
+            count = self._delete_restricted("entry", "entry_id = ?1", (entry_id,))
+            if count:
+                return f"Запис {entry_id} видалено."
+            return "ID не знайдено." if count == 0 else "Неможливо видалити: є пов'язані нагадування."
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e}"
+
+    def delete_reminder(self, reminder_id):
+        try:
+            if self._delete("DELETE FROM reminder WHERE reminder_id = ?", (reminder_id,)):
+                return f"Нагадування {reminder_id} видалено."
+            return "ID не знайдено."
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e}"
+
+    # Видалення користувача за Username або Email
+    def delete_user_by_attr(self, attr_name, value):
+        try:
+            count = self._delete_restricted("user", f"{attr_name} = ?1", (value,))
+            if count:
+                return f"Видалено користувачів: {count}."
+            if count is None:
+                return "Неможливо видалити: є пов'язані записи."
+            return f"Користувача з {attr_name}='{value}' не знайдено."
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e}"
+
+    # Видалення всіх записів певного автора (за Username)
+    def delete_entries_by_author(self, username):
+        try:
+            count = self._delete_restricted("entry", AUTHOR_ENTRIES, (username,))
+            if count:
+                return f"Видалено записів автора '{username}': {count}."
+            if count is None:
+                return "Неможливо видалити: є пов'язані нагадування."
+            return f"Записів автора '{username}' не знайдено (або автора не існує)."
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e}"
+
+    # Видалення нагадувань за датою (тільки по дню, ігноруючи час)
+    def delete_reminders_by_date(self, date_str):
+        try:
+            day = datetime.combine(date.fromisoformat(str(date_str).strip()), datetime.min.time())
+            query = "DELETE FROM reminder WHERE remind_at >= ? AND remind_at < ?"
+            if count := self._delete(query, (day, day + timedelta(days=1))):
+                return f"Видалено нагадувань за {date_str}: {count}."
+            return "Нагадувань за цю дату не знайдено."
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e}"
+
+    # --- КАСКАДНЕ ВИДАЛЕННЯ (FORCE DELETE) ---
+    def delete_user_cascade(self, user_id):
+        try:
+            users, entries, reminders = self._delete_cascade("user", "id = ?1", (user_id,))
+            if not users:
+                return "Користувача не знайдено."
+            return (f"Успішно видалено користувача {user_id} та всі його дані "
+                    f"({cascade.removed_message(entries, reminders)}).")
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка каскадного видалення: {e}"
+
+    def delete_user_cascade_by_attr(self, attr_name, value):
+        try:
+            res = self.cursor.execute(f'SELECT id FROM "user" WHERE {attr_name} = ?', (value,)).fetchone()
+            if not res:
+                return f"Користувача з {attr_name}='{value}' не знайдено."
+            return self.delete_user_cascade(res[0])
+        except Exception as e:
+            return f"Помилка каскаду: {e}"
+
+    def delete_entry_cascade(self, entry_id):
+        try:
+            entries, reminders = self._delete_cascade("entry", "entry_id = ?1", (entry_id,))
+            if not entries:
+                return "Запис не знайдено."
+            return f"Успішно видалено запис {entry_id} та його нагадування ({reminders})."
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка каскадного видалення: {e}"
+
+    def delete_entries_cascade_by_author(self, username):
+        try:
+            entries, reminders = self._delete_cascade("entry", AUTHOR_ENTRIES, (username,))
+            if entries:
+                return (f"Успішно видалено всі записи та нагадування автора '{username}' "
+                        f"({cascade.removed_message(entries, reminders)}).")
+            return f"Записів автора '{username}' не знайдено."
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e}"
+
+    def delete_reminders_by_status(self, is_active):
+        try:
+            if count := self._delete("DELETE FROM reminder WHERE active = ?", (is_active,)):
+                status_str = "активних" if is_active else "неактивних"
+                return f"Успішно видалено {count} {status_str} нагадувань."
+            return "Нагадувань з таким статусом не знайдено."
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e}"
+
+    # --- ОЧИЩЕННЯ КОНКРЕТНИХ ТАБЛИЦЬ ---
+    # Аналог TRUNCATE ... RESTART IDENTITY CASCADE: залежні таблиці очищуються першими,
+    # а в порожній таблиці INTEGER PRIMARY KEY знову видає ID з 1
+    def _clear(self, *tables):
+        for table in tables:
+            self.cursor.execute(f"DELETE FROM {TABLES[table][0]}")
+        self.connection.commit()
+
+    def clear_table_users(self):
+        try:
+            self._clear("reminder", "entry", "user")
+            return "Таблицю Users (та всі залежні дані) повністю очищено. ID скинуто."
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e}"
+
+    def clear_table_entries(self):
+        try:
+            self._clear("reminder", "entry")
+            return "Таблицю Entries (та залежні нагадування) повністю очищено. ID скинуто."
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e}"
+
+    def clear_table_reminders(self):
+        try:
+            self._clear("reminder")
+            return "Таблицю Reminders повністю очищено. ID скинуто."
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка: {e}"
+
+    # --- ПОШУК ЗА ІДЕНТИФІКАТОРОМ ---
+    def find_user_by_id(self, user_id):
+        try:
+            return self._execute("find_user", (user_id,)).fetchall()
+        except Exception as e:
+            return str(e)
+
+    def find_entry_by_id(self, entry_id):
+        try:
+            return self._execute("find_entry", (entry_id,)).fetchall()
+        except Exception as e:
+            return str(e)
+
+    def find_reminder_by_id(self, reminder_id):
+        try:
+            return self._execute("find_reminder", (reminder_id,)).fetchall()
+        except Exception as e:
+            return str(e)
+
+    # --- ГНУЧКИЙ ПОШУК ---
+    def search_flexible(self, filters):
+        start_time = time.time()
+        try:
+            filters = dict(filters)
+            for key in ("date_from", "date_to"):
+                if filters.get(key):
+                    filters[key] = _timestamp(filters[key])
+            query, params = search.build_search_query(filters)
+            results = self.cursor.execute(dialect.to_sqlite(query), params).fetchall()
+            exec_time = (time.time() - start_time) * 1000
+            return results, exec_time
+        except Exception as e:
+            return str(e), 0
+
+    # --- ПОВНОТЕКСТОВИЙ ПОШУК ---
+    def search_entries_fulltext(self, query, language=fulltext.DEFAULT_LANGUAGE, limit=10):
+        start_time = time.time()
+        try:
+            if language not in FTS_TABLES:
+                raise ValueError(f"Невідома мова пошуку '{language}'. Доступні: {', '.join(FTS_TABLES)}")
+            match = _fts_query(query)
+            if match is None:
+                return [], (time.time() - start_time) * 1000
+            fts = FTS_TABLES[language][0]
+            start, stop = fulltext.HIGHLIGHT_START, fulltext.HIGHLIGHT_STOP
+            results = self.cursor.execute(f"""
+                SELECT
+                    f.rowid,
+                    u.username,
+                    round(-bm25({fts}, {FTS_WEIGHTS}), 4),
+                    highlight({fts}, 0, '{start}', '{stop}'),
+                    snippet({fts}, 1, '{start}', '{stop}', '...', 25)
+                FROM {fts} f
+                JOIN entry e ON e.entry_id = f.rowid
+                JOIN "user" u ON u.id = e.user_id
+                WHERE {fts} MATCH ?
+                ORDER BY bm25({fts}, {FTS_WEIGHTS}), f.rowid
+                LIMIT ?
+            """, (match, limit)).fetchall()
+            exec_time = (time.time() - start_time) * 1000
+            return results, exec_time
+        except Exception as e:
+            return str(e), 0
+
+    def get_user_entries_details(self, user_id):
+        try:
+            user = self._execute("username", (user_id,)).fetchone()
+            if not user:
+                return "Користувача з таким ID не знайдено."
+            return user[0], self._execute("user_entries", (user_id,)).fetchall()
+        except Exception as e:
+            return f"Помилка: {e}", []
+
+    # --- ОТРИМАННЯ НАГАДУВАНЬ КОНКРЕТНОГО КОРИСТУВАЧА ---
+    def get_user_reminders_details(self, user_id):
+        try:
+            user = self._execute("username", (user_id,)).fetchone()
+            if not user:
+                return "Користувача з таким ID не знайдено."
+            return user[0], self._execute("user_reminders", (user_id,)).fetchall()
+        except Exception as e:
+            return f"Помилка: {e}", []
+
+    # --- ПОТОКОВЕ ЧИТАННЯ ---
+    # (username, генератор рядків): рядки читаються окремим курсором по batch_size за раз
+    def stream_user_entries_details(self, user_id, batch_size=STREAM_BATCH_SIZE):
+        return self._stream_details(user_id, STATEMENTS["user_entries"], batch_size)
+
+    def stream_user_reminders_details(self, user_id, batch_size=STREAM_BATCH_SIZE):
+        return self._stream_details(user_id, STATEMENTS["user_reminders"], batch_size)
+
+    def _stream_details(self, user_id, query, batch_size):
+        try:
+            user = self._execute("username", (user_id,)).fetchone()
+            if not user:
+                return "Користувача з таким ID не знайдено."
+            rows = self._stream(query, (user_id,), batch_size)
+            # Запит і перша порція - одразу, щоб помилка повернулась тут, а не під час читання
+            next(rows)
+            return user[0], rows
+        except Exception as e:
+            return f"Помилка: {e}", []
+
+    def _stream(self, query, params, batch_size):
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, params)
+            rows = cursor.fetchmany(batch_size)
+            yield
+            while rows:
+                yield from rows
+                rows = cursor.fetchmany(batch_size)
+        finally:
+            cursor.close()
+
+    # --- ІМПОРТ / ЕКСПОРТ (ті самі файли, що й у PostgreSQL-бекендів, див. transfer.py) ---
+    def export_data(self, directory, fmt="csv", compress=False):
+        try:
+            results = transfer.export_tables_sqlite(self.connection, directory, fmt, compress,
+                                                    progress=transfer.print_progress)
+            return transfer.summary_message("Експортовано", results) + f" Каталог: {directory}"
+        except Exception as e:
+            return f"Помилка експорту: {e}"
+
+    def import_data(self, directory, batch_size=transfer.DEFAULT_BATCH_SIZE, resume=True):
+        """Повертає (повідомлення, [(таблиця, рядок файлу, id, помилка), ...])."""
+        errors = []
+        try:
+            results = transfer.import_tables_sqlite(self.connection, directory, batch_size, resume, errors,
+                                                    progress=transfer.print_progress, bulk_load=self._bulk_load)
+            return transfer.summary_message("Імпортовано", results), errors
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка імпорту: {e} (оброблені пакети збережено, повторний імпорт продовжить з місця зупинки)", errors
+
+    # --- ГЕНЕРАЦІЯ ДАНИХ ---
+    # Ті самі пакети рядків, що й для COPY (generator.row_batches), вставляються executemany в одній
+    # транзакції. workers ігнорується: записувач у SQLite завжди один.
+    # generator.py (з NumPy) імпортується лише при генерації - решті команд він не потрібен на старті.
+    def generate_users(self, count, workers=1):
+        start_time = time.time()
+        try:
+            return self._generate("user", "користувачів", count, None, start_time)
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка генерації User: {e}"
+
+    def generate_entries(self, count, workers=1):
+        start_time = time.time()
+        try:
+            user_ids = self._parent_ids("user")
+            if user_ids is None:
+                return "Помилка: Немає користувачів! Спочатку згенеруйте Users."
+            return self._generate("entry", "записів", count, user_ids, start_time)
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка генерації Entry: {e}"
+
+    def generate_reminders(self, count, workers=1):
+        start_time = time.time()
+        try:
+            entry_ids = self._parent_ids("entry")
+            if entry_ids is None:
+                return "Помилка: Немає записів (Entries)! Спочатку згенеруйте Entries."
+            return self._generate("reminder", "нагадувань", count, entry_ids, start_time)
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка генерації Reminder: {e}"
+
+    def _parent_ids(self, table):
+        """generator.ParentIds для PK таблиці або None, якщо вона порожня (аналог generator.load_parent_ids)."""
+        import generator
+        import numpy as np
+
+        name, pk = TABLES[table]
+        count, low, high = self.cursor.execute(f"SELECT count(*), MIN({pk}), MAX({pk}) FROM {name}").fetchone()
+        if count == 0:
+            return None
+        if high - low + 1 == count:
+            return generator.ParentIds(low=low, high=high)
+        # Суцільні діапазони ID рахує SQLite (віконні функції), як і generator.load_parent_ids
+        self.cursor.execute(generator.RANGES_QUERY.format(table=name, column=pk))
+        return generator.ParentIds(ranges=np.array(self.cursor.fetchall(), dtype=np.int64))
+
+    def _generate(self, table, what, count, parents, start_time):
+        import generator
+
+        name, pk = TABLES[table]
+        # IMMEDIATE: інший процес не вставить рядки між MAX(id) і нашою вставкою
+        self.connection.execute("BEGIN IMMEDIATE")
+        start_id = self.cursor.execute(f"SELECT COALESCE(MAX({pk}), 0) + 1 FROM {name}").fetchone()[0]
+        with self._bulk_load(table, list(range(start_id, start_id + count))):
+            for rows in generator.row_batches(table, start_id, count, parents):
+                self.cursor.executemany(INSERT_QUERIES[table], rows)
+        self.connection.commit()
+        return generator.rate_message(what, count, time.time() - start_time)
+
+    # --- РЕДАГУВАННЯ (UPDATE) ---
+    def update_user(self, current_id, new_id, new_username, new_email, new_password):
+        try:
+            self._execute("update_user", (new_id, new_username, new_email, new_password, current_id))
+            self.connection.commit()
+            return "Користувача успішно оновлено."
+        except sqlite3.IntegrityError as e:
+            self.connection.rollback()
+            match bulk.sqlite_violation(e):
+                case "UNIQUE":
+                    return "Помилка: Такий ID, Username або Email вже зайняті."
+                case "FOREIGN KEY":
+                    return "Помилка: Не можна змінити ID, бо існують пов'язані записи."
+                case "CHECK":
+                    return "Помилка: Дані занадто довгі! Максимум 20 символів."
+            return f"Помилка оновлення: {e}"
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка оновлення: {e}"
+
+    def update_entry(self, current_id, new_id, new_title, new_text, new_user_id):
+        try:
+            self._execute("update_entry", (new_id, new_title, new_text, new_user_id, current_id))
+            self.connection.commit()
+            return "Запис успішно оновлено."
+        except sqlite3.IntegrityError as e:
+            self.connection.rollback()
+            match bulk.sqlite_violation(e):
+                case "FOREIGN KEY":
+                    return f"Помилка: User ID {new_user_id} не існує."
+                case "CHECK":
+                    return "Помилка: Текст або заголовок занадто довгі (макс. 20 символів)."
+            return f"Помилка оновлення: {e}"
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка оновлення: {e}"
+
+    def update_reminder(self, current_id, new_id, new_entry_id, new_date, new_active):
+        try:
+            new_date = _timestamp(new_date)
+        except ValueError:
+            return "Помилка: Невірний формат дати."
+        try:
+            self._execute("update_reminder", (new_id, new_entry_id, new_date, new_active, current_id))
+            self.connection.commit()
+            return "Нагадування успішно оновлено."
+        except sqlite3.IntegrityError as e:
+            self.connection.rollback()
+            if bulk.sqlite_violation(e) == "FOREIGN KEY":
+                return f"Помилка: Entry ID {new_entry_id} не існує."
+            return f"Помилка оновлення: {e}"
+        except Exception as e:
+            self.connection.rollback()
+            return f"Помилка оновлення: {e}"
+
+    # --- ПОВНЕ ОЧИЩЕННЯ БАЗИ ---
+    def delete_all_data(self):
+        try:
+            self._clear("reminder", "entry", "user")
+            return "Всі таблиці успішно очищено. База даних порожня."
+        except Exception as e:
+            self.connection.rollback()
+            return f"Критична помилка очищення: {e}"
@@ -0,0 +1,64 @@
+import threading
+
+# --- ШАБЛОНИ ЗАПИТІВ SQLALCHEMY (modelORM) ---
+# SQLAlchemy кешує скомпільований SQL за ключем кешу оператора, але сам оператор (select().where()...)
+# і його ключ кешу будуються наново при кожному виклику - це більша частина CPU на запит.
+# Шаблон будується один раз на варіант (набір фільтрів, таблиця й напрямок сторінки, режим читання),
+# значення передаються як bindparam() під час виконання. Ключ кешу мемоізується на об'єкті оператора,
+# тож повторне виконання шаблону одразу знаходить скомпільований SQL у кеші engine-а.
+# enabled=False (DIARY_ORM_TEMPLATES=0) будує оператор щоразу - для порівняння в benchmarks.orm_statements.
+
+class StatementTemplates:
+    """Потокобезпечне сховище побудованих операторів за ключем (ім'я, варіант)."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._templates = {}
+        self.builds = 0
+        self.reuses = 0
+
+    def get(self, key, build):
+        """Оператор для key; build() викликається лише для нового варіанту (або завжди, якщо вимкнено)."""
+        statement = self._templates.get(key) if self.enabled else None
+        if statement is not None:
+            self.reuses += 1  # без блокування: лічильник лише для статистики
+            return statement
+        statement = build()
+        with self._lock:
+            self.builds += 1
+            if self.enabled:
+                statement = self._templates.setdefault(key, statement)
+        return statement
+
+    def __len__(self):
+        return len(self._templates)
+
+
+class CompileCacheStats:
+    """Слухач before_cursor_execute: чи знайшовся скомпільований SQL оператора в кеші engine-а."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}  # engine.interfaces.CacheStats (cache_hit, cache_miss, ...) -> кількість
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        # Сирий SQL драйвера (exec_driver_sql, text()) теж проходить тут - з no_cache_key / cache_hit
+        name = context.cache_hit.name.lower() if context is not None else "no_context"
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        hits, misses = counters.get("cache_hit", 0), counters.get("cache_miss", 0)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            **{name: count for name, count in counters.items() if name not in ("cache_hit", "cache_miss")},
+        }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
@@ -0,0 +1,123 @@
+import base64
+import json
+from collections import namedtuple
+from datetime import datetime
+
+# --- KEYSET-ПАГІНАЦІЯ (SEEK) ---
+# Замість OFFSET наступна сторінка шукається від ключа останнього показаного рядка:
+# WHERE (k1, k2) > (%s, %s) ORDER BY k1, k2 LIMIT n. Кожен порядок сортування має
+# відповідний індекс, тому сторінка читається однаково швидко на будь-якій глибині.
+# Ключ межі передається викликачу у вигляді непрозорого курсора (base64 від JSON).
+
+TableSpec = namedtuple("TableSpec", "table columns headers orders")
+Page = namedtuple("Page", "rows next_cursor prev_cursor")
+
+TABLES = {
+    "user": TableSpec(
+        'public."user"', ["id", "username", "email"], ["ID", "Username", "Email"],
+        {
+            "id": ["id"],  # user_pkey
+            "username": ["username"],  # user_username_key (унікальний)
+        }),
+    "entry": TableSpec(
+        "public.entry", ["entry_id", "title", "text", "user_id"], ["ID", "Title", "Text", "User ID"],
+        {
+            "id": ["entry_id"],  # entry_pkey
+            "user": ["user_id", "entry_id"],  # ix_entry_user_id
+        }),
+    "reminder": TableSpec(
+        "public.reminder", ["reminder_id", "entry_id", "remind_at", "active"], ["ID", "Entry ID", "Date", "Active"],
+        {
+            "id": ["reminder_id"],  # reminder_pkey
+            "date": ["remind_at", "reminder_id"],  # ix_reminder_remind_at
+        }),
+}
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 1000
+
+
+class CursorError(ValueError):
+    """Некоректні аргументи get_page: курсор, таблиця, порядок або розмір сторінки."""
+
+
+def _encode_value(value):
+    return {"$dt": value.isoformat()} if isinstance(value, datetime) else value
+
+
+def _decode_value(value):
+    return datetime.fromisoformat(value["$dt"]) if isinstance(value, dict) else value
+
+
+def encode_cursor(table, order, keys, direction):
+    payload = {"t": table, "o": order, "k": [_encode_value(v) for v in keys], "d": direction}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Повертає (таблиця, порядок, ключі, напрям) з курсора."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        table, order, direction = payload["t"], payload["o"], payload["d"]
+        keys = [_decode_value(v) for v in payload["k"]]
+    except (ValueError, KeyError, TypeError) as e:
+        raise CursorError(f"Некоректний курсор сторінки: {e}")
+    if (table not in TABLES or order not in TABLES[table].orders or direction not in ("next", "prev")
+            or len(keys) != len(TABLES[table].orders[order])):
+        raise CursorError("Некоректний курсор сторінки.")
+    return table, order, keys, direction
+
+
+def resolve(table, order, cursor, page_size):
+    """Перевіряє аргументи get_page. Повертає (таблиця, порядок, ключі, напрям, розмір сторінки)."""
+    if cursor:
+        table, order, keys, direction = decode_cursor(cursor)
+    else:
+        keys, direction = None, "next"
+    if table not in TABLES:
+        raise CursorError(f"Невідома таблиця '{table}'. Доступні: {', '.join(TABLES)}")
+    if order not in TABLES[table].orders:
+        raise CursorError(f"Невідомий порядок '{order}' для {table}. Доступні: {', '.join(TABLES[table].orders)}")
+    try:
+        page_size = max(1, min(int(page_size), MAX_PAGE_SIZE))
+    except (TypeError, ValueError):
+        raise CursorError(f"Некоректний розмір сторінки '{page_size}': очікується ціле число") from None
+    return table, order, keys, direction, page_size
+
+
+def build_page_query(table, order, keys, direction):
+    """SQL сторінки; параметри: ключі..., limit (на 1 більше за розмір - щоб знати, чи є ще дані)."""
+    spec = TABLES[table]
+    key_columns = spec.orders[order]
+    sort = "DESC" if direction == "prev" else "ASC"
+    query = f"SELECT {', '.join(spec.columns)} FROM {spec.table}"
+    if keys is not None:
+        placeholders = ", ".join(["%s"] * len(keys))
+        query += f" WHERE ({', '.join(key_columns)}) {'<' if direction == 'prev' else '>'} ({placeholders})"
+    query += f" ORDER BY {', '.join(f'{c} {sort}' for c in key_columns)} LIMIT %s"
+    return query
+
+
+def make_page(table, order, rows, keys, direction, page_size):
+    """Збирає Page з рядків запиту build_page_query (або ORM-аналога)."""
+    spec = TABLES[table]
+    has_more = len(rows) > page_size
+    rows = list(rows[:page_size])
+    if direction == "prev":
+        rows.reverse()
+    if not rows:
+        return Page(rows, None, None)
+
+    positions = [spec.columns.index(c) for c in spec.orders[order]]
+
+    def cursor_at(row, to):
+        return encode_cursor(table, order, [row[i] for i in positions], to)
+
+    if direction == "next":
+        # Далі - якщо знайшовся зайвий рядок; назад - якщо ми вже не на першій сторінці
+        has_next, has_prev = has_more, keys is not None
+    else:
+        has_next, has_prev = True, has_more
+    return Page(rows,
+                cursor_at(rows[-1], "next") if has_next else None,
+                cursor_at(rows[0], "prev") if has_prev else None)
@@ -0,0 +1,93 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+# --- БЮДЖЕТ SQL-ЗАПИТІВ (modelORM) ---
+# Кількість запитів операції не повинна залежати від обсягу даних: N+1 (окремий запит на кожен
+# дочірній об'єкт) проявляється саме як перевищення сталого бюджету. query_budget() рахує оператори,
+# які SQLAlchemy надсилає через engine-и моделі (executemany - один оператор), і кидає QueryBudgetExceeded,
+# якщо їх більше за бюджет. SQL через сирий курсор psycopg (_raw_cursor: COPY, блоки ID з ids.py)
+# повз engine не проходить і не рахується.
+#   python -m benchmarks.query_budget
+
+# операція modelORM.Model -> максимум запитів за виклик
+BUDGETS = {
+    "get_top_users": 1,
+    "get_top_entries": 1,
+    "get_top_reminders": 1,
+    "get_page": 1,
+    "find_user_by_id": 1,
+    "find_entry_by_id": 1,
+    "find_reminder_by_id": 1,
+    "search_flexible": 1,
+    "search_entries_fulltext": 1,
+    "verify_user_stats": 1,
+    "get_user_entries_details": 2,
+    "get_user_reminders_details": 2,
+    "stream_user_entries_details": 2,
+    "stream_user_reminders_details": 2,
+    "update_user": 2,
+    "update_entry": 2,
+    "update_reminder": 2,
+    "delete_reminder": 2,
+    "delete_user": 3,
+    "delete_entry": 3,
+    "delete_user_cascade": 1,
+    "delete_entry_cascade": 1,
+    "delete_entries_cascade_by_author": 1,
+}
+
+# Стратегія завантаження (modelORM.LOADERS), що дає меншу кількість запитів, ніж BUDGETS
+LOADER_BUDGETS = {
+    ("get_user_entries_details", "joined"): 1,
+}
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCounter:
+    """Слухач before_cursor_execute: запам'ятовує текст кожного оператора."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+def budget_for(operation, loader=None):
+    """Бюджет операції з урахуванням стратегії завантаження; None - операцію не обмежено."""
+    return LOADER_BUDGETS.get((operation, loader), BUDGETS.get(operation))
+
+
+def model_engines(model):
+    """Engine-и моделі modelORM, через які йдуть її запити (read_engine - лише в режимі сесій operation)."""
+    return [e for e in (model.engine, model.read_engine) if e is not None]
+
+
+@contextmanager
+def count_queries(*engines):
+    counter = QueryCounter()
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", counter)
+
+
+@contextmanager
+def query_budget(engines, budget, operation="операція"):
+    """Кидає QueryBudgetExceeded, якщо блок виконав більше budget запитів через engines (див. model_engines())."""
+    with count_queries(*engines) as counter:
+        yield counter
+    if counter.count > budget:
+        statements = "\n".join(f"  {i}. {' '.join(s.split())[:200]}" for i, s in enumerate(counter.statements, 1))
+        raise QueryBudgetExceeded(f"{operation}: {counter.count} запитів при бюджеті {budget}:\n{statements}")
@@ -0,0 +1,172 @@
+import csv
+import itertools
+import os
+import shutil
+import subprocess
+import sys
+from datetime import datetime
+
+# --- ВИВЕДЕННЯ ТАБЛИЦЬ ---
+# Ширини стовпців рахуються за першими sample_size рядками, форматер кожного стовпця
+# обирається один раз за типом значення, а рядки пишуться у потік блоками по chunk_rows
+# одним write() замість print() на кожен рядок.
+# Якщо вивід не в термінал (pipe, файл) - замість вирівняної таблиці пишеться TSV або CSV.
+#
+# Режим і пейджер можна задати змінними оточення:
+#   DIARY_OUTPUT=table|tsv|csv   (за замовчуванням: table у терміналі, tsv інакше)
+#   DIARY_PAGER=1                (довгі таблиці в терміналі відкриваються через $PAGER / less)
+
+MODES = ("table", "tsv", "csv")
+SAMPLE_SIZE = 200
+CHUNK_ROWS = 1000
+MAX_WIDTH = 40
+MIN_WIDTH = 4
+
+
+def _format_datetime(value):
+    # Мікросекунди відкидаються (YYYY-MM-DD HH:MM:SS); isoformat швидший за strftime
+    return value.isoformat(" ", "seconds") if type(value) is datetime else str(value)
+
+
+def _format_str(value):
+    return value if type(value) is str else str(value)
+
+
+# тип першого значення стовпця -> форматер (інші типи форматер зводить до str)
+FORMATTERS = {
+    datetime: _format_datetime,
+    str: _format_str,
+}
+
+
+def _tsv_cell(text):
+    if "\t" in text or "\n" in text:
+        return text.replace("\t", " ").replace("\n", " ")
+    return text
+
+
+class Renderer:
+    def __init__(self, out=None, mode=None, pager=None, sample_size=SAMPLE_SIZE, chunk_rows=CHUNK_ROWS,
+                 max_width=MAX_WIDTH):
+        self.out = out
+        self.mode = mode or os.environ.get("DIARY_OUTPUT")
+        self.pager = os.environ.get("DIARY_PAGER") == "1" if pager is None else pager
+        self.sample_size = sample_size
+        self.chunk_rows = chunk_rows
+        self.max_width = max_width
+
+    def _stream(self):
+        return self.out or sys.stdout
+
+    def _is_tty(self):
+        isatty = getattr(self._stream(), "isatty", None)
+        return bool(isatty and isatty())
+
+    def resolve_mode(self):
+        if self.mode in MODES:
+            return self.mode
+        return "table" if self._is_tty() else "tsv"
+
+    def render(self, headers, rows):
+        """Виводить rows (список або ітератор кортежів). Повертає кількість виведених рядків."""
+        rows = iter(rows)
+        sample = list(itertools.islice(rows, self.sample_size))
+        formatters = self._formatters(sample)
+        mode = self.resolve_mode()
+
+        if mode == "table" and self.pager and self._is_tty() and not self._fits_screen(sample):
+            return self._render_paged(headers, sample, rows, formatters)
+        return self._render_to(self._stream(), mode, headers, itertools.chain(sample, rows), sample, formatters)
+
+    # --- ПІДГОТОВКА ---
+    def _formatters(self, sample):
+        if not sample:
+            return []
+        formatters = []
+        for column in range(len(sample[0])):
+            value = next((row[column] for row in sample if row[column] is not None), None)
+            formatters.append(FORMATTERS.get(type(value), str))
+        return formatters
+
+    def _widths(self, headers, sample, formatters):
+        widths = [len(str(h)) for h in headers]
+        for row in sample:
+            for i, (fmt, value) in enumerate(zip(formatters, row)):
+                widths[i] = max(widths[i], len(fmt(value)))
+        return [max(MIN_WIDTH, min(w, self.max_width)) for w in widths]
+
+    def _fits_screen(self, sample):
+        # Пейджер потрібен лише якщо таблиця не вміщується в екран (+4 рядки рамки)
+        return len(sample) < self.sample_size and len(sample) + 4 <= shutil.get_terminal_size().lines
+
+    # --- ЗАПИС ---
+    def _render_to(self, stream, mode, headers, rows, sample, formatters):
+        if mode == "csv":
+            return self._write_csv(stream, headers, rows, formatters)
+        if mode == "tsv":
+            return self._write_lines(stream, "\t".join(map(str, headers)), None, rows, self._tsv_line(formatters))
+        widths = self._widths(headers, sample, formatters)
+        header = " | ".join(str(h).ljust(w)[:w] for h, w in zip(headers, widths))
+        return self._write_lines(stream, header, "-" * len(header), rows, self._table_line(formatters, widths))
+
+    def _table_line(self, formatters, widths):
+        cells = list(zip(formatters, widths))
+
+        def line(row):
+            parts = []
+            for (fmt, width), value in zip(cells, row):
+                text = fmt(value)
+                parts.append(text.ljust(width) if len(text) <= width else text[:width - 1] + "…")
+            return " | ".join(parts)
+        return line
+
+    def _tsv_line(self, formatters):
+        def line(row):
+            return "\t".join([_tsv_cell(fmt(value)) for fmt, value in zip(formatters, row)])
+        return line
+
+    def _write_lines(self, stream, header, divider, rows, line):
+        top = [divider, header, divider] if divider else [header]
+        stream.write("\n".join(top) + "\n")
+        count = 0
+        while True:
+            chunk = [line(row) for row in itertools.islice(rows, self.chunk_rows)]
+            if not chunk:
+                break
+            count += len(chunk)
+            stream.write("\n".join(chunk) + "\n")
+            stream.flush()
+        if divider:
+            stream.write(divider + "\n")
+        stream.flush()
+        return count
+
+    def _write_csv(self, stream, headers, rows, formatters):
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(headers)
+        count = 0
+        while True:
+            chunk = [[fmt(value) for fmt, value in zip(formatters, row)] for row in itertools.islice(rows, self.chunk_rows)]
+            if not chunk:
+                break
+            count += len(chunk)
+            writer.writerows(chunk)
+            stream.flush()
+        return count
+
+    def _render_paged(self, headers, sample, rows, formatters):
+        command = os.environ.get("PAGER") or ("more" if sys.platform == "win32" else "less -S")
+        if not shutil.which(command.split()[0]):
+            return self._render_to(self._stream(), "table", headers, itertools.chain(sample, rows), sample, formatters)
+        pager = subprocess.Popen(command, shell=True, stdin=subprocess.PIPE, text=True, encoding="utf-8")
+        try:
+            return self._render_to(pager.stdin, "table", headers, itertools.chain(sample, rows), sample, formatters)
+        except (BrokenPipeError, OSError):
+            # Користувач закрив пейджер до кінця виводу
+            return 0
+        finally:
+            try:
+                pager.stdin.close()
+            except OSError:
+                pass
+            pager.wait()
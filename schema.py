@@ -0,0 +1,114 @@
+import os
+
+from psycopg import errors
+
+import cascade
+import fulltext
+import ids
+import indexes
+import userstats
+
+# --- ВЕРСІЇ СХЕМИ (PostgreSQL) ---
+# Міграції connect() (create_all у modelORM, послідовності ids.py, стовпці tsvector, user_stats,
+# каскадні FK, індекси) ідемпотентні, але кожна перевіряє каталог окремими запитами, а indexes.py ще й
+# відкриває окреме з'єднання. Тому кожен модуль міграції має власну SCHEMA_VERSION (збільшується разом
+# зі зміною його DDL), а public.schema_version зберігає встановлену версію кожного модуля.
+# На connect() - один SELECT: версії модулів і перевірки каталогу INTACT (індекси indexes.INDEXES на місці
+# й валідні, тригери user_stats не видалено). Виконуються лише міграції модулів, версія яких застаріла
+# або об'єкти яких пошкоджено - напр. індекс видалили чи він лишився INVALID після перерваної побудови.
+#   DIARY_SCHEMA_FORCE=1 - виконати всі міграції попри версії
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS public.schema_version (
+        module text PRIMARY KEY,
+        version integer NOT NULL,
+        installed_at timestamptz NOT NULL DEFAULT now()
+    )
+"""
+
+RECORD = """
+    INSERT INTO public.schema_version (module, version) VALUES (%s, %s)
+    ON CONFLICT (module) DO UPDATE SET version = EXCLUDED.version, installed_at = now()
+"""
+
+
+def _in_transaction(install):
+    """Міграція install(cursor) однією транзакцією."""
+    def migrate(conn, conn_info):
+        with conn.cursor() as cur:
+            install(cur)
+        conn.commit()
+    return migrate
+
+
+def _install_cascade(conn, conn_info):
+    _in_transaction(cascade.install)(conn, conn_info)
+    # VALIDATE - окремою транзакцією, вже без блокування, взятого ADD CONSTRAINT
+    with conn.cursor() as cur:
+        for problem in cascade.validate(cur):
+            print(f"({problem})")
+    conn.commit()
+
+
+def _install_indexes(conn, conn_info):
+    # Відсутні індекси будуються CONCURRENTLY через окреме з'єднання
+    if message := indexes.index_message(*indexes.ensure_indexes(conn_info)):
+        print(f"({message})")
+
+
+# (модуль, версія, міграція(conn, conn_info)) - у порядку виконання
+MIGRATIONS = [
+    ("ids", ids.SCHEMA_VERSION, _in_transaction(ids.install_sequences)),
+    ("fulltext", fulltext.SCHEMA_VERSION, _in_transaction(fulltext.install_columns)),
+    ("userstats", userstats.SCHEMA_VERSION, _in_transaction(userstats.install)),
+    ("cascade", cascade.SCHEMA_VERSION, _install_cascade),
+    ("indexes", indexes.SCHEMA_VERSION, _install_indexes),
+]
+
+# модуль -> скалярний SELECT: чи об'єкти модуля на місці
+INTACT = {
+    "indexes": indexes.INTACT_QUERY,
+    "userstats": userstats.INTACT_QUERY,
+}
+
+STATE_QUERY = "SELECT (SELECT coalesce(json_object_agg(module, version), '{}') FROM public.schema_version)" + \
+    "".join(f", ({query})" for query in INTACT.values())
+
+
+def stale(conn, migrations=MIGRATIONS):
+    """Модулі з migrations, які треба мігрувати. Поза транзакцією, без BEGIN/COMMIT."""
+    autocommit, conn.autocommit = conn.autocommit, True
+    try:
+        with conn.cursor() as cur:
+            cur.execute(STATE_QUERY)
+            versions, *intact = cur.fetchone()
+    except errors.UndefinedTable:
+        # Версії ще не записувались - нова БД або схема до появи schema.py
+        return [module for module, _, _ in migrations]
+    finally:
+        conn.autocommit = autocommit
+    intact = dict(zip(INTACT, intact))
+    return [module for module, version, _ in migrations
+            if versions.get(module, 0) < version or not intact.get(module, True)]
+
+
+def record(conn, module, version):
+    with conn.cursor() as cur:
+        cur.execute(CREATE_TABLE)
+        cur.execute(RECORD, (module, version))
+    conn.commit()
+
+
+def ensure(conn, conn_info, migrations=(), force=None):
+    """Виконує застарілі міграції: migrations бекенду (напр. create_all), потім спільні MIGRATIONS.
+    conn - з'єднання psycopg поза транзакцією. Повертає список виконаних модулів."""
+    migrations = [*migrations, *MIGRATIONS]
+    if force is None:
+        force = os.environ.get("DIARY_SCHEMA_FORCE") == "1"
+    pending = [module for module, _, _ in migrations] if force else stale(conn, migrations)
+    for module, version, migrate in migrations:
+        if module in pending:
+            migrate(conn, conn_info)
+            # Версія записується лише після успішної міграції: невдала повториться на наступному connect()
+            record(conn, module, version)
+    return pending
@@ -0,0 +1,92 @@
+# --- ГНУЧКИЙ ПОШУК: СПОЧАТКУ АГРЕГАЦІЯ, ПОТІМ JOIN ---
+# Старий запит з'єднував user -> entry -> reminder і лише потім рахував COUNT(DISTINCT ...),
+# тобто сортував усі рядки з'єднання кожного користувача. Тут нагадування спершу
+# групуються по записах, записи - по користувачах, і до таблиці user приєднується
+# вже по одному рядку лічильників на користувача. Результат той самий, що й раніше:
+#   - є фільтр нагадувань: враховуються лише записи, що мають відповідні нагадування;
+#   - є лише фільтр записів: записи за фільтром і всі їхні нагадування;
+#   - фільтрів записів/нагадувань немає: усі користувачі, навіть без записів (0, 0);
+#     лічильники тоді беруться з public.user_stats, яку підтримують тригери (userstats.py).
+
+USER_FILTERS = {"username": "username", "email": "email"}
+ENTRY_FILTERS = {"title": "title", "text": "text"}
+
+
+def _ilike(filters, columns, alias):
+    conditions, params = [], []
+    for key, column in columns.items():
+        if filters.get(key):
+            conditions.append(f"{alias}.{column} ILIKE %s")
+            params.append(f"%{filters[key]}%")
+    return conditions, params
+
+
+def _reminder_filters(filters):
+    conditions, params = [], []
+    if filters.get('is_active') is not None:
+        conditions.append("r.active = %s")
+        params.append(filters['is_active'])
+    if filters.get('date_from') and filters.get('date_to'):
+        conditions.append("r.remind_at BETWEEN %s AND %s")
+        params.extend([filters['date_from'], filters['date_to']])
+    return conditions, params
+
+
+def _where(conditions):
+    return f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+
+def build_search_query(filters):
+    """Повертає (SQL, параметри) для search_flexible; стовпці: id, username, email, entries, reminders."""
+    user_cond, user_params = _ilike(filters, USER_FILTERS, "u")
+    entry_cond, entry_params = _ilike(filters, ENTRY_FILTERS, "e")
+    reminder_cond, reminder_params = _reminder_filters(filters)
+
+    if not entry_cond and not reminder_cond:
+        # Усі користувачі з повними лічильниками - готові значення з user_stats (див. userstats.py)
+        return f"""
+            SELECT
+                u.id,
+                u.username,
+                u.email,
+                COALESCE(s.entries_count, 0) AS entries_count,
+                COALESCE(s.reminders_count, 0) AS reminders_count
+            FROM public."user" u
+            LEFT JOIN public.user_stats s ON s.user_id = u.id
+            {_where(user_cond)}
+            ORDER BY u.id
+        """, user_params
+
+    if user_cond:
+        # Вибіркові фільтри користувача обмежують і агрегацію записів (індекс ix_entry_user_id)
+        entry_cond.append(f'e.user_id IN (SELECT u.id FROM public."user" u {_where(user_cond)})')
+        entry_params.extend(user_params)
+
+    # Без фільтра нагадувань записи без нагадувань теж рахуються (з лічильником 0)
+    reminder_join = "JOIN" if reminder_cond else "LEFT JOIN"
+
+    query = f"""
+        WITH entry_stats AS (
+            SELECT e.entry_id, e.user_id, COUNT(r.reminder_id) AS reminders
+            FROM public.entry e
+            {reminder_join} public.reminder r ON r.entry_id = e.entry_id
+            {_where(entry_cond + reminder_cond)}
+            GROUP BY e.entry_id
+        ),
+        stats AS (
+            SELECT user_id, COUNT(*) AS entries_count, SUM(reminders)::bigint AS reminders_count
+            FROM entry_stats
+            GROUP BY user_id
+        )
+        SELECT
+            u.id,
+            u.username,
+            u.email,
+            s.entries_count,
+            s.reminders_count
+        FROM public."user" u
+        JOIN stats s ON s.user_id = u.id
+        {_where(user_cond)}
+        ORDER BY u.id
+    """
+    return query, entry_params + reminder_params + user_params
@@ -0,0 +1,99 @@
+import threading
+import time
+
+import cascade
+
+# --- ПІДГОТОВЛЕНІ ЗАПИТИ (PREPARED STATEMENTS) ---
+# Незмінний SQL model.py зареєстровано тут за іменем. execute() виконує його з prepare=True:
+# psycopg робить PREPARE на першому виклику в кожному з'єднанні, а далі надсилає лише
+# ім'я оператора й параметри - сервер не розбирає і не планує запит заново.
+# Після перепідключення (нове з'єднання, нове з'єднання з пулу) запити готуються повторно
+# автоматично, а лічильники живуть у StatementStats і переживають перепідключення.
+#
+# configure() вимикає автоматичну підготовку для решти (динамічного) SQL - search_flexible,
+# get_page тощо, - щоб разові запити не витісняли зареєстровані з кешу з'єднання.
+
+STATEMENTS = {
+    # ТОП-10
+    "top_users": 'SELECT id, username, email FROM public."user" ORDER BY id LIMIT %s',
+    "top_entries": "SELECT entry_id, title, text, user_id FROM public.entry ORDER BY entry_id LIMIT %s",
+    "top_reminders": "SELECT reminder_id, entry_id, remind_at, active FROM public.reminder ORDER BY reminder_id LIMIT %s",
+    # Пошук за ID
+    "find_user": 'SELECT id, username, email, password FROM public."user" WHERE id = %s',
+    "find_entry": "SELECT entry_id, title, text, user_id FROM public.entry WHERE entry_id = %s",
+    "find_reminder": "SELECT reminder_id, entry_id, remind_at, active FROM public.reminder WHERE reminder_id = %s",
+    "username": 'SELECT username FROM public."user" WHERE id = %s',
+    "user_entries": "SELECT entry_id, title, text FROM public.entry WHERE user_id = %s ORDER BY entry_id",
+    "user_reminders": """
+        SELECT r.reminder_id, e.title, r.remind_at, r.active
+        FROM public.reminder r
+        JOIN public.entry e ON r.entry_id = e.entry_id
+        WHERE e.user_id = %s
+        ORDER BY r.remind_at
+    """,
+    # Додавання
+    "add_user": 'INSERT INTO public."user" (id, username, email, password) VALUES (%s, %s, %s, %s)',
+    "add_entry": "INSERT INTO public.entry (entry_id, title, text, user_id) VALUES (%s, %s, %s, %s)",
+    "add_reminder": "INSERT INTO public.reminder (reminder_id, entry_id, remind_at, active) VALUES (%s, %s, %s, %s)",
+    # Каскадне видалення (cascade.py)
+    "delete_user_cascade": cascade.DELETE_USERS.format(where="id = %s"),
+    "delete_entry_cascade": cascade.DELETE_ENTRIES.format(where="entry_id = %s"),
+    "delete_entries_cascade_by_author": cascade.DELETE_ENTRIES.format(
+        where='user_id = (SELECT id FROM public."user" WHERE username = %s)'),
+    # Редагування
+    "update_user": 'UPDATE public."user" SET id = %s, username = %s, email = %s, password = %s WHERE id = %s',
+    "update_entry": "UPDATE public.entry SET entry_id = %s, title = %s, text = %s, user_id = %s WHERE entry_id = %s",
+    "update_reminder": """
+        UPDATE public.reminder SET reminder_id = %s, entry_id = %s, remind_at = %s, active = %s
+        WHERE reminder_id = %s
+    """,
+}
+
+STATS_HEADERS = ["Statement", "Calls", "Errors", "Total, ms", "Avg, ms", "Max, ms"]
+
+
+def configure(conn):
+    """Налаштування з'єднання: готуються лише зареєстровані запити (підходить як configure= для пулу)."""
+    conn.prepare_threshold = None
+    # Кеш підготовлених запитів з'єднання вміщує всі зареєстровані
+    conn.prepared_max = max(conn.prepared_max, len(STATEMENTS))
+
+
+class StatementStats:
+    """Потокобезпечні лічильники викликів і часу виконання для кожного зареєстрованого запиту."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}  # ім'я -> [виклики, помилки, сумарно мс, максимум мс]
+
+    def record(self, name, elapsed_ms, failed=False):
+        with self._lock:
+            c = self._counters.setdefault(name, [0, 0, 0.0, 0.0])
+            c[0] += 1
+            c[1] += failed
+            c[2] += elapsed_ms
+            c[3] = max(c[3], elapsed_ms)
+
+    def rows(self):
+        """Рядки під STATS_HEADERS, від найдорожчого за сумарним часом."""
+        with self._lock:
+            items = [(name, *c) for name, c in self._counters.items()]
+        items.sort(key=lambda item: item[3], reverse=True)
+        return [(name, calls, failed, round(total, 2), round(total / calls, 3), round(peak, 3))
+                for name, calls, failed, total, peak in items]
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+def execute(cursor, stats, name, params):
+    """Виконує зареєстрований запит name як підготовлений і записує його час у stats."""
+    start = time.perf_counter()
+    try:
+        cursor.execute(STATEMENTS[name], params, prepare=True)
+    except Exception:
+        stats.record(name, (time.perf_counter() - start) * 1000, failed=True)
+        raise
+    stats.record(name, (time.perf_counter() - start) * 1000)
+    return cursor
@@ -0,0 +1,96 @@
+import json
+import re
+import unittest
+
+import metrics
+
+SAMPLE = re.compile(r'^(?P<name>[a-z_]+)\{(?P<labels>[^}]*)\} (?P<value>\S+)$')
+HISTOGRAM_SUFFIXES = ("_bucket", "_sum", "_count")
+
+
+def parse_prometheus(text):
+    """Текст Prometheus -> ({родина: тип}, [(родина, ім'я зразка, мітки, значення)]).
+    Як строгі парсери, відхиляє зразок поза групою своєї родини і повторні HELP/TYPE."""
+    types, samples, current = {}, [], None
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            continue
+        if line.startswith("# TYPE "):
+            _, _, family, kind = line.split(" ")
+            if family in types:
+                raise ValueError(f"родина {family} оголошена двічі")
+            types[family] = kind
+            current = family
+            continue
+        match = SAMPLE.match(line)
+        if match is None:
+            raise ValueError(f"нерозібраний рядок: {line!r}")
+        name = match["name"]
+        family = name
+        if types.get(current) == "histogram" and name.endswith(HISTOGRAM_SUFFIXES):
+            family = name.rsplit("_", 1)[0]
+        if family != current:
+            raise ValueError(f"зразок {name} поза групою своєї родини (поточна {current})")
+        labels = dict(re.findall(r'(\w+)="([^"]*)"', match["labels"]))
+        samples.append((family, name, labels, float(match["value"])))
+    return types, samples
+
+
+class PrometheusExportTest(unittest.TestCase):
+    def setUp(self):
+        self.metrics = metrics.Metrics()
+        for seconds in (0.0001, 0.002, 0.002, 0.03, 1.5):
+            self.metrics.record("psycopg", "get_all_users", seconds, result=[(1,), (2,)])
+        self.metrics.record("psycopg", "add_user", 0.004, result="Помилка: зайнято")
+        self.metrics.record("sqlite", "find_entry_by_id", 100.0, result=[(1,)])  # понад останню межу
+
+    def test_families_are_contiguous(self):
+        types, samples = parse_prometheus(self.metrics.to_prometheus())
+        self.assertEqual(types, {
+            "diary_operation_calls_total": "counter",
+            "diary_operation_errors_total": "counter",
+            "diary_operation_rows_total": "counter",
+            "diary_operation_duration_seconds": "histogram",
+        })
+        self.assertEqual(len({(family, tuple(labels.items())) for family, name, labels, _ in samples
+                              if name == family}), 3 * 3)
+
+    def test_buckets_are_cumulative_and_end_at_count(self):
+        _, samples = parse_prometheus(self.metrics.to_prometheus())
+        series = {}
+        for _, name, labels, value in samples:
+            key = (labels["backend"], labels["operation"])
+            if name.endswith("_bucket"):
+                series.setdefault(key, {"buckets": []})["buckets"].append((labels["le"], value))
+            elif name.endswith("_count"):
+                series[key]["count"] = value
+        self.assertEqual(len(series), 3)
+        for key, s in series.items():
+            bounds = [le for le, _ in s["buckets"]]
+            counts = [n for _, n in s["buckets"]]
+            self.assertEqual(bounds[-1], "+Inf", key)
+            self.assertEqual([float(le) for le in bounds[:-1]], sorted(float(le) for le in bounds[:-1]), key)
+            self.assertEqual(counts, sorted(counts), key)
+            self.assertEqual(counts[-1], s["count"], key)
+        self.assertEqual(series[("psycopg", "get_all_users")]["count"], 5)
+
+    def test_json_percentiles_match_histogram(self):
+        operations = json.loads(self.metrics.to_json())["operations"]
+        histograms = {(backend, operation): h for backend, operation, *_, h in self.metrics.snapshot()}
+        self.assertEqual(len(operations), len(histograms))
+        for op in operations:
+            h = histograms[(op["backend"], op["operation"])]
+            for q in metrics.QUANTILES:
+                self.assertEqual(op["latency_ms"][f"p{round(q * 100)}"], round(h.quantile(q) * 1000, 3))
+            self.assertEqual(op["latency_ms"]["max"], round(h.max * 1000, 3))
+        errors = {(op["backend"], op["operation"]): op["errors"] for op in operations}
+        self.assertEqual(errors[("psycopg", "add_user")], 1)
+
+    def test_empty_registry_exports_headers_only(self):
+        types, samples = parse_prometheus(metrics.Metrics().to_prometheus())
+        self.assertEqual(len(types), 4)
+        self.assertEqual(samples, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
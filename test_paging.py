@@ -0,0 +1,105 @@
+import base64
+import json
+import unittest
+from datetime import datetime
+
+import paging
+
+REMINDERS = [(i, 100 + i, datetime(2026, 1, 1, 9, i), i % 2 == 0) for i in range(1, 8)]
+
+
+def forge(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+class CursorTest(unittest.TestCase):
+    def test_round_trip_keeps_datetime_keys(self):
+        keys = [datetime(2026, 1, 1, 9, 30), 42]
+        cursor = paging.encode_cursor("reminder", "date", keys, "prev")
+        self.assertEqual(paging.decode_cursor(cursor), ("reminder", "date", keys, "prev"))
+
+    def test_next_and_prev_pages(self):
+        # Перша сторінка: зайвий рядок означає, що далі є дані; назад - нікуди
+        first = paging.make_page("reminder", "id", REMINDERS[:4], None, "next", 3)
+        self.assertEqual([r[0] for r in first.rows], [1, 2, 3])
+        self.assertIsNone(first.prev_cursor)
+
+        table, order, keys, direction, size = paging.resolve("user", "id", first.next_cursor, 3)
+        self.assertEqual((table, order, keys, direction, size), ("reminder", "id", [3], "next", 3))
+        # Остання сторінка: зайвого рядка немає
+        last = paging.make_page(table, order, REMINDERS[3:6], keys, direction, size)
+        self.assertEqual([r[0] for r in last.rows], [4, 5, 6])
+        self.assertIsNone(last.next_cursor)
+
+        # Назад: запит іде за спаданням, сторінка повертається у звичайному порядку
+        _, _, keys, direction, _ = paging.resolve(None, None, last.prev_cursor, 3)
+        self.assertEqual((keys, direction), ([4], "prev"))
+        back = paging.make_page("reminder", "id", REMINDERS[2::-1], keys, direction, 3)
+        self.assertEqual([r[0] for r in back.rows], [1, 2, 3])
+        self.assertIsNone(back.prev_cursor)
+        self.assertEqual(paging.decode_cursor(back.next_cursor)[2:], ([3], "next"))
+
+    def test_composite_key_cursor(self):
+        page = paging.make_page("reminder", "date", REMINDERS[:3], None, "next", 2)
+        _, order, keys, _ = paging.decode_cursor(page.next_cursor)
+        self.assertEqual((order, keys), ("date", [REMINDERS[1][2], REMINDERS[1][0]]))
+
+    def test_query_uses_keyset_condition(self):
+        query = paging.build_page_query("reminder", "date", [datetime(2026, 1, 1), 5], "prev")
+        self.assertIn("WHERE (remind_at, reminder_id) < (%s, %s)", query)
+        self.assertIn("ORDER BY remind_at DESC, reminder_id DESC LIMIT %s", query)
+        self.assertNotIn("WHERE", paging.build_page_query("user", "id", None, "next"))
+
+    def test_empty_page(self):
+        self.assertEqual(paging.make_page("user", "id", [], None, "next", 10), paging.Page([], None, None))
+
+
+class InvalidCursorTest(unittest.TestCase):
+    def test_tampered_cursors(self):
+        valid = paging.encode_cursor("entry", "user", [1, 2], "next")
+        cursors = {
+            "not base64": "%%%",
+            "not json": base64.urlsafe_b64encode(b"{oops").decode(),
+            "truncated": valid[:-4],
+            "missing keys": forge({"t": "entry", "o": "user", "d": "next"}),
+            "foreign table": forge({"t": "audit_log", "o": "id", "k": [1], "d": "next"}),
+            "foreign order": forge({"t": "user", "o": "password", "k": [1], "d": "next"}),
+            "wrong direction": forge({"t": "user", "o": "id", "k": [1], "d": "sideways"}),
+            "wrong key count": forge({"t": "entry", "o": "user", "k": [1], "d": "next"}),
+        }
+        for name, cursor in cursors.items():
+            with self.subTest(name):
+                with self.assertRaises(paging.CursorError):
+                    paging.resolve("entry", "id", cursor, 10)
+
+    def test_cursor_overrides_table_argument(self):
+        # Курсор іншої таблиці не змішується з аргументами: таблиця й порядок беруться з курсора
+        cursor = paging.encode_cursor("user", "username", ["bob"], "next")
+        self.assertEqual(paging.resolve("reminder", "date", cursor, 10)[:2], ("user", "username"))
+
+    def test_unknown_table_and_order(self):
+        with self.assertRaisesRegex(paging.CursorError, "таблиця"):
+            paging.resolve("audit_log", "id", None, 10)
+        with self.assertRaisesRegex(paging.CursorError, "порядок"):
+            paging.resolve("user", "email", None, 10)
+
+
+class PageSizeTest(unittest.TestCase):
+    def page_size(self, value):
+        return paging.resolve("user", "id", None, value)[4]
+
+    def test_bounds(self):
+        self.assertEqual(self.page_size(0), 1)
+        self.assertEqual(self.page_size(-5), 1)
+        self.assertEqual(self.page_size("25"), 25)
+        self.assertEqual(self.page_size(paging.MAX_PAGE_SIZE + 1), paging.MAX_PAGE_SIZE)
+
+    def test_non_numeric(self):
+        for value in ("abc", "", None, "1.5"):
+            with self.subTest(value=value):
+                with self.assertRaisesRegex(paging.CursorError, "розмір сторінки"):
+                    self.page_size(value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import contextlib
+import io
+import unittest
+
+# Потрібні сервер PostgreSQL (змінні PG* або параметри controller.py), SQLAlchemy, psycopg і NumPy;
+# без них тест пропускається
+try:
+    import psycopg
+
+    from benchmarks import query_budget
+    from benchmarks.backends import make_backend, seed, throwaway_database
+    from benchmarks.common import DB_SETTINGS
+    import modelORM
+    import querybudget
+except ImportError as e:
+    SKIP_REASON = f"немає залежності: {e.name}"
+else:
+    SKIP_REASON = None
+
+SCALE = 2_000
+
+
+def _server_unavailable():
+    if SKIP_REASON:
+        return SKIP_REASON
+    settings = DB_SETTINGS
+    try:
+        psycopg.connect(f"dbname={settings['db_name']} user={settings['user']} password={settings['password']} "
+                        f"host={settings['host']} port={settings['port']} connect_timeout=3").close()
+    except psycopg.OperationalError as e:
+        return f"PostgreSQL недоступний: {str(e).strip().splitlines()[0]}"
+    return None
+
+
+class QueryBudgetTest(unittest.TestCase):
+    """Кожна операція querybudget.BUDGETS у кожному режимі читання й стратегії завантаження
+    вкладається в бюджет: N+1 у modelORM валить тест."""
+
+    @classmethod
+    def setUpClass(cls):
+        reason = _server_unavailable()
+        if reason:
+            raise unittest.SkipTest(reason)
+        cls.stack = contextlib.ExitStack()
+        settings = cls.stack.enter_context(throwaway_database(dict(DB_SETTINGS)))
+        with contextlib.redirect_stdout(io.StringIO()):
+            counts = seed(settings, SCALE, seed_value=42)
+            cls.db = make_backend("sqlalchemy", settings)
+            if not cls.db.connect():
+                cls.stack.close()
+                raise unittest.SkipTest("не вдалося підключити modelORM")
+        cls.stack.callback(cls.db.disconnect)
+        cls.variants = query_budget.variants(list(modelORM.LOADERS))
+        with psycopg.connect(cls.db.conn_info) as conn:
+            cls.targets = query_budget.pick_targets(conn, counts, len(cls.variants))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stack.close()
+
+    def test_operations_cover_budgets(self):
+        covered = {method for method, _ in query_budget.operations(self.targets, 0)}
+        self.assertEqual(set(querybudget.BUDGETS) - covered, set())
+
+    def test_operations_within_budget(self):
+        db = self.db
+        for run, (label, read_mode, loader) in enumerate(self.variants):
+            db.read_mode = read_mode
+            db.loader = loader or modelORM.DEFAULT_LOADER
+            for method, args in query_budget.operations(self.targets, run):
+                with self.subTest(mode=label, operation=method):
+                    db.session.expunge_all()
+                    budget = querybudget.budget_for(method, loader)
+                    with querybudget.query_budget(querybudget.model_engines(db), budget, method):
+                        result = query_budget.call(db, method, args, loader)
+                    message = str(result[0] if isinstance(result, tuple) else result)
+                    # Бюджет має бути виміряний на справжньому шляху, а не на помилці чи відсутньому рядку
+                    self.assertNotIn(query_budget.NOT_FOUND, message)
+                    self.assertFalse(message.startswith(("Помилка", "Критична помилка")), message)
+
+
+if __name__ == "__main__":
+    unittest.main()
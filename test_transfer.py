@@ -0,0 +1,169 @@
+import contextlib
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+import modelSQLite
+import transfer
+
+USER_COLUMNS = [("id", "integer", None, True), ("username", "character varying", 50, True),
+                ("email", "character varying", 100, True), ("password", "character varying", 100, True)]
+
+
+class TransferTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="diary_transfer_")
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        return path
+
+
+class ReadRowsTest(TransferTestCase):
+    def test_csv_columns_follow_header(self):
+        path = self.write("user.csv", "password,email,id,username\npw,a@x.io,7,alice\n")
+        self.assertEqual(list(transfer._read_rows(path, USER_COLUMNS)), [(1, ["7", "alice", "a@x.io", "pw"])])
+
+    def test_csv_wrong_field_count(self):
+        path = self.write("user.csv", "id,username,email,password\n1,alice,a@x.io\n2,bob,b@x.io,pw\n")
+        (first, error), second = transfer._read_rows(path, USER_COLUMNS)
+        self.assertEqual(first, 1)
+        self.assertIsInstance(error, ValueError)
+        self.assertEqual(second, (2, ["2", "bob", "b@x.io", "pw"]))
+
+    def test_csv_missing_column(self):
+        path = self.write("user.csv", "id,username,email\n1,alice,a@x.io\n")
+        with self.assertRaisesRegex(ValueError, "password"):
+            list(transfer._read_rows(path, USER_COLUMNS))
+
+    def test_jsonl(self):
+        path = self.write("user.jsonl", '{"id": 1, "username": "alice", "email": "a@x.io", "password": "pw"}\n'
+                                        "\n"
+                                        "{not json}\n"
+                                        '{"username": "bob", "email": "b@x.io", "password": "pw"}\n')
+        rows = list(transfer._read_rows(path, USER_COLUMNS))
+        self.assertEqual([number for number, _ in rows], [1, 3, 4])  # порожній рядок пропускається
+        self.assertEqual(rows[0][1], [1, "alice", "a@x.io", "pw"])
+        self.assertIsInstance(rows[1][1], ValueError)
+        self.assertEqual(rows[2][1], [None, "bob", "b@x.io", "pw"])
+
+
+class ValidatorTest(unittest.TestCase):
+    def setUp(self):
+        self.validate = transfer._validator([
+            ("reminder_id", "integer", None, True),
+            ("title", "character varying", 5, True),
+            ("remind_at", "timestamp without time zone", None, False),
+            ("active", "boolean", None, True),
+        ])
+
+    def test_parses_values(self):
+        self.assertEqual(self.validate(["3", "abc", "2026-01-01 09:00:00", "t"]),
+                         (3, "abc", datetime(2026, 1, 1, 9, 0), True))
+        self.assertEqual(self.validate([None, "abc", "", "No"]), (None, "abc", None, False))
+
+    def test_errors_name_the_field(self):
+        cases = {
+            ("1", "", None, "t"): "title: обов'язкове поле",
+            ("1", "abc", None, None): "active: обов'язкове поле",
+            ("1", "abcdef", None, "t"): "title: довжина 6 > 5",
+            ("1", "abc", None, "maybe"): "active: 'maybe' не є логічним значенням",
+            ("1", "abc", "завтра", "t"): "remind_at:",
+            ("x", "abc", None, "t"): "reminder_id:",
+        }
+        for values, message in cases.items():
+            with self.subTest(values=values):
+                with self.assertRaises(ValueError) as caught:
+                    self.validate(list(values))
+                self.assertTrue(str(caught.exception).startswith(message), str(caught.exception))
+
+
+class ImportSqliteTest(TransferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.model = modelSQLite.Model(os.path.join(self.directory, "diary.db"))
+        with contextlib.redirect_stdout(None):
+            self.assertTrue(self.model.connect())
+        self.addCleanup(self.model.disconnect)
+        self.conn = self.model.connection
+
+    def users_csv(self, count, extra=""):
+        lines = ["id,username,email,password"] + [f"{i},user{i},user{i}@x.io,pw" for i in range(1, count + 1)]
+        return self.write("user.csv", "\n".join(lines) + "\n" + extra)
+
+    def user_ids(self):
+        return [row[0] for row in self.conn.execute('SELECT id FROM "user" ORDER BY id')]
+
+    def import_users(self, path, batch_size=2, bulk_load=None, errors=None):
+        return transfer.import_file_sqlite(self.conn, "user", path, batch_size, resume=True, errors=errors,
+                                           bulk_load=bulk_load or self.model._bulk_load)
+
+    def failing_bulk_load(self, fail_on_call):
+        calls = []
+
+        def bulk_load(table, keys):
+            calls.append(table)
+            if len(calls) == fail_on_call:
+                raise RuntimeError("обрив імпорту")
+            return self.model._bulk_load(table, keys)
+        return bulk_load
+
+    def test_explicit_ids_then_auto_ids(self):
+        path = self.write("user.csv", "id,username,email,password\n"
+                                      ",auto1,auto1@x.io,pw\n"
+                                      "10,ten,ten@x.io,pw\n"
+                                      "3,three,three@x.io,pw\n"
+                                      "3,dup,dup@x.io,pw\n"
+                                      "4,,four@x.io,pw\n")
+        errors = []
+        result = self.import_users(path, errors=errors)
+        self.assertEqual((result.rows, result.rejected), (3, 2))
+        # Рядок без ID вставляється другим проходом - після всіх явних ID файлу
+        self.assertEqual(self.user_ids(), [3, 10, 11])
+        self.assertEqual([(line, row_id) for _, line, row_id, _ in errors], [(5, "4"), (4, 3)])
+        self.assertFalse(os.path.exists(transfer._checkpoint_path(path)))
+
+    def test_resume_after_interrupted_batch(self):
+        path = self.users_csv(5)
+        with self.assertRaisesRegex(RuntimeError, "обрив"):
+            self.import_users(path, bulk_load=self.failing_bulk_load(fail_on_call=2))
+        self.conn.rollback()
+        self.assertEqual(self.user_ids(), [1, 2])
+        checkpoint = transfer._load_checkpoint(path)
+        self.assertEqual((checkpoint["line"], checkpoint["rows"]), (2, 2))
+
+        result = self.import_users(path)
+        self.assertEqual((result.rows, result.rejected), (5, 0))
+        self.assertEqual(self.user_ids(), [1, 2, 3, 4, 5])
+        self.assertFalse(os.path.exists(transfer._checkpoint_path(path)))
+
+    def test_checkpoint_discarded_after_file_change(self):
+        path = self.users_csv(5)
+        with self.assertRaisesRegex(RuntimeError, "обрив"):
+            self.import_users(path, bulk_load=self.failing_bulk_load(fail_on_call=2))
+        self.conn.rollback()
+        self.assertIsNotNone(transfer._load_checkpoint(path))
+
+        self.users_csv(6)
+        self.assertIsNone(transfer._load_checkpoint(path))
+        # Імпорт почався спочатку: вже вставлені рядки 1-2 відхилено як конфлікти
+        result = self.import_users(path)
+        self.assertEqual((result.rows, result.rejected), (4, 2))
+        self.assertEqual(self.user_ids(), [1, 2, 3, 4, 5, 6])
+
+    def test_corrupt_checkpoint_is_ignored(self):
+        path = self.users_csv(2)
+        with open(transfer._checkpoint_path(path), "w", encoding="utf-8") as f:
+            json.dump({"file": transfer._file_stamp(path)[:1]}, f)
+        self.assertIsNone(transfer._load_checkpoint(path))
+        self.assertEqual(self.import_users(path).rows, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,537 @@
+import contextlib
+import csv
+import gzip
+import json
+import os
+import sqlite3
+import time
+from collections import namedtuple
+from datetime import datetime
+
+import bulk
+import dialect
+import ids
+
+# --- ІМПОРТ / ЕКСПОРТ ТАБЛИЦЬ (CSV / JSONL ЧЕРЕЗ COPY) ---
+# Експорт: COPY ... TO STDOUT пишеться у файл блоками, у пам'яті не тримається вся таблиця.
+# Імпорт: файл читається пакетами по batch_size рядків; кожен пакет перевіряється (кількість полів,
+# типи, довжина varchar, NOT NULL - за information_schema), через COPY потрапляє у тимчасову
+# таблицю і звідти одним INSERT ... SELECT переноситься в цільову (ON CONFLICT DO NOTHING,
+# рядки без батьківського запису відсіюються). Кожен пакет - окремий commit, після якого у
+# <файл>.checkpoint записується номер останнього обробленого рядка: перерваний імпорт
+# продовжується з цього місця. Рядки без ID обробляються другим проходом по файлу (див. import_file).
+# Таблиці обробляються в порядку залежностей FK: user -> entry -> reminder.
+# Файли: <таблиця>.csv / <таблиця>.jsonl, з суфіксом .gz - стиснені gzip.
+
+ORDER = ("user", "entry", "reminder")
+FORMATS = ("csv", "jsonl")
+DEFAULT_BATCH_SIZE = 50_000
+FLUSH_ROWS = 10_000  # рядків експорту на один запис у файл
+MAX_ERRORS = 1000  # скільки помилок рядків зберігати для звіту (решта лише рахуються)
+
+ERROR_HEADERS = ["Table", "Line", "ID", "Error"]
+
+TransferResult = namedtuple("TransferResult", "table path rows rejected seconds")
+
+TRUE_VALUES = {"t", "true", "1", "yes", "y"}
+FALSE_VALUES = {"f", "false", "0", "no", "n"}
+
+
+def file_path(directory, table, fmt="csv", compress=False):
+    return os.path.join(directory, f"{table}.{fmt}" + (".gz" if compress else ""))
+
+
+def find_file(directory, table):
+    """Файл таблиці в каталозі (будь-якого формату, стиснений чи ні) або None."""
+    for fmt in FORMATS:
+        for compress in (False, True):
+            path = file_path(directory, table, fmt, compress)
+            if os.path.exists(path):
+                return path
+    return None
+
+
+def _format_of(path):
+    name = path[:-3] if path.endswith(".gz") else path
+    fmt = name.rsplit(".", 1)[-1]
+    if fmt not in FORMATS:
+        raise ValueError(f"Невідомий формат файлу '{path}'. Підтримуються: {', '.join(FORMATS)} (+ .gz)")
+    return fmt
+
+
+def _open(path, mode, compressed=None):
+    if compressed if compressed is not None else path.endswith(".gz"):
+        return gzip.open(path, mode, encoding="utf-8", newline="") if "t" in mode else gzip.open(path, mode)
+    return open(path, mode, encoding="utf-8", newline="") if "t" in mode else open(path, mode)
+
+
+def table_files(directory):
+    """[(таблиця, файл)] для імпорту в порядку FK; ValueError, якщо в каталозі немає жодного файлу."""
+    found = [(table, find_file(directory, table)) for table in ORDER]
+    found = [(table, path) for table, path in found if path]
+    if not found:
+        raise ValueError(f"У каталозі {directory} немає файлів {', '.join(t + '.csv/.jsonl[.gz]' for t in ORDER)}")
+    return found
+
+
+def print_progress(table, done):
+    print(f"\r  ... {table}: {done}", end="", flush=True)
+
+
+# --- ЕКСПОРТ ---
+def export_table(conn, table, path, progress=None):
+    """Вивантажує таблицю у файл path (формат - за розширенням). Повертає кількість рядків.
+    Транзакцію (знімок даних) відкриває і завершує викликач - див. export_tables."""
+    fmt = _format_of(path)
+    spec = bulk.TABLES[table]
+    select = f"SELECT {', '.join(spec.columns)} FROM {spec.table} ORDER BY {spec.columns[0]}"
+    rows = 0
+    # Пишемо в тимчасовий файл: перерваний експорт не залишить обрізаного файлу
+    with conn.cursor() as cur, _open(path + ".tmp", "wb", path.endswith(".gz")) as out:
+        if fmt == "csv":
+            # Сервер надсилає кожен рядок окремим блоком COPY - пишемо їх у файл пачками
+            with cur.copy(f"COPY ({select}) TO STDOUT WITH (FORMAT csv, HEADER)") as copy:
+                blocks = iter(copy)
+                # Перший блок - рядок заголовка: пишемо одразу, щоб прогрес рахував лише рядки даних
+                header = next(blocks, None)
+                if header is not None:
+                    out.write(bytes(header))
+                buffer = []
+                for block in blocks:
+                    buffer.append(bytes(block))
+                    if len(buffer) >= FLUSH_ROWS:
+                        rows += _flush(out, buffer, b"", table, rows, progress)
+                rows += _flush(out, buffer, b"", table, rows, progress)
+            rows = cur.rowcount
+        else:
+            query = f"COPY (SELECT row_to_json(t)::text FROM ({select}) t) TO STDOUT"
+            with cur.copy(query) as copy:
+                copy.set_types(["text"])
+                buffer = []
+                for (line,) in copy.rows():
+                    buffer.append(line.encode())
+                    if len(buffer) >= FLUSH_ROWS:
+                        rows += _flush(out, buffer, b"\n", table, rows, progress)
+                rows += _flush(out, buffer, b"\n", table, rows, progress)
+    os.replace(path + ".tmp", path)
+    return rows
+
+
+def _flush(out, buffer, separator, table, done, progress):
+    count = len(buffer)
+    if count:
+        out.write(separator.join(buffer) + separator)
+        buffer.clear()
+        if progress:
+            progress(table, f"{done + count} рядків")
+    return count
+
+
+def export_tables(conn_info, directory, fmt="csv", compress=False, tables=ORDER, progress=None):
+    if fmt not in FORMATS:
+        raise ValueError(f"Невідомий формат '{fmt}'. Підтримуються: {', '.join(FORMATS)}")
+    import psycopg  # лише для PostgreSQL: *_sqlite-варіанти модуля працюють без нього
+
+    os.makedirs(directory, exist_ok=True)
+    results = []
+    with psycopg.connect(conn_info) as conn:
+        # Усі таблиці - з одного знімка: запис, доданий під час експорту, не потрапить у файл без свого
+        # користувача (чи нагадування без запису). REPEATABLE READ READ ONLY не блокує запис у таблиці.
+        conn.isolation_level = psycopg.IsolationLevel.REPEATABLE_READ
+        conn.read_only = True
+        try:
+            for table in tables:
+                start = time.perf_counter()
+                path = file_path(directory, table, fmt, compress)
+                rows = export_table(conn, table, path, progress)
+                results.append(TransferResult(table, path, rows, 0, time.perf_counter() - start))
+                if progress:
+                    print()
+        finally:
+            conn.rollback()
+    return results
+
+
+# --- ПЕРЕВІРКА РЯДКІВ ---
+def _load_columns(cur, table):
+    """[(стовпець, тип, макс. довжина, NOT NULL)] у порядку bulk.TABLES."""
+    spec = bulk.TABLES[table]
+    cur.execute("""
+        SELECT column_name, data_type, character_maximum_length, is_nullable = 'NO'
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = %s
+    """, (spec.table.split(".", 1)[1].strip('"'),))
+    info = {row[0]: row[1:] for row in cur.fetchall()}
+    missing = [c for c in spec.columns if c not in info]
+    if missing:
+        raise ValueError(f"У таблиці {spec.table} немає стовпців: {', '.join(missing)}")
+    return [(c, *info[c]) for c in spec.columns]
+
+
+def _parser(data_type, max_length):
+    if data_type in ("integer", "bigint", "smallint"):
+        return int
+    if data_type == "boolean":
+        def parse_bool(value):
+            if isinstance(value, bool):
+                return value
+            text = str(value).strip().lower()
+            if text in TRUE_VALUES:
+                return True
+            if text in FALSE_VALUES:
+                return False
+            raise ValueError(f"'{value}' не є логічним значенням")
+        return parse_bool
+    if data_type.startswith("timestamp"):
+        return lambda value: value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+
+    def parse_text(value):
+        value = str(value)
+        if max_length is not None and len(value) > max_length:
+            raise ValueError(f"довжина {len(value)} > {max_length}")
+        return value
+    return parse_text
+
+
+def _validator(columns):
+    """Функція values -> кортеж типізованих значень; кидає ValueError з описом поля."""
+    fields = [(name, _parser(data_type, max_length), not_null and i > 0)  # PK може бути порожнім
+              for i, (name, data_type, max_length, not_null) in enumerate(columns)]
+
+    def validate(values):
+        row = []
+        for (name, parse, required), value in zip(fields, values):
+            if value is None or value == "":
+                if required:
+                    raise ValueError(f"{name}: обов'язкове поле")
+                row.append(None)
+                continue
+            try:
+                row.append(parse(value))
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"{name}: {e}") from None
+        return tuple(row)
+    return validate
+
+
+def _read_rows(path, columns):
+    """Генератор (номер рядка, значення у порядку columns) з CSV/JSONL-файлу."""
+    names = [c[0] for c in columns]
+    with _open(path, "rt") as f:
+        if _format_of(path) == "csv":
+            reader = csv.reader(f)
+            header = next(reader, None) or []
+            missing = [n for n in names if n not in header]
+            if missing:
+                raise ValueError(f"У файлі {path} немає стовпців: {', '.join(missing)}")
+            positions = [header.index(n) for n in names]
+            for number, record in enumerate(reader, 1):
+                if len(record) != len(header):
+                    yield number, ValueError(f"очікується {len(header)} полів, отримано {len(record)}")
+                else:
+                    yield number, [record[p] for p in positions]
+        else:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    yield number, [record.get(n) for n in names]
+                except (ValueError, AttributeError) as e:
+                    yield number, ValueError(f"некоректний JSON: {e}")
+
+
+# --- ІМПОРТ ---
+def _checkpoint_path(path):
+    return path + ".checkpoint"
+
+
+def _file_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_size, int(stat.st_mtime)]
+
+
+def _load_checkpoint(path):
+    try:
+        with open(_checkpoint_path(path), encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Файл змінився після перерваного імпорту - починаємо спочатку
+    return state if state.get("file") == _file_stamp(path) else None
+
+
+def _save_checkpoint(path, state):
+    tmp = _checkpoint_path(path) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, _checkpoint_path(path))
+
+
+def _stage_queries(table):
+    """(створення тимчасової таблиці, COPY у неї, перенесення в цільову таблицю)."""
+    spec = bulk.TABLES[table]
+    stage = f"transfer_stage_{table}"
+    cols = ", ".join(spec.columns)
+    create = (f"CREATE TEMP TABLE IF NOT EXISTS {stage} ON COMMIT DELETE ROWS AS "
+              f"SELECT 0::bigint AS line, {cols} FROM {spec.table} WITH NO DATA")
+    copy = f"COPY {stage} (line, {cols}) FROM STDIN"
+    pk = spec.columns[0]
+    if spec.parent_column:
+        parent = f"s.{spec.parent_column}"
+        parent_ok = f"EXISTS (SELECT 1 FROM {spec.parent_table} p WHERE p.{spec.parent_pk} = s.{spec.parent_column})"
+    else:
+        parent, parent_ok = "NULL", "true"
+    # Повтори PK у межах пакета відсіюються до вставки (лишається перший за номером рядка);
+    # у відповідь - рядки, що не вставились: без батьківського запису або з конфліктом PK/UNIQUE
+    move = f"""
+        WITH candidates AS (
+            SELECT DISTINCT ON (s.{pk}) s.line, s.{pk} FROM {stage} s WHERE {parent_ok} ORDER BY s.{pk}, s.line
+        ), inserted AS (
+            INSERT INTO {spec.table} ({cols})
+            SELECT {', '.join(f's.{c}' for c in spec.columns)} FROM {stage} s JOIN candidates c ON c.line = s.line
+            ON CONFLICT DO NOTHING
+            RETURNING {pk}
+        )
+        SELECT s.line, s.{pk}, {parent_ok} AS parent_ok, {parent} AS parent
+        FROM {stage} s
+        WHERE s.line NOT IN (SELECT c.line FROM candidates c JOIN inserted i ON i.{pk} = c.{pk})
+        ORDER BY s.line
+    """
+    return create, copy, move
+
+
+def import_file(conn, table, path, batch_size=DEFAULT_BATCH_SIZE, resume=True, errors=None, progress=None):
+    """Імпортує один файл у таблицю через COPY у тимчасову таблицю. Помилки рядків дописуються в errors."""
+    allocator = ids.IdAllocator()
+    with conn.cursor() as cur:
+        columns = _load_columns(cur, table)
+        create, copy_query, move = _stage_queries(table)
+        cur.execute(create)
+
+        def insert(batch, auto):
+            if batch and auto:
+                new_ids = bulk.id_ranges_to_list(allocator.reserve(cur, table, len(batch)))
+                batch = bulk.assign_ids(batch, new_ids)
+            with cur.copy(copy_query) as copy:
+                for number, row in batch:
+                    copy.write_row((number, *row))
+            cur.execute(move)
+            failed = [(number, row_id, bulk.conflict_message(table) if parent_ok else
+                       f"{bulk.PARENT_NAMES[table]} {parent} не існує.")
+                      for number, row_id, parent_ok, parent in cur.fetchall()]
+            ids.sync_sequence(cur, table)
+            conn.commit()
+            return failed
+
+        return _import_passes(table, path, columns, insert, batch_size, resume, errors, progress)
+
+
+def _import_passes(table, path, columns, insert, batch_size, resume, errors, progress):
+    """Читає файл пакетами і передає їх insert(пакет, ID з послідовності?) -> [(номер, id, помилка)].
+
+    Файл читається двома проходами: спершу рядки з явним ID, потім (якщо такі є) рядки без ID -
+    їм видаються ID, вже більші за всі явні ID файлу. insert сам фіксує пакет (commit),
+    після чого номер рядка записується в checkpoint.
+    """
+    start = time.perf_counter()
+    errors = errors if errors is not None else []
+    state = (_load_checkpoint(path) if resume else None) or {"file": _file_stamp(path), "pass": 0, "line": 0,
+                                                             "auto": 0, "rows": 0, "rejected": 0}
+    validate = _validator(columns)
+
+    def reject(number, row_id, message):
+        state["rejected"] += 1
+        if len(errors) < MAX_ERRORS:
+            errors.append((table, number, row_id, message))
+
+    def flush(batch, last_line):
+        failed = insert(batch, state["pass"] == 1)
+        for number, row_id, message in failed:
+            reject(number, row_id, message)
+        state["rows"] += len(batch) - len(failed)
+        state["line"] = last_line
+        _save_checkpoint(path, state)
+        if progress:
+            progress(table, f"{state['rows']} рядків")
+
+    while state["pass"] < 2:
+        auto_pass = state["pass"] == 1
+        batch = []
+        number = state["line"]
+        for number, values in _read_rows(path, columns):
+            if number <= state["line"]:
+                continue  # оброблено до перерваного імпорту
+            if isinstance(values, Exception):
+                if not auto_pass:
+                    reject(number, None, str(values))
+                continue
+            if (values[0] is None or values[0] == "") != auto_pass:
+                state["auto"] += not auto_pass  # рядок без ID - у другий прохід
+                continue
+            try:
+                batch.append((number, validate(values)))
+            except ValueError as e:
+                reject(number, values[0] or None, str(e))
+            if len(batch) >= batch_size:
+                flush(batch, number)
+                batch = []
+        if batch or number > state["line"]:
+            flush(batch, number)
+        state.update({"pass": state["pass"] + (1 if state["auto"] else 2), "line": 0})
+        _save_checkpoint(path, state)
+
+    try:
+        os.remove(_checkpoint_path(path))
+    except OSError:
+        pass
+    return TransferResult(table, path, state["rows"], state["rejected"], time.perf_counter() - start)
+
+
+def import_tables(conn_info, directory, batch_size=DEFAULT_BATCH_SIZE, resume=True, errors=None, progress=None):
+    """Імпортує всі знайдені у каталозі файли таблиць у порядку FK (user -> entry -> reminder)."""
+    import psycopg
+
+    found = table_files(directory)
+    results = []
+    with psycopg.connect(conn_info) as conn:
+        for table, path in found:
+            results.append(import_file(conn, table, path, batch_size, resume, errors, progress))
+            if progress:
+                print()
+    return results
+
+
+# --- SQLITE (modelSQLite.py) ---
+# Ті самі файли, що й для PostgreSQL (CSV з HEADER, t/f для логічних значень; JSONL як row_to_json).
+# COPY немає: експорт читає курсор пакетами по FLUSH_ROWS, імпорт вставляє рядки пакета по одному
+# (в одному процесі це дешево) - конфлікт чи відсутній батьківський запис стосується лише свого рядка.
+# Типи й довжини для перевірки - з оголошених типів стовпців (PRAGMA table_info).
+SQLITE_TYPES = {"varchar": "character varying", "timestamp": "timestamp without time zone"}
+
+
+def _sqlite_columns(conn, table):
+    """Як _load_columns, але для SQLite."""
+    spec = bulk.TABLES[table]
+    info = {}
+    for _, column, declared, not_null, _, _ in conn.execute(f"PRAGMA table_info({dialect.to_sqlite(spec.table)})"):
+        base, _, size = declared.lower().partition("(")
+        info[column] = (SQLITE_TYPES.get(base, base), int(size.rstrip(")")) if size else None, bool(not_null))
+    missing = [c for c in spec.columns if c not in info]
+    if missing:
+        raise ValueError(f"У таблиці {spec.table} немає стовпців: {', '.join(missing)}")
+    return [(c, *info[c]) for c in spec.columns]
+
+
+def _csv_value(value):
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat(" ")
+    return value
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def export_table_sqlite(conn, table, path, progress=None):
+    """export_table для з'єднання sqlite3 (типи стовпців розпізнаються через PARSE_DECLTYPES)."""
+    fmt = _format_of(path)
+    spec = bulk.TABLES[table]
+    cur = conn.execute(f"SELECT {', '.join(spec.columns)} FROM {dialect.to_sqlite(spec.table)} "
+                       f"ORDER BY {spec.columns[0]}")
+    rows = 0
+    with _open(path + ".tmp", "wt", path.endswith(".gz")) as out:
+        writer = csv.writer(out, lineterminator="\n") if fmt == "csv" else None
+        if writer:
+            writer.writerow(spec.columns)
+        while batch := cur.fetchmany(FLUSH_ROWS):
+            if writer:
+                writer.writerows([_csv_value(v) for v in row] for row in batch)
+            else:
+                out.writelines(json.dumps(dict(zip(spec.columns, map(_json_value, row))),
+                                          ensure_ascii=False, separators=(",", ":")) + "\n" for row in batch)
+            rows += len(batch)
+            if progress:
+                progress(table, f"{rows} рядків")
+    os.replace(path + ".tmp", path)
+    return rows
+
+
+def export_tables_sqlite(conn, directory, fmt="csv", compress=False, tables=ORDER, progress=None):
+    if fmt not in FORMATS:
+        raise ValueError(f"Невідомий формат '{fmt}'. Підтримуються: {', '.join(FORMATS)}")
+    os.makedirs(directory, exist_ok=True)
+    results = []
+    # Як і export_tables - один знімок на всі таблиці: у WAL читальна транзакція бачить дані
+    # на момент першого SELECT і не заважає записувачам
+    began = not conn.in_transaction
+    if began:
+        conn.execute("BEGIN")
+    try:
+        for table in tables:
+            start = time.perf_counter()
+            path = file_path(directory, table, fmt, compress)
+            rows = export_table_sqlite(conn, table, path, progress)
+            results.append(TransferResult(table, path, rows, 0, time.perf_counter() - start))
+            if progress:
+                print()
+    finally:
+        if began:
+            conn.rollback()
+    return results
+
+
+def import_file_sqlite(conn, table, path, batch_size=DEFAULT_BATCH_SIZE, resume=True, errors=None, progress=None,
+                       bulk_load=None):
+    """import_file для з'єднання sqlite3. Рядкам без ID значення видає сама SQLite (MAX + 1).
+
+    bulk_load(table, keys) - необов'язковий контекст пакета (modelSQLite.Model._bulk_load), keys - PK вставлених рядків.
+    """
+    query = dialect.to_sqlite(bulk.insert_query(table))
+    cur = conn.cursor()
+
+    def insert(batch, auto):
+        failed, keys = [], []
+        with bulk_load(table, keys) if bulk_load else contextlib.nullcontext():
+            for number, row in batch:
+                try:
+                    if (key := cur.execute(query, row).fetchone()) is None:
+                        failed.append((number, row[0], bulk.conflict_message(table)))
+                    else:
+                        keys.append(key[0])
+                except sqlite3.IntegrityError as e:
+                    failed.append((number, row[0], bulk.row_error(table, row, e)))
+        conn.commit()
+        return failed
+
+    try:
+        return _import_passes(table, path, _sqlite_columns(conn, table), insert, batch_size, resume, errors,
+                              progress)
+    finally:
+        cur.close()
+
+
+def import_tables_sqlite(conn, directory, batch_size=DEFAULT_BATCH_SIZE, resume=True, errors=None, progress=None,
+                         bulk_load=None):
+    results = []
+    for table, path in table_files(directory):
+        results.append(import_file_sqlite(conn, table, path, batch_size, resume, errors, progress, bulk_load))
+        if progress:
+            print()
+    return results
+
+
+def summary_message(action, results):
+    parts = []
+    total_rows = total_seconds = 0
+    for r in results:
+        rate = r.rows / r.seconds if r.seconds > 0 else float("inf")
+        part = f"{r.table}: {r.rows} ({rate:,.0f} рядків/с)"
+        if r.rejected:
+            part += f", відхилено {r.rejected}"
+        parts.append(part)
+        total_rows += r.rows
+        total_seconds += r.seconds
+    return f"{action} {total_rows} рядків за {total_seconds:.2f} с. " + "; ".join(parts) + "."
@@ -0,0 +1,243 @@
+# --- ЛІЧИЛЬНИКИ КОРИСТУВАЧІВ (public.user_stats) ---
+# Кількість записів, нагадувань і активних нагадувань кожного користувача зберігається
+# в окремій таблиці й підтримується тригерами на public.entry і public.reminder,
+# тож статистика в search_flexible без фільтрів записів/нагадувань - одне читання на користувача.
+#
+# Вставки (у т.ч. COPY генератора) обробляються тригерами рівня оператора з transition-таблицями:
+# один UPSERT на оператор, згрупований за user_id і впорядкований - паралельні генератори
+# блокують рядки user_stats в однаковому порядку і не взаємоблокуються.
+# Видалення запису віднімає і його нагадування ще ДО видалення (BEFORE ROW): якщо нагадування
+# видаляються каскадно, їхній тригер уже не знайде запис і нічого не віднімає вдруге.
+# Зменшення - лише UPDATE (рядок для вже видаленого користувача не створюється). При каскадному
+# видаленні користувача (ON DELETE CASCADE, cascade.py) записи видаляються вже після нього, а рядок
+# user_stats - окремим каскадом: лічильники такого користувача не чіпаються, інакше повторний UPDATE
+# рядка в тій самій транзакції перевіряє FK і падає на вже видаленому користувачі.
+# TRUNCATE обнуляє відповідні лічильники.
+
+TRIGGERS = [
+    ("entry", "trg_user_stats_entry_insert"),
+    ("entry", "trg_user_stats_entry_delete"),
+    ("entry", "trg_user_stats_entry_update"),
+    ("entry", "trg_user_stats_entry_truncate"),
+    ("reminder", "trg_user_stats_reminder_insert"),
+    ("reminder", "trg_user_stats_reminder_delete"),
+    ("reminder", "trg_user_stats_reminder_update"),
+    ("reminder", "trg_user_stats_reminder_truncate"),
+]
+
+# Версія міграції install() для schema.py
+SCHEMA_VERSION = 1
+
+# Скільки тригерів із TRIGGERS на місці
+TRIGGER_COUNT_QUERY = f"""
+    SELECT count(*) FROM pg_trigger t
+    JOIN pg_class c ON c.oid = t.tgrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = 'public' AND NOT t.tgisinternal
+      AND t.tgname IN ({", ".join(f"'{name}'" for _, name in TRIGGERS)})
+"""
+
+# Скалярна перевірка для schema.py (при кожному connect(), поруч із версіями): тригери не видалено
+INTACT_QUERY = f"SELECT ({TRIGGER_COUNT_QUERY}) = {len(TRIGGERS)}"
+
+# Віднімає від лічильників (лише якщо рядок є і користувач ще існує)
+SUB_FUNCTION = """
+CREATE OR REPLACE FUNCTION public.user_stats_sub(p_user integer, p_entries bigint, p_reminders bigint, p_active bigint)
+RETURNS void LANGUAGE sql AS $$
+    UPDATE public.user_stats SET
+        entries_count = entries_count - p_entries,
+        reminders_count = reminders_count - p_reminders,
+        active_reminders_count = active_reminders_count - p_active
+    WHERE user_id = p_user AND EXISTS (SELECT 1 FROM public."user" u WHERE u.id = p_user)
+$$;
+"""
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS public.user_stats (
+    user_id integer PRIMARY KEY REFERENCES public."user" (id) ON DELETE CASCADE ON UPDATE CASCADE,
+    entries_count bigint NOT NULL DEFAULT 0,
+    reminders_count bigint NOT NULL DEFAULT 0,
+    active_reminders_count bigint NOT NULL DEFAULT 0
+);
+
+-- Додає до лічильників (створює рядок за потреби)
+CREATE OR REPLACE FUNCTION public.user_stats_add(p_user integer, p_entries bigint, p_reminders bigint, p_active bigint)
+RETURNS void LANGUAGE sql AS $$
+    INSERT INTO public.user_stats AS s (user_id, entries_count, reminders_count, active_reminders_count)
+    VALUES (p_user, p_entries, p_reminders, p_active)
+    ON CONFLICT (user_id) DO UPDATE SET
+        entries_count = s.entries_count + EXCLUDED.entries_count,
+        reminders_count = s.reminders_count + EXCLUDED.reminders_count,
+        active_reminders_count = s.active_reminders_count + EXCLUDED.active_reminders_count
+$$;
+
+{SUB_FUNCTION}
+
+-- --- public.entry ---
+CREATE OR REPLACE FUNCTION public.user_stats_entry_insert() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO public.user_stats AS s (user_id, entries_count)
+    SELECT user_id, count(*) FROM new_rows GROUP BY user_id ORDER BY user_id
+    ON CONFLICT (user_id) DO UPDATE SET entries_count = s.entries_count + EXCLUDED.entries_count;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION public.user_stats_entry_delete() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM public.user_stats_sub(OLD.user_id, 1, count(*), count(*) FILTER (WHERE active))
+    FROM public.reminder WHERE entry_id = OLD.entry_id;
+    RETURN OLD;
+END $$;
+
+CREATE OR REPLACE FUNCTION public.user_stats_entry_update() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    v_reminders bigint;
+    v_active bigint;
+BEGIN
+    SELECT count(*), count(*) FILTER (WHERE active) INTO v_reminders, v_active
+    FROM public.reminder WHERE entry_id = NEW.entry_id;
+    PERFORM public.user_stats_sub(OLD.user_id, 1, v_reminders, v_active);
+    PERFORM public.user_stats_add(NEW.user_id, 1, v_reminders, v_active);
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION public.user_stats_entry_truncate() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    -- Разом із записами (CASCADE) зникають і всі нагадування.
+    -- DELETE, а не TRUNCATE: при TRUNCATE "user" ... CASCADE user_stats уже зайнята цією ж командою
+    DELETE FROM public.user_stats;
+    RETURN NULL;
+END $$;
+
+-- --- public.reminder ---
+CREATE OR REPLACE FUNCTION public.user_stats_reminder_insert() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO public.user_stats AS s (user_id, reminders_count, active_reminders_count)
+    SELECT e.user_id, count(*), count(*) FILTER (WHERE r.active)
+    FROM new_rows r JOIN public.entry e ON e.entry_id = r.entry_id
+    GROUP BY e.user_id ORDER BY e.user_id
+    ON CONFLICT (user_id) DO UPDATE SET
+        reminders_count = s.reminders_count + EXCLUDED.reminders_count,
+        active_reminders_count = s.active_reminders_count + EXCLUDED.active_reminders_count;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION public.user_stats_reminder_delete() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    -- Нагадування записів, видалених у цьому ж операторі, вже віднято тригером entry
+    UPDATE public.user_stats s SET
+        reminders_count = s.reminders_count - d.reminders,
+        active_reminders_count = s.active_reminders_count - d.active
+    FROM (
+        SELECT e.user_id, count(*) AS reminders, count(*) FILTER (WHERE r.active) AS active
+        FROM old_rows r JOIN public.entry e ON e.entry_id = r.entry_id
+        GROUP BY e.user_id ORDER BY e.user_id
+    ) d
+    WHERE s.user_id = d.user_id;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION public.user_stats_reminder_update() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM public.user_stats_sub(e.user_id, 0, 1, OLD.active::int)
+    FROM public.entry e WHERE e.entry_id = OLD.entry_id;
+    PERFORM public.user_stats_add(e.user_id, 0, 1, NEW.active::int)
+    FROM public.entry e WHERE e.entry_id = NEW.entry_id;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION public.user_stats_reminder_truncate() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE public.user_stats SET reminders_count = 0, active_reminders_count = 0
+    WHERE reminders_count <> 0 OR active_reminders_count <> 0;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS trg_user_stats_entry_insert ON public.entry;
+CREATE TRIGGER trg_user_stats_entry_insert AFTER INSERT ON public.entry
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION public.user_stats_entry_insert();
+DROP TRIGGER IF EXISTS trg_user_stats_entry_delete ON public.entry;
+CREATE TRIGGER trg_user_stats_entry_delete BEFORE DELETE ON public.entry
+    FOR EACH ROW EXECUTE FUNCTION public.user_stats_entry_delete();
+DROP TRIGGER IF EXISTS trg_user_stats_entry_update ON public.entry;
+CREATE TRIGGER trg_user_stats_entry_update AFTER UPDATE OF user_id ON public.entry
+    FOR EACH ROW WHEN (OLD.user_id IS DISTINCT FROM NEW.user_id) EXECUTE FUNCTION public.user_stats_entry_update();
+DROP TRIGGER IF EXISTS trg_user_stats_entry_truncate ON public.entry;
+CREATE TRIGGER trg_user_stats_entry_truncate AFTER TRUNCATE ON public.entry
+    FOR EACH STATEMENT EXECUTE FUNCTION public.user_stats_entry_truncate();
+
+DROP TRIGGER IF EXISTS trg_user_stats_reminder_insert ON public.reminder;
+CREATE TRIGGER trg_user_stats_reminder_insert AFTER INSERT ON public.reminder
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION public.user_stats_reminder_insert();
+DROP TRIGGER IF EXISTS trg_user_stats_reminder_delete ON public.reminder;
+CREATE TRIGGER trg_user_stats_reminder_delete AFTER DELETE ON public.reminder
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION public.user_stats_reminder_delete();
+DROP TRIGGER IF EXISTS trg_user_stats_reminder_update ON public.reminder;
+CREATE TRIGGER trg_user_stats_reminder_update AFTER UPDATE OF entry_id, active ON public.reminder
+    FOR EACH ROW WHEN (OLD.entry_id IS DISTINCT FROM NEW.entry_id OR OLD.active IS DISTINCT FROM NEW.active)
+    EXECUTE FUNCTION public.user_stats_reminder_update();
+DROP TRIGGER IF EXISTS trg_user_stats_reminder_truncate ON public.reminder;
+CREATE TRIGGER trg_user_stats_reminder_truncate AFTER TRUNCATE ON public.reminder
+    FOR EACH STATEMENT EXECUTE FUNCTION public.user_stats_reminder_truncate();
+"""
+
+# Фактичні значення лічильників, пораховані з таблиць
+ACTUAL_QUERY = """
+    SELECT e.user_id, count(*) AS entries_count,
+           COALESCE(sum(r.reminders), 0)::bigint AS reminders_count,
+           COALESCE(sum(r.active), 0)::bigint AS active_reminders_count
+    FROM public.entry e
+    LEFT JOIN (
+        SELECT entry_id, count(*) AS reminders, count(*) FILTER (WHERE active) AS active
+        FROM public.reminder GROUP BY entry_id
+    ) r ON r.entry_id = e.entry_id
+    GROUP BY e.user_id
+"""
+
+VERIFY_HEADERS = ["User ID", "Entries (stored)", "Entries (actual)", "Reminders (stored)", "Reminders (actual)",
+                  "Active (stored)", "Active (actual)"]
+
+# Розбіжності між user_stats і фактичними значеннями (відсутній рядок = нулі)
+VERIFY_QUERY = f"""
+    SELECT COALESCE(s.user_id, a.user_id),
+           COALESCE(s.entries_count, 0), COALESCE(a.entries_count, 0),
+           COALESCE(s.reminders_count, 0), COALESCE(a.reminders_count, 0),
+           COALESCE(s.active_reminders_count, 0), COALESCE(a.active_reminders_count, 0)
+    FROM public.user_stats s
+    FULL JOIN ({ACTUAL_QUERY}) a ON a.user_id = s.user_id
+    WHERE (COALESCE(s.entries_count, 0), COALESCE(s.reminders_count, 0), COALESCE(s.active_reminders_count, 0))
+          IS DISTINCT FROM
+          (COALESCE(a.entries_count, 0), COALESCE(a.reminders_count, 0), COALESCE(a.active_reminders_count, 0))
+    ORDER BY 1
+    LIMIT %s
+"""
+
+
+def install(cursor):
+    """Міграція: таблиця, функції й тригери user_stats. Ідемпотентна; при першому встановленні заповнює таблицю."""
+    cursor.execute(TRIGGER_COUNT_QUERY)
+    if cursor.fetchone()[0] == len(TRIGGERS):
+        # Тригери вже є - оновлюється лише user_stats_sub, якщо вона ще без перевірки користувача
+        cursor.execute("SELECT prosrc FROM pg_proc WHERE oid = 'public.user_stats_sub'::regproc")
+        if 'public."user"' not in cursor.fetchone()[0]:
+            cursor.execute(SUB_FUNCTION)
+        return False
+    cursor.execute(SCHEMA)
+    rebuild(cursor)
+    return True
+
+
+def rebuild(cursor):
+    """Перераховує user_stats з нуля. Повертає кількість рядків."""
+    # Блокування на запис, щоб зміни під час перерахунку не загубилися
+    cursor.execute("LOCK TABLE public.entry, public.reminder IN SHARE MODE")
+    cursor.execute("TRUNCATE public.user_stats")
+    cursor.execute(f"""
+        INSERT INTO public.user_stats (user_id, entries_count, reminders_count, active_reminders_count)
+        {ACTUAL_QUERY}
+    """)
+    return cursor.rowcount
+
+
+def verify_query(limit=100):
+    return VERIFY_QUERY, (limit,)
@@ -1,21 +1,34 @@
+import itertools
+import os
+import sys
 from datetime import datetime
 
+import fulltext
+import paging
+import render
+import transfer
+
 
 class View:
+    def __init__(self, renderer=None):
+        # Таблиці виводить render.Renderer (ширини за вибіркою, буферизований запис, TSV/CSV поза терміналом)
+        self.renderer = renderer or render.Renderer()
+
     # --- ГОЛОВНІ МЕНЮ ---
     def show_main_menu(self):
         print("\n" + "=" * 30)
         print(" Г О Л О В Н Е   М Е Н Ю ")
         print("=" * 30)
-        print("1. Виведення таблиці (TOP-10)")
+        print("1. Перегляд таблиці (посторінково)")
         print("2. Додавання даних")
         print("3. Видалення даних")
         print("4. Редагування даних")
         print("5. Пошук (Гнучкий, ID, Записи)")
         print("6. Генерація даних (Random)")
         print("7. Очистити всю базу [DANGER]")
-        print("8. Вихід")
-        return input("Оберіть дію (1-8): ")
+        print("8. Обслуговування БД (індекси, кеш, імпорт/експорт, метрики)")
+        print("9. Вихід")
+        return input("Оберіть дію (1-9): ")
 
     def get_global_purge_confirmation(self):
         print("\nНЕБЕЗПЕЧНА ЗОНА")
@@ -44,6 +57,21 @@ class View:
         print("2. Пошук за ID")
         print("3. Показати всі записи користувача (за ID)")
         print("4. Показати всі нагадування користувача")
+        print("5. Повнотекстовий пошук по записах")
+        print("0. Назад")
+        return input("Ваш вибір: ")
+
+    def show_service_menu(self):
+        print("\n--- ОБСЛУГОВУВАННЯ БД ---")
+        print("1. Звіт по індексах (сканування, розмір, невикористані)")
+        print("2. Перевірити лічильники user_stats")
+        print("3. Перерахувати лічильники user_stats")
+        print("4. Статистика кешу (hits / misses / evictions)")
+        print("5. Статистика підготовлених запитів (виклики, час)")
+        print("6. Експорт таблиць у CSV / JSONL")
+        print("7. Імпорт таблиць з CSV / JSONL")
+        print("8. Метрики операцій (виклики, помилки, p50/p95/p99)")
+        print("9. Експорт метрик у файл (JSON / Prometheus)")
         print("0. Назад")
         return input("Ваш вибір: ")
 
@@ -51,41 +79,57 @@ class View:
     def show_message(self, message):
         print(f"\n>>> {message}")
 
-    def print_table(self, headers, rows):
-        if not rows:
-            print("\nТаблиця порожня або даних немає.")
-            return
+    def print_table(self, headers, rows, empty_message="Таблиця порожня або даних немає."):
+        """rows - список або будь-який ітератор (напр. генератор stream_*): рядки друкуються в міру надходження."""
         if isinstance(rows, str):  # Якщо це текст помилки
             print(f"\nПОМИЛКА: {rows}")
             return
 
-        col_width = 22
-        header_row = " | ".join([f"{h:<{col_width}}" for h in headers])
-        div_line = "-" * len(header_row)
-
-        print(div_line)
-        print(header_row)
-        print(div_line)
-
-        for row in rows:
-            formatted_row = []
-            for item in row:
-                # --- ВИПРАВЛЕННЯ ФОРМАТУВАННЯ ДАТИ ---
-                if isinstance(item, datetime):
-                    # Обрізаємо мікросекунди, залишаємо YYYY-MM-DD HH:MM:SS
-                    formatted_row.append(item.strftime("%Y-%m-%d %H:%M:%S"))
-                else:
-                    formatted_row.append(str(item))
+        # Заголовок друкується лише коли надійшов перший рядок
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            print(f"\n{empty_message}")
+            return
 
-            row_str = " | ".join([f"{val:<{col_width}}" for val in formatted_row])
-            print(row_str)
-        print(div_line)
+        self.renderer.render(headers, itertools.chain([first], rows))
 
     def show_search_results(self, results, exec_time):
         print(f"\nРезультати пошуку (Час: {exec_time:.2f} мс):")
         headers = ["ID", "User", "Email", "Entries Found", "Reminders Found"]
         self.print_table(headers, results)
 
+    def _highlight(self, fragment):
+        # У терміналі збіги виділяються кольором, при перенаправленні виводу - дужками
+        start, stop = ("\033[1;33m", "\033[0m") if sys.stdout.isatty() else ("[", "]")
+        return fragment.replace(fulltext.HIGHLIGHT_START, start).replace(fulltext.HIGHLIGHT_STOP, stop)
+
+    def show_fulltext_results(self, results, exec_time):
+        print(f"\nРезультати повнотекстового пошуку (Час: {exec_time:.2f} мс):")
+        if not results:
+            print("Нічого не знайдено.")
+            return
+        for position, (entry_id, author, rank, title, snippet) in enumerate(results, 1):
+            print(f"\n{position}. [Entry {entry_id}] {self._highlight(title)}  (автор: {author}, rank: {rank})")
+            print(f"   ...{self._highlight(snippet)}...")
+
+    def show_page(self, headers, page, number, exec_time):
+        print(f"\nСторінка {number} (Час: {exec_time:.2f} мс):")
+        self.print_table(headers, page.rows)
+
+    def get_browse_command(self, page):
+        options = []
+        if page.next_cursor:
+            options.append("n - наступна")
+        if page.prev_cursor:
+            options.append("p - попередня")
+        options.append("0 - вихід")
+        while True:
+            command = input(f"[{', '.join(options)}]: ").strip().lower()
+            if command == 'n' and page.next_cursor or command == 'p' and page.prev_cursor or command == '0':
+                return command
+            print("Невірна команда.")
+
     # --- ВВЕДЕННЯ ДАНИХ (CREATE) ---
     def get_user_input(self):
         print("\n[Введення User]")
@@ -302,6 +346,57 @@ class View:
             'date_to': dt if dt else None
         }
 
+    def get_fulltext_input(self):
+        print("\n--- ПОВНОТЕКСТОВИЙ ПОШУК ---")
+        print('Підтримується синтаксис: слова, "точна фраза", or, -виключити')
+        query = input("Запит: ").strip()
+        if not query:
+            return None
+
+        languages = list(fulltext.LANGUAGES)
+        for number, language in enumerate(languages, 1):
+            print(f"{number}. {language}" + (" (без стемінгу, для українського тексту)" if language == "simple" else ""))
+        choice = input(f"Мова (Enter - {fulltext.DEFAULT_LANGUAGE}): ").strip()
+        language = fulltext.DEFAULT_LANGUAGE
+        if choice.isdigit() and 1 <= int(choice) <= len(languages):
+            language = languages[int(choice) - 1]
+
+        val = input("Скільки результатів показати? (Enter - 10): ").strip()
+        limit = int(val) if val.isdigit() and int(val) > 0 else 10
+        return query, language, limit
+
+    def get_export_options(self):
+        print("\n[Експорт таблиць]")
+        directory = input("Каталог для файлів (Enter - export): ").strip() or "export"
+        for number, fmt in enumerate(transfer.FORMATS, 1):
+            print(f"{number}. {fmt}")
+        choice = input("Формат (Enter - 1): ").strip()
+        fmt = transfer.FORMATS[int(choice) - 1] if choice.isdigit() and 1 <= int(choice) <= len(transfer.FORMATS) \
+            else transfer.FORMATS[0]
+        compress = input("Стиснути gzip? (y/N): ").strip().lower() == "y"
+        return directory, fmt, compress
+
+    def get_import_directory(self):
+        print("\n[Імпорт таблиць]")
+        print("Файли: user / entry / reminder з розширенням .csv або .jsonl (можна .gz).")
+        print("Перерваний імпорт продовжується з останнього збереженого пакета.")
+        return input("Каталог з файлами (Enter - export): ").strip() or "export"
+
+    def get_metrics_path(self):
+        path = input("Файл метрик (.json - JSON, інакше Prometheus; Enter - metrics.prom): ").strip()
+        return path or "metrics.prom"
+
+    def get_browse_options(self, orders):
+        print("\n[Перегляд таблиці]")
+        for number, order in enumerate(orders, 1):
+            print(f"{number}. Сортувати за: {order}")
+        choice = input("Порядок (Enter - 1): ").strip()
+        order = orders[int(choice) - 1] if choice.isdigit() and 1 <= int(choice) <= len(orders) else orders[0]
+
+        val = input(f"Рядків на сторінці (Enter - {paging.DEFAULT_PAGE_SIZE}): ").strip()
+        page_size = int(val) if val.isdigit() and int(val) > 0 else paging.DEFAULT_PAGE_SIZE
+        return order, min(page_size, paging.MAX_PAGE_SIZE)
+
     def get_generation_count(self):
         print("\n[Генерація даних]")
         try:
@@ -313,4 +408,16 @@ class View:
             return count
         except ValueError:
             print("Помилка: Введіть ціле число.")
-            return None
\ No newline at end of file
+            return None
+
+    def get_worker_count(self):
+        cpus = os.cpu_count() or 1
+        val = input(f"Кількість паралельних процесів (Enter = 1, ядер: {cpus}): ").strip()
+        if not val:
+            return 1
+        try:
+            workers = int(val)
+        except ValueError:
+            print("Помилка: Введіть ціле число. Використовується 1 процес.")
+            return 1
+        return max(1, min(workers, cpus))